@@ -0,0 +1,105 @@
+"""
+Compare PDF extraction backends on a synthetic corpus.
+
+For every (document, installed backend) pair, extraction runs in a fresh
+process so memory figures reflect that backend alone. Reports throughput
+(pages/s), peak RSS of the process (includes native memory and the library's
+import footprint), peak Python allocations during extraction (tracemalloc) and
+text fidelity against the corpus ground truth:
+
+- ``recall``: share of ground-truth words present in the output (bag of words)
+- ``order``: similarity of the word sequences (difflib ratio on the first 3,000 words)
+
+Usage:
+    PYTHONPATH=src uv run --extra pdfium --extra pdfminer \\
+        python benchmarks/bench_pdf_backends.py --pages 10 100 --layouts prose two_column table mixed
+"""
+
+import argparse
+import difflib
+import re
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from pdf_corpus import LAYOUTS, generate_corpus  # noqa: E402
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _extract(backend_name: str, path: str) -> tuple[float, int, str, int, int]:
+    """Run in a fresh process: (seconds, pages, text, peak RSS KiB, peak traced bytes)."""
+    import resource
+    import tracemalloc
+
+    from slideia.services.pdf_backends import BACKENDS
+
+    backend = BACKENDS[backend_name]
+    start = time.perf_counter()
+    pages = list(backend.iter_pages(path))
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    list(backend.iter_pages(path))
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return seconds, len(pages), "\n".join(pages), rss_peak, traced_peak
+
+
+def _fidelity(truth: str, text: str) -> tuple[float, float]:
+    truth_words = _WORD.findall(truth.lower())
+    text_words = _WORD.findall(text.lower())
+    overlap = sum((Counter(truth_words) & Counter(text_words)).values())
+    recall = overlap / len(truth_words) if truth_words else 1.0
+    order = difflib.SequenceMatcher(None, truth_words[:3000], text_words[:3000], autojunk=False).ratio()
+    return recall, order
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--layouts", nargs="+", choices=LAYOUTS, default=list(LAYOUTS))
+    parser.add_argument("--corpus", type=Path, default=None, help="Reuse/keep the corpus in this directory")
+    args = parser.parse_args()
+
+    from slideia.services.pdf_backends import BACKENDS
+
+    backends = [name for name, backend in BACKENDS.items() if backend.available()]
+    missing = sorted(set(BACKENDS) - set(backends))
+    if missing:
+        print(f"Skipping backends that are not installed: {', '.join(missing)}")
+
+    corpus_dir = args.corpus or Path(tempfile.mkdtemp(prefix="pdf-corpus-"))
+    documents = generate_corpus(corpus_dir, args.pages, args.layouts)
+
+    header = (
+        f"{'document':<22} {'backend':<10} {'pages/s':>9} {'RSS (MiB)':>10} {'py peak (MiB)':>14} "
+        f"{'recall':>7} {'order':>6}"
+    )
+    print(header)
+    print("-" * len(header))
+    context = get_context("spawn")
+    for path in documents:
+        truth = path.with_suffix(".txt").read_text(encoding="utf-8")
+        for name in backends:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                seconds, pages, text, rss_kib, traced = pool.submit(_extract, name, str(path)).result()
+            recall, order = _fidelity(truth, text)
+            print(
+                f"{path.stem:<22} {name:<10} {pages / seconds:>9.1f} {rss_kib / 1024:>10.1f} "
+                f"{traced / 2**20:>14.1f} {recall:>7.3f} {order:>6.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
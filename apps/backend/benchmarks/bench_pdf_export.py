@@ -0,0 +1,47 @@
+"""
+Benchmark the PDF exporter on long decks.
+
+Renders synthetic decks (the same ones as ``bench_pptx_export``: every slide
+layout, speaker notes and an image on every few bullet slides) with
+``render_pdf`` and reports the best wall time and the size of the file.
+
+Usage:
+    PYTHONPATH=src uv run python benchmarks/bench_pdf_export.py --slides 100 300 600
+"""
+
+import argparse
+import asyncio
+import time
+
+from bench_pptx_export import make_deck
+
+
+def measure(render, deck: dict, repeat: int) -> tuple[float, bytes]:
+    """Best wall time (s) and the rendered file."""
+    best = float("inf")
+    content = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        content = asyncio.run(render(deck)).getvalue()
+        best = min(best, time.perf_counter() - start)
+    return best, content
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--slides", type=int, nargs="+", default=[100, 300, 600])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from slideia.domain.deck.pdf_exporter import render_pdf
+
+    print(f"{'slides':>7} {'time (s)':>9} {'ms/slide':>9} {'size (KiB)':>11}")
+    for slides in args.slides:
+        seconds, content = measure(render_pdf, make_deck(slides), args.repeat)
+        print(f"{slides:>7} {seconds:>9.3f} {seconds / slides * 1000:>9.2f} {len(content) / 1024:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark serial vs page-parallel PDF text extraction.
+
+Generates synthetic multi-hundred-page PDFs with reportlab and times
+``extract_text_from_pdf`` (serial, in-process) against
+``extract_pdf_text_parallel`` (page shards across the extraction pool).
+
+Usage:
+    PYTHONPATH=src uv run python benchmarks/bench_pdf_extraction.py --pages 100 300 600 --workers 4
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from io import BytesIO
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+WORDS = (
+    "market revenue growth strategy customer product platform analysis quarter "
+    "forecast margin retention pipeline adoption research design cloud security"
+).split()
+
+
+def make_pdf(pages: int, lines_per_page: int = 45, seed: int = 0) -> bytes:
+    """Build a text-heavy PDF with ``pages`` pages of pseudo-random prose."""
+    rng = random.Random(seed)
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+    for page in range(pages):
+        c.setFont("Helvetica", 10)
+        c.drawString(50, height - 40, f"Synthetic report - page {page + 1}")
+        y = height - 70
+        for _ in range(lines_per_page):
+            c.drawString(50, y, " ".join(rng.choice(WORDS) for _ in range(14)).capitalize() + ".")
+            y -= 16
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def time_call(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 300, 600])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Settings are read at import time, so configure the pool before importing slideia
+    os.environ["EXTRACTION_WORKERS"] = str(args.workers)
+
+    from slideia.services.extraction import extract_pdf_text_parallel, shutdown_extraction_pool
+    from slideia.services.ingest import extract_text_from_pdf
+
+    async def run_parallel_suite(docs: list[tuple[int, bytes]]) -> list[tuple[int, float, float]]:
+        rows = []
+        for pages, raw in docs:
+            serial = time_call(lambda: extract_text_from_pdf(raw), args.repeat)
+
+            # Warm the pool so process start-up is not counted
+            await extract_pdf_text_parallel(raw)
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                await extract_pdf_text_parallel(raw)
+                best = min(best, time.perf_counter() - start)
+            rows.append((pages, serial, best))
+        return rows
+
+    docs = [(pages, make_pdf(pages)) for pages in args.pages]
+    try:
+        rows = asyncio.run(run_parallel_suite(docs))
+    finally:
+        shutdown_extraction_pool()
+
+    print(f"workers={args.workers} repeat={args.repeat} (best of)")
+    print(f"{'pages':>6} {'serial (s)':>11} {'parallel (s)':>13} {'speedup':>8}")
+    for pages, serial, parallel in rows:
+        print(f"{pages:>6} {serial:>11.3f} {parallel:>13.3f} {serial / parallel:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
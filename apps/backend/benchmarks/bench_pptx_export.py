@@ -0,0 +1,119 @@
+"""
+Benchmark the python-pptx and XML engines of the PPTX exporter.
+
+Generates synthetic decks cycling through every slide layout, each slide with
+speaker notes and every few bullet slides with an image, and compares the
+wall time of ``render_pptx`` with:
+
+- ``python-pptx``: content slides built through python-pptx's object API
+- ``xml``: content slides written as XML parts (``pptx_writer``)
+
+Both engines are checked to produce identical files.
+
+Usage:
+    PYTHONPATH=src uv run python benchmarks/bench_pptx_export.py --slides 100 300 600
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import zipfile
+from io import BytesIO
+
+from PIL import Image
+
+WORDS = (
+    "market revenue growth strategy customer product platform analysis quarter "
+    "forecast margin retention pipeline adoption research design cloud security"
+).split()
+
+LAYOUTS = ("bullets", "bullets", "statement", "big_number", "two_column", "steps", "quote")
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _image(rng: random.Random) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (400, 300), tuple(rng.randrange(256) for _ in range(3))).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def make_deck(slides: int, image_every: int = 4, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    images = [_image(rng) for _ in range(8)]
+    deck_slides = []
+    for i in range(slides):
+        slide = {
+            "title": _sentence(rng, 4),
+            "layout": LAYOUTS[i % len(LAYOUTS)],
+            "summary": _sentence(rng, 12),
+            "bullets": [_sentence(rng, 8) for _ in range(5)],
+            "statement": _sentence(rng, 10),
+            "big_number": f"{rng.randint(1, 99)}%",
+            "big_number_context": _sentence(rng, 6),
+            "column_left_title": "Before",
+            "column_left": [_sentence(rng, 4) for _ in range(3)],
+            "column_right_title": "After",
+            "column_right": [_sentence(rng, 4) for _ in range(3)],
+            "steps": [_sentence(rng, 5) for _ in range(4)],
+            "quote_text": _sentence(rng, 14),
+            "quote_attribution": "Analyst",
+            "notes": " ".join(_sentence(rng, 12) for _ in range(3)),
+        }
+        if slide["layout"] == "bullets" and i % image_every == 0:
+            slide["image_prompt"] = _sentence(rng, 2)
+            slide["image_data"] = rng.choice(images)
+        deck_slides.append(slide)
+    return {
+        "title": "Benchmark Deck",
+        "font": "Calibri",
+        "palette": ["#1F3A5F"],
+        "slides": deck_slides,
+        "citations": [_sentence(rng, 8) for _ in range(10)],
+    }
+
+
+def measure(render, deck: dict, engine: str, repeat: int) -> tuple[float, bytes]:
+    """Best wall time (s) and the rendered file."""
+    best = float("inf")
+    content = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        content = asyncio.run(render(deck, engine=engine)).getvalue()
+        best = min(best, time.perf_counter() - start)
+    return best, content
+
+
+def parts(content: bytes) -> dict[str, bytes]:
+    with zipfile.ZipFile(BytesIO(content)) as package:
+        return {name: package.read(name) for name in package.namelist()}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--slides", type=int, nargs="+", default=[100, 300, 600])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from slideia.domain.deck.exporter import render_pptx
+
+    print(f"{'slides':>7} {'engine':<12} {'time (s)':>9} {'size (KiB)':>11} {'speedup':>8}")
+    for slides in args.slides:
+        deck = make_deck(slides)
+        baseline, expected = measure(render_pptx, deck, "python-pptx", args.repeat)
+        seconds, written = measure(render_pptx, deck, "xml", args.repeat)
+        if parts(written) != parts(expected):
+            raise SystemExit(f"Engines produced different files for {slides} slides")
+        print(f"{slides:>7} {'python-pptx':<12} {baseline:>9.3f} {len(expected) / 1024:>11.0f} {'':>8}")
+        print(
+            f"{slides:>7} {'xml':<12} {seconds:>9.3f} {len(written) / 1024:>11.0f} {baseline / seconds:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
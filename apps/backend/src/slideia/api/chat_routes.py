@@ -8,25 +8,38 @@ response back token-by-token as Server-Sent Events.
 import asyncio
 import json
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Request
 from fastapi.responses import StreamingResponse
 from langchain_core.messages import AIMessage, HumanMessage
 
-from slideia.api.chat_schemas import ChatRequest
+from slideia.api.chat_schemas import ChatRequest, FileUploadResponse, UploadedFileSchema
+from slideia.api.streaming import cancel_on_disconnect, cancel_task
+from slideia.core.config import settings
 from slideia.core.logging import get_logger
 from slideia.domain.agent.graph import graph
-from slideia.services.ingest import extract_file_text, chunk_document_text
+from slideia.infra.cache import document_cache
+from slideia.infra.openrouter import OpenRouterLLM
+from slideia.services.ingest import DocumentIndex, build_document_index, chunk_document_text, frame_document
+from slideia.services.extraction import extract_text, run_in_extraction_pool
+from slideia.services.uploads import SpooledUpload, UploadRegistry
 
 logger = get_logger(__name__)
 
 chat_router = APIRouter(prefix="/chat", tags=["chat"])
 
+upload_registry = UploadRegistry(
+    llm=OpenRouterLLM(api_key=settings.OPENROUTER_API_KEY.get_secret_value(), model=settings.OPENROUTER_MODEL)
+)
+
 
 # ── Constants ────────────────────────────────────────────────────────────
 
 MAX_FILES = 5
 MAX_FILE_SIZE_BYTES = 5 * 1024 * 1024  # 5 MB per file
 MAX_TOTAL_SIZE_BYTES = 10 * 1024 * 1024  # 10 MB total
+# Whole multipart body: the file limit plus room for the payload field and multipart framing
+MAX_REQUEST_BODY_BYTES = MAX_TOTAL_SIZE_BYTES + 1024 * 1024
+UPLOAD_READ_CHUNK_BYTES = 256 * 1024
 
 ALLOWED_CONTENT_TYPES: dict[str, str] = {
     "text/plain": "txt",
@@ -51,12 +64,16 @@ response. Reference specific details from the files when relevant."""
 # ── File text extraction ─────────────────────────────────────────────────
 
 
-async def _read_file_text(upload: UploadFile) -> str:
-    """Read an UploadFile and return its text content.
+async def _read_upload(upload: UploadFile, remaining_bytes: int) -> SpooledUpload:
+    """Validate an UploadFile and copy it, chunk by chunk, into a SpooledUpload.
+
+    Reading stops as soon as the file exceeds the per-file limit or the
+    ``remaining_bytes`` left of the total limit, so an oversized file is never
+    buffered in full.
 
     Raises:
         HTTPException 415: If the content type is not supported.
-        HTTPException 413: If the file exceeds the size limit.
+        HTTPException 413: If the file exceeds a size limit.
     """
     content_type = upload.content_type or ""
 
@@ -67,23 +84,70 @@ async def _read_file_text(upload: UploadFile) -> str:
             f"Allowed: {', '.join(ALLOWED_CONTENT_TYPES.values())}",
         )
 
-    raw = await upload.read()
+    def check_size(size: int):
+        if size > MAX_FILE_SIZE_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File '{upload.filename}' exceeds the 5 MB limit.",
+            )
+        if size > remaining_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail="Total uploaded file size exceeds the 10 MB limit.",
+            )
 
-    if len(raw) > MAX_FILE_SIZE_BYTES:
-        raise HTTPException(
-            status_code=413,
-            detail=f"File '{upload.filename}' exceeds the 5 MB limit.",
-        )
+    # The multipart parser already knows the size; reject before copying anything
+    if upload.size is not None:
+        check_size(upload.size)
+
+    spooled = SpooledUpload(upload.filename or "document", ALLOWED_CONTENT_TYPES[content_type])
+    try:
+        while chunk := await upload.read(UPLOAD_READ_CHUNK_BYTES):
+            await asyncio.to_thread(spooled.write, chunk)
+            check_size(spooled.size)
+        spooled.close()
+    except BaseException:
+        spooled.discard()
+        raise
+    return spooled
+
+
+async def _read_uploads(files: list[UploadFile]) -> list[SpooledUpload]:
+    """Read and validate all uploads in order against the per-file and total size limits."""
+    uploads: list[SpooledUpload] = []
+    try:
+        for upload in files:
+            remaining = MAX_TOTAL_SIZE_BYTES - sum(spooled.size for spooled in uploads)
+            uploads.append(await _read_upload(upload, remaining))
+    except BaseException:
+        for spooled in uploads:
+            spooled.discard()
+        raise
+    return uploads
 
-    ext = ALLOWED_CONTENT_TYPES[content_type]
 
+async def _extract_upload_text(upload: SpooledUpload, max_chars: int) -> tuple[str, bool]:
+    """Extract the text of a validated upload in the shared extraction pool.
+
+    Parsing stops once ``max_chars`` of text has been extracted.
+
+    Raises:
+        HTTPException 422: If the text cannot be extracted in time.
+    """
+    filename = upload.filename
     try:
-        return extract_file_text(raw, ext)
+        return await extract_text(upload.source, upload.ext, max_chars=max_chars, digest=upload.digest)
+    except TimeoutError as exc:
+        logger.error(f"Timed out parsing file '{filename}': {exc}")
+        raise HTTPException(
+            status_code=422,
+            detail=f"Timed out extracting text from file '{filename}'.",
+        )
     except Exception as exc:
-        logger.error(f"Failed to parse file '{upload.filename}': {exc}")
+        logger.error(f"Failed to parse file '{filename}': {exc}")
         raise HTTPException(
             status_code=422,
-            detail=f"Failed to extract text from file '{upload.filename}': {exc}",
+            detail=f"Failed to extract text from file '{filename}': {exc}",
         )
 
 
@@ -95,11 +159,46 @@ def _sse_event(data: dict) -> str:
     return f"data: {json.dumps(data)}\n\n"
 
 
-# ── Endpoint ─────────────────────────────────────────────────────────────
+# ── Endpoints ────────────────────────────────────────────────────────────
+
+
+@chat_router.post("/files", response_model=FileUploadResponse, status_code=202)
+async def upload_files(files: list[UploadFile] = File(...)):
+    """Upload reference documents ahead of a chat turn.
+
+    Extraction, indexing and summarization start in the background; the returned
+    file IDs can be passed as ``file_ids`` in a later ``/chat/stream`` payload.
+    """
+    if len(files) > MAX_FILES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Too many files. Maximum is {MAX_FILES}.",
+        )
+
+    uploads = await _read_uploads(files)
+    if upload_registry.available() < len(uploads):
+        for upload in uploads:
+            upload.discard()
+        raise HTTPException(
+            status_code=503,
+            detail="Too many documents are still being processed. Please try again shortly.",
+        )
+    docs = [upload_registry.submit(upload) for upload in uploads]
+    return FileUploadResponse(files=[UploadedFileSchema(**doc.to_dict()) for doc in docs])
+
+
+@chat_router.get("/files/{file_id}", response_model=UploadedFileSchema)
+async def get_file_status(file_id: str):
+    """Report the processing status of a previously uploaded document."""
+    doc = upload_registry.get(file_id)
+    if doc is None:
+        raise HTTPException(status_code=404, detail=f"Unknown file ID: {file_id}")
+    return UploadedFileSchema(**doc.to_dict())
 
 
 @chat_router.post("/stream")
 async def chat_stream(
+    request: Request,
     payload: str = Form(...),
     files: list[UploadFile] = File(default=[]),
 ):
@@ -107,7 +206,8 @@ async def chat_stream(
 
     Expects multipart/form-data with:
     - ``payload``: JSON string matching ``ChatRequest`` schema.
-    - ``files`` (optional): Up to 5 files for context injection.
+    - ``files`` (optional): Up to 5 files for context injection. Files uploaded
+      beforehand via ``/chat/files`` can be referenced with ``file_ids`` instead.
 
     Returns:
         StreamingResponse with ``text/event-stream`` media type.
@@ -126,44 +226,81 @@ async def chat_stream(
         raise HTTPException(status_code=422, detail=str(exc))
 
     # ── 2. Validate file constraints ─────────────────────────────────
-    if len(files) > MAX_FILES:
+    if len(files) + len(chat_request.file_ids) > MAX_FILES:
         raise HTTPException(
             status_code=422,
             detail=f"Too many files. Maximum is {MAX_FILES}.",
         )
 
-    # ── 3. Extract text from uploaded files & handle limits ──────────
+    # ── 3. Resolve pre-uploaded documents (waits if still processing) ─
+    uploaded_docs = []
+    for file_id in chat_request.file_ids:
+        doc = await upload_registry.wait(file_id)
+        if doc is None:
+            raise HTTPException(status_code=404, detail=f"Unknown file ID: {file_id}")
+        if doc.status == "failed":
+            raise HTTPException(status_code=422, detail=doc.error)
+        uploaded_docs.append(doc)
+
+    # ── 4. Extract text from attached files & handle limits ──────────
     file_contexts: list[str] = []
-    total_size = 0
-    total_chars = 0
-    MAX_CHARACTER_LIMIT = 30000
+    total_chars = sum(len(doc.text) for doc in uploaded_docs)
+    # Long documents are summarized map-reduce style downstream; this only caps the
+    # amount of text we are willing to summarize at all
+    MAX_CHARACTER_LIMIT = settings.MAX_DOCUMENT_CHARS
     truncated = False
 
-    for upload in files:
-        text = await _read_file_text(upload)
-        total_size += len(text.encode("utf-8"))
+    # Parse all attachments concurrently off the event loop, each stopping at the remaining
+    # character budget; results keep upload order
+    uploads = await _read_uploads(files)
+    budget = max(0, MAX_CHARACTER_LIMIT - total_chars)
+    try:
+        results = await asyncio.gather(
+            *(_extract_upload_text(upload, max_chars=budget) for upload in uploads)
+        )
+    finally:
+        for upload in uploads:
+            upload.discard()
 
-        if total_size > MAX_TOTAL_SIZE_BYTES:
-            raise HTTPException(
-                status_code=413,
-                detail="Total uploaded file size exceeds the 10 MB limit.",
-            )
+    for upload, (text, file_truncated) in zip(uploads, results):
+        truncated = truncated or file_truncated
 
         if total_chars + len(text) > MAX_CHARACTER_LIMIT:
-            remaining_limit = MAX_CHARACTER_LIMIT - total_chars
+            remaining_limit = max(0, MAX_CHARACTER_LIMIT - total_chars)
             text, file_truncated = chunk_document_text(text, max_chars=remaining_limit)
             if file_truncated:
                 truncated = True
 
         total_chars += len(text)
-        file_contexts.append(f"--- File: {upload.filename} ---\n{text}\n--- End of {upload.filename} ---")
+        file_contexts.append(frame_document(upload.filename, text))
         if truncated:
             file_contexts.append("\n\n[Warning: Reference document text was truncated to fit context limits]")
             break
 
-    combined_file_context = "\n\n".join(file_contexts) if file_contexts else ""
+    truncated = truncated or any(doc.truncated for doc in uploaded_docs)
+    combined_file_context = "\n\n".join([doc.framed_text for doc in uploaded_docs] + file_contexts)
+
+    # Reuse summaries computed in the background or on an earlier turn with the same
+    # documents; route_intent then skips the summarize step entirely
+    summarized_context = None
+    if uploaded_docs and not files and all(doc.summary for doc in uploaded_docs):
+        summarized_context = "\n\n".join(frame_document(doc.filename, doc.summary) for doc in uploaded_docs)
+    elif combined_file_context:
+        summarized_context = document_cache.get_summary(document_cache.digest(combined_file_context))
+
+    # Index passages once so each slide batch can retrieve only what it needs;
+    # pre-uploaded documents were already indexed in the background
+    document_index = None
+    if combined_file_context:
+        passages = [passage for doc in uploaded_docs if doc.index for passage in doc.index.passages]
+        if file_contexts:
+            attached_index = await run_in_extraction_pool(
+                build_document_index, "\n\n".join(file_contexts), settings.RETRIEVAL_PASSAGE_TOKENS
+            )
+            passages.extend(attached_index.passages)
+        document_index = DocumentIndex(passages)
 
-    # ── 4. Set up the LangGraph Initial State ────────────────────────
+    # ── 5. Set up the LangGraph Initial State ────────────────────────
     initial_messages = []
     for msg in chat_request.conversation_history:
         if msg.role == "user":
@@ -181,6 +318,8 @@ async def chat_stream(
         "deck": chat_request.deck,
         "prompt": chat_request.prompt,
         "file_context": combined_file_context,
+        "summarized_context": summarized_context,
+        "document_index": document_index,
         "intent": "",
         "instruction": None,
         "error": None,
@@ -190,10 +329,10 @@ async def chat_stream(
     logger.info(
         f"Agent stream request: prompt_len={len(chat_request.prompt)}, "
         f"history_len={len(chat_request.conversation_history)}, "
-        f"files={len(files)}, has_deck={chat_request.deck is not None}"
+        f"files={len(files)}, file_ids={len(chat_request.file_ids)}, has_deck={chat_request.deck is not None}"
     )
 
-    # ── 5. Run the LangGraph agent and stream response ───────────────
+    # ── 6. Run the LangGraph agent and stream response ───────────────
     queue = asyncio.Queue()
 
     async def run_agent_task():
@@ -207,6 +346,7 @@ async def chat_stream(
             await queue.put({"done": True})
 
     agent_task = asyncio.create_task(run_agent_task())
+    disconnect_watcher = asyncio.create_task(cancel_on_disconnect(request, agent_task))
 
     async def event_generator():
         try:
@@ -234,7 +374,9 @@ async def chat_stream(
             logger.error(f"SSE generator error: {exc}")
             yield _sse_event({"error": str(exc)})
         finally:
-            await agent_task
+            # Abort the LangGraph run (and its in-flight LLM calls) if the client went away
+            await cancel_task(agent_task)
+            await cancel_task(disconnect_watcher)
 
     return StreamingResponse(
         event_generator(),
@@ -56,3 +56,25 @@ class ChatRequest(BaseModel):
         default=None,
         description="Optional presentation theme preset override.",
     )
+    file_ids: list[str] = Field(
+        default_factory=list,
+        max_length=5,
+        description="IDs of documents previously uploaded via /chat/files.",
+    )
+
+
+class UploadedFileSchema(BaseModel):
+    """Processing status of a document uploaded via /chat/files."""
+
+    file_id: str
+    filename: str
+    status: str = Field(..., description="'processing', 'summarizing', 'ready' or 'failed'.")
+    truncated: bool = False
+    has_summary: bool = False
+    error: str | None = None
+
+
+class FileUploadResponse(BaseModel):
+    """Response of /chat/files: one entry per accepted file, in upload order."""
+
+    files: list[UploadedFileSchema]
@@ -0,0 +1,25 @@
+"""FastAPI dependencies shared across routers."""
+
+from collections.abc import Callable
+
+from fastapi import Header
+
+from slideia.core.config import settings
+from slideia.core.deadline import Deadline
+
+
+def request_deadline(default_seconds: float) -> Callable[..., Deadline]:
+    """Build a dependency that starts a request-scoped deadline.
+
+    Clients may override the per-endpoint default with the ``X-Request-Timeout``
+    header (seconds), clamped to ``MAX_REQUEST_DEADLINE_SECONDS``.
+    """
+
+    def dependency(x_request_timeout: str | None = Header(default=None)) -> Deadline:
+        return Deadline.from_header(
+            x_request_timeout,
+            default_seconds=default_seconds,
+            max_seconds=settings.MAX_REQUEST_DEADLINE_SECONDS,
+        )
+
+    return dependency
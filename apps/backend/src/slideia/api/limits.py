@@ -0,0 +1,79 @@
+"""Request body size limits.
+
+Starlette parses (and spools) a whole multipart body before an endpoint runs,
+so per-file checks in the handler come too late to stop a client from sending
+an arbitrarily large body. This middleware rejects oversized bodies up front
+from ``Content-Length`` and, for chunked bodies, as soon as the running total
+crosses the limit.
+"""
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from slideia.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class BodySizeLimitMiddleware:
+    """Reject request bodies larger than ``max_body_bytes`` on paths under ``path_prefix`` with a 413."""
+
+    def __init__(self, app: ASGIApp, max_body_bytes: int, path_prefix: str = "/"):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.path_prefix = path_prefix
+
+    def _reject(self) -> JSONResponse:
+        limit_mb = self.max_body_bytes / (1024 * 1024)
+        return JSONResponse(
+            status_code=413, content={"detail": f"Request body exceeds the {limit_mb:.0f} MB limit."}
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if (
+            content_length is not None
+            and content_length.isdigit()
+            and int(content_length) > self.max_body_bytes
+        ):
+            logger.warning(f"Rejected {scope['path']}: Content-Length {int(content_length)} exceeds limit")
+            await self._reject()(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    # Stop reading; the app sees the client as gone and gives up parsing
+                    exceeded = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message: Message):
+            nonlocal response_started
+            if exceeded and not response_started:
+                return
+            response_started = response_started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not exceeded or response_started:
+                raise
+        if exceeded and not response_started:
+            logger.warning(
+                f"Rejected {scope['path']}: body exceeded {self.max_body_bytes} bytes while streaming"
+            )
+            await self._reject()(scope, receive, send)
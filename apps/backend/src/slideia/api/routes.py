@@ -1,20 +1,19 @@
 import asyncio
-import json
-import os
-import tempfile
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
+from slideia.api.deps import request_deadline
 from slideia.api.schemas import (
     DeckRequest,
     FullDeckExportRequest,
     ProposeOutlineRequest,
     RegenerateSlideRequest,
 )
+from slideia.api.streaming import stream_progress_events
 from slideia.core.config import settings
+from slideia.core.deadline import Deadline
 from slideia.core.logging import get_logger
-from slideia.domain.deck.exporter import export_slides
-from slideia.domain.deck.pdf_exporter import export_deck_to_pdf
+from slideia.domain.deck.images import PDF_IMAGE_BOX, PPTX_IMAGE_BOX, attach_slide_images
 from slideia.domain.deck.services import (
     Cache,
     RedisCache,
@@ -22,8 +21,8 @@ from slideia.domain.deck.services import (
     generate_full_deck_stream,
     propose_outline_stream,
 )
-from slideia.infra.image_fetcher import ImageFetcher
 from slideia.infra.openrouter import OpenRouterLLM
+from slideia.services.rendering import render_deck, render_metrics
 
 logger = get_logger(__name__)
 
@@ -36,9 +35,14 @@ else:
 
 llm = OpenRouterLLM(api_key=settings.OPENROUTER_API_KEY.get_secret_value(), model=settings.OPENROUTER_MODEL)
 
+generation_deadline = request_deadline(settings.GENERATION_DEADLINE_SECONDS)
+export_deadline = request_deadline(settings.EXPORT_DEADLINE_SECONDS)
+
 
 @router.post("/propose-outline")
-async def generate_outline(request: ProposeOutlineRequest) -> dict:
+async def generate_outline(
+    request: ProposeOutlineRequest, deadline: Deadline = Depends(generation_deadline)
+) -> dict:
     """
     Propose a slide outline for a presentation.
 
@@ -64,12 +68,16 @@ async def generate_outline(request: ProposeOutlineRequest) -> dict:
             llm,
             cache,
             theme_preset=request.theme_preset,
+            deadline=deadline,
         )
 
         # Return only the outline to the user
         logger.info(f"Outline generated successfully with {len(deck.outline.get('slides', []))} slides")
         return deck.outline
 
+    except TimeoutError as e:
+        logger.error(str(e))
+        raise HTTPException(status_code=504, detail="Generation took too long. Please try again.")
     except Exception as e:
         logger.error(str(e))
         raise HTTPException(status_code=500, detail="Oops! Something went wrong on our end.")
@@ -81,31 +89,23 @@ async def propose_outline_stream_route(request_data: ProposeOutlineRequest, requ
     Propose an outline and stream progress updates via SSE.
     """
 
-    async def sse_generator():
-        try:
-            generator = propose_outline_stream(
-                request_data.topic,
-                request_data.audience,
-                request_data.tone,
-                request_data.slide_count,
-                llm,
-                cache,
-                theme_preset=request_data.theme_preset,
-            )
-            async for event in generator:
-                if await request.is_disconnected():
-                    logger.info("Client disconnected, stopping outline generation.")
-                    break
-                yield f"data: {json.dumps(event)}\n\n"
-        except Exception as e:
-            logger.error(f"Error in outline generation stream: {e}")
-            yield f"data: {json.dumps({'step': 'error', 'message': str(e)})}\n\n"
-
-    return StreamingResponse(sse_generator(), media_type="text/event-stream")
+    generator = propose_outline_stream(
+        request_data.topic,
+        request_data.audience,
+        request_data.tone,
+        request_data.slide_count,
+        llm,
+        cache,
+        theme_preset=request_data.theme_preset,
+    )
+    return StreamingResponse(
+        stream_progress_events(request, generator, description="outline generation"),
+        media_type="text/event-stream",
+    )
 
 
 @router.post("/generate-deck")
-async def generate_deck(request: DeckRequest):
+async def generate_deck(request: DeckRequest, deadline: Deadline = Depends(generation_deadline)):
     """
     Generate a full slide deck by first proposing an outline and then drafting each slide.
     """
@@ -123,45 +123,42 @@ async def generate_deck(request: DeckRequest):
             llm,
             cache,
             theme_preset=request.theme_preset,
+            deadline=deadline,
         )
 
         logger.info(f"Deck generated successfully with {len(deck.slides)} slides")
         return deck.to_dict()
 
+    except TimeoutError as e:
+        logger.error(str(e))
+        raise HTTPException(status_code=504, detail="Generation took too long. Please try again.")
     except Exception as e:
         logger.error(str(e))
         raise HTTPException(status_code=500, detail="Oops! Something went wrong on our end.")
 
 
 @router.post("/generate-deck/stream")
-async def generate_deck_stream(request_data: DeckRequest, request: Request):
+async def generate_deck_stream(
+    request_data: DeckRequest, request: Request, deadline: Deadline = Depends(generation_deadline)
+):
     """
     Generate a full slide deck and stream progress updates via SSE.
     """
 
-    async def sse_generator():
-        try:
-            generator = generate_full_deck_stream(
-                request_data.topic,
-                request_data.audience,
-                request_data.tone,
-                request_data.slide_count,
-                llm,
-                cache,
-                theme_preset=request_data.theme_preset,
-            )
-            async for event in generator:
-                # Check for disconnection
-                if await request.is_disconnected():
-                    logger.info("Client disconnected, stopping generation.")
-                    break
-
-                yield f"data: {json.dumps(event)}\n\n"
-        except Exception as e:
-            logger.error(f"Error in generation stream: {e}")
-            yield f"data: {json.dumps({'step': 'error', 'message': str(e)})}\n\n"
-
-    return StreamingResponse(sse_generator(), media_type="text/event-stream")
+    generator = generate_full_deck_stream(
+        request_data.topic,
+        request_data.audience,
+        request_data.tone,
+        request_data.slide_count,
+        llm,
+        cache,
+        theme_preset=request_data.theme_preset,
+        deadline=deadline,
+    )
+    return StreamingResponse(
+        stream_progress_events(request, generator, description="generation"),
+        media_type="text/event-stream",
+    )
 
 
 @router.post("/regenerate-slide")
@@ -187,8 +184,40 @@ async def regenerate_slide(request: RegenerateSlideRequest):
         raise HTTPException(status_code=500, detail="Oops! Something went wrong on our end.")
 
 
+def _export_deck_data(request: FullDeckExportRequest, include_notes: bool = True) -> dict:
+    """Build the exporters' deck dict from the user-edited deck."""
+    # Prefer the LLM-generated title/subtitle; fall back to topic/audience
+    export_title = request.title or request.topic or "Untitled Presentation"
+    export_subtitle = request.subtitle or (f"For {request.audience}" if request.audience else "")
+
+    deck_data = {
+        "title": export_title,
+        "subtitle": export_subtitle,
+        "palette": request.palette or [],
+        "font": request.font or "Calibri",
+        "citations": request.citations or [],
+        "slides": [],
+    }
+
+    for slide in request.slides:
+        slide_data = slide.model_dump(exclude={"notes"})
+        if include_notes:
+            slide_data["notes"] = slide.notes
+        deck_data["slides"].append(slide_data)
+
+    return deck_data
+
+
+def _export_filename(topic: str, extension: str) -> str:
+    safe_topic = "".join(c for c in topic if c.isalnum() or c in (" ", "-", "_")).strip()
+    safe_topic = safe_topic.replace(" ", "_")[:50]
+    if not safe_topic:
+        safe_topic = "presentation"
+    return f"{safe_topic}.{extension}"
+
+
 @router.post("/export-pptx")
-async def export_pptx(request: FullDeckExportRequest):
+async def export_pptx(request: FullDeckExportRequest, deadline: Deadline = Depends(export_deadline)):
     """
     Export a user-edited slide deck to a PowerPoint (.pptx) file.
 
@@ -213,80 +242,22 @@ async def export_pptx(request: FullDeckExportRequest):
 
     Returns HTTP 500 with error message if export fails.
     """
-    json_path = None
-
     try:
         logger.info(f"\nStarting PPTX export for topic='{request.topic}'")
 
-        logger.info("Fetching images...")
-        image_fetcher = ImageFetcher()
-
-        # Create a list of async tasks for image fetching
-        tasks = []
-        for slide in request.slides:
-            tasks.append(image_fetcher.fetch_image_url(slide.image_prompt))
-
-        # Run tasks concurrently
-        image_urls = await asyncio.gather(*tasks)
-
         logger.info(f"Exporting deck with {len(request.slides)} slides")
+        deck_data = _export_deck_data(request)
 
-        # Prepare data for export from the user-provided state
-        # Prefer the LLM-generated title/subtitle; fall back to topic/audience
-        export_title = request.title or request.topic or "Untitled Presentation"
-        export_subtitle = request.subtitle or (f"For {request.audience}" if request.audience else "")
-
-        deck_data = {
-            "title": export_title,
-            "subtitle": export_subtitle,
-            "palette": request.palette or [],
-            "font": request.font or "Calibri",
-            "citations": request.citations or [],
-            "slides": [],
-        }
+        # Resolve and download all slide images up front, concurrently
+        await attach_slide_images(deck_data["slides"], deadline=deadline, box=PPTX_IMAGE_BOX)
 
-        for i, slide in enumerate(request.slides):
-            slide_data = {
-                "title": slide.title,
-                "summary": slide.summary,
-                "layout": slide.layout,
-                "bullets": slide.bullets,
-                "statement": slide.statement,
-                "big_number": slide.big_number,
-                "big_number_context": slide.big_number_context,
-                "column_left_title": slide.column_left_title,
-                "column_left": slide.column_left,
-                "column_right_title": slide.column_right_title,
-                "column_right": slide.column_right,
-                "steps": slide.steps,
-                "quote_text": slide.quote_text,
-                "quote_attribution": slide.quote_attribution,
-                "image_prompt": slide.image_prompt,
-                "image_url": image_urls[i],
-                "notes": slide.notes,
-                "theme": slide.theme,
-            }
-            deck_data["slides"].append(slide_data)
-
-        # Create temporary JSON file
-        with tempfile.NamedTemporaryFile(
-            mode="w", delete=False, suffix=".json", encoding="utf-8"
-        ) as tmp_json:
-            json_path = tmp_json.name
-            json.dump(deck_data, tmp_json, indent=2)
-
-        # Generate filename
-        safe_topic = "".join(c for c in request.topic if c.isalnum() or c in (" ", "-", "_")).strip()
-        safe_topic = safe_topic.replace(" ", "_")[:50]
-        if not safe_topic:
-            safe_topic = "presentation"
-
-        output_filename = f"{safe_topic}.pptx"
+        output_filename = _export_filename(request.topic, "pptx")
         output_path = settings.DOWNLOADS_DIR / output_filename
 
-        # Export to PPTX
+        # Render in memory, then write the finished file in one go
         logger.info(f"Exporting to {output_path}")
-        await export_slides(json_path, str(output_path))
+        content = await render_deck("pptx", deck_data, deadline=deadline)
+        await asyncio.to_thread(output_path.write_bytes, content)
 
         logger.info("✓ Export complete!")
 
@@ -296,101 +267,39 @@ async def export_pptx(request: FullDeckExportRequest):
             "filename": output_filename,
         }
 
+    except TimeoutError as e:
+        logger.error(str(e))
+        raise HTTPException(status_code=504, detail="Export took too long. Please try again.")
     except Exception as e:
         logger.error(str(e))
         raise HTTPException(status_code=500, detail="Oops! Something went wrong on our end.")
 
-    finally:
-        if json_path and os.path.exists(json_path):
-            try:
-                os.unlink(json_path)
-                logger.debug(f"Cleaned up temporary file: {json_path}")
-            except Exception:
-                logger.debug(f"Failed to clean up temporary file: {json_path}")
-
 
 @router.post("/export-pdf")
-async def export_pdf(request: FullDeckExportRequest):
+async def export_pdf(request: FullDeckExportRequest, deadline: Deadline = Depends(export_deadline)):
     """
     Export a user-edited slide deck to a PDF file.
 
     Request JSON: Same as export-pptx
     Response JSON: {"download_url": str, "filename": str}
     """
-    json_path = None
-
     try:
         logger.info(f"\nStarting PDF export for topic='{request.topic}'")
 
-        logger.info("Fetching images...")
-        image_fetcher = ImageFetcher()
-
-        # Create a list of async tasks for image fetching
-        tasks = []
-        for slide in request.slides:
-            tasks.append(image_fetcher.fetch_image_url(slide.image_prompt))
-
-        # Run tasks concurrently
-        image_urls = await asyncio.gather(*tasks)
-
         logger.info(f"Exporting deck to PDF with {len(request.slides)} slides")
+        # Notes are ignored in PDF as per user feedback
+        deck_data = _export_deck_data(request, include_notes=False)
 
-        # Prepare data for export
-        # Prefer the LLM-generated title/subtitle; fall back to topic/audience
-        export_title = request.title or request.topic or "Untitled Presentation"
-        export_subtitle = request.subtitle or (f"For {request.audience}" if request.audience else "")
-
-        deck_data = {
-            "title": export_title,
-            "subtitle": export_subtitle,
-            "palette": request.palette or [],
-            "font": request.font or "Calibri",
-            "citations": request.citations or [],
-            "slides": [],
-        }
+        # Resolve and download all slide images up front, concurrently
+        await attach_slide_images(deck_data["slides"], deadline=deadline, box=PDF_IMAGE_BOX)
 
-        for i, slide in enumerate(request.slides):
-            slide_data = {
-                "title": slide.title,
-                "summary": slide.summary,
-                "layout": slide.layout,
-                "bullets": slide.bullets,
-                "statement": slide.statement,
-                "big_number": slide.big_number,
-                "big_number_context": slide.big_number_context,
-                "column_left_title": slide.column_left_title,
-                "column_left": slide.column_left,
-                "column_right_title": slide.column_right_title,
-                "column_right": slide.column_right,
-                "steps": slide.steps,
-                "quote_text": slide.quote_text,
-                "quote_attribution": slide.quote_attribution,
-                "image_prompt": slide.image_prompt,
-                "image_url": image_urls[i],
-                # Notes are ignored in PDF as per user feedback
-                "theme": slide.theme,
-            }
-            deck_data["slides"].append(slide_data)
-
-        # Create temporary JSON file
-        with tempfile.NamedTemporaryFile(
-            mode="w", delete=False, suffix=".json", encoding="utf-8"
-        ) as tmp_json:
-            json_path = tmp_json.name
-            json.dump(deck_data, tmp_json, indent=2)
-
-        # Generate filename
-        safe_topic = "".join(c for c in request.topic if c.isalnum() or c in (" ", "-", "_")).strip()
-        safe_topic = safe_topic.replace(" ", "_")[:50]
-        if not safe_topic:
-            safe_topic = "presentation"
-
-        output_filename = f"{safe_topic}.pdf"
+        output_filename = _export_filename(request.topic, "pdf")
         output_path = settings.DOWNLOADS_DIR / output_filename
 
-        # Export to PDF
+        # Render in memory, then write the finished file in one go
         logger.info(f"Exporting to {output_path}")
-        await export_deck_to_pdf(json_path, str(output_path))
+        content = await render_deck("pdf", deck_data, deadline=deadline)
+        await asyncio.to_thread(output_path.write_bytes, content)
 
         logger.info("✓ PDF Export complete!")
 
@@ -400,20 +309,15 @@ async def export_pdf(request: FullDeckExportRequest):
             "filename": output_filename,
         }
 
+    except TimeoutError as e:
+        logger.error(str(e))
+        raise HTTPException(status_code=504, detail="Export took too long. Please try again.")
     except Exception as e:
         logger.error(str(e))
         raise HTTPException(
             status_code=500, detail="Oops! Something went wrong on our end during PDF export."
         )
 
-    finally:
-        if json_path and os.path.exists(json_path):
-            try:
-                os.unlink(json_path)
-                logger.debug(f"Cleaned up temporary file: {json_path}")
-            except Exception:
-                logger.debug(f"Failed to clean up temporary file: {json_path}")
-
 
 @router.get("/health")
 def health_check():
@@ -425,4 +329,5 @@ def health_check():
         "downloads_exists": settings.DOWNLOADS_DIR.exists(),
         "pptx_files": [f.name for f in files],
         "file_count": len(files),
+        "render": render_metrics.to_dict(),
     }
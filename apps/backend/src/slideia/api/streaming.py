@@ -0,0 +1,82 @@
+"""Helpers shared by the Server-Sent Events endpoints.
+
+Starlette only notices a vanished client when the next chunk fails to send,
+so a long LLM call can keep running (and billing tokens) long after the
+browser tab is closed. These helpers watch the connection explicitly and
+cancel the producing task as soon as the client goes away.
+"""
+
+import asyncio
+import json
+from collections.abc import AsyncGenerator
+from contextlib import suppress
+
+from fastapi import Request
+from slideia.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+DISCONNECT_POLL_SECONDS = 0.5
+
+
+async def cancel_on_disconnect(
+    request: Request,
+    task: asyncio.Task,
+    poll_interval: float = DISCONNECT_POLL_SECONDS,
+) -> None:
+    """Poll the client connection and cancel ``task`` once the client disconnects."""
+    while not task.done():
+        if await request.is_disconnected():
+            logger.info("Client disconnected, cancelling in-flight generation.")
+            task.cancel()
+            return
+        await asyncio.sleep(poll_interval)
+
+
+async def cancel_task(task: asyncio.Task | None) -> None:
+    """Cancel ``task`` if it is still running and wait for it to unwind."""
+    if task is None or task.done():
+        return
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
+
+
+async def stream_progress_events(
+    request: Request,
+    events: AsyncGenerator[dict, None],
+    description: str = "generation",
+) -> AsyncGenerator[str, None]:
+    """Relay progress events from a service generator as SSE lines.
+
+    The service generator runs in its own task so that a client disconnect can
+    cancel it mid-await (e.g. while an LLM call is in flight), which in turn
+    cancels any batch tasks it spawned.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce():
+        try:
+            async for event in events:
+                await queue.put(event)
+        except Exception as e:
+            logger.error(f"Error in {description} stream: {e}")
+            await queue.put({"step": "error", "message": str(e)})
+        finally:
+            await events.aclose()
+            await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    watcher = asyncio.create_task(cancel_on_disconnect(request, producer))
+
+    try:
+        while True:
+            event = await queue.get()
+            if event is None:
+                break
+            yield f"data: {json.dumps(event)}\n\n"
+    finally:
+        if not producer.done():
+            logger.info(f"Client disconnected, stopping {description}.")
+        await cancel_task(producer)
+        await cancel_task(watcher)
@@ -3,7 +3,7 @@ from functools import lru_cache
 
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from slideia.core.paths import DOWNLOADS_DIR, ENV_FILE
+from slideia.core.paths import DOWNLOADS_DIR, ENV_FILE, IMAGE_CACHE_DIR
 
 
 class Settings(BaseSettings):
@@ -19,11 +19,73 @@ class Settings(BaseSettings):
     OPENROUTER_MODEL: str = "openrouter/free"
     REDIS_URL: str = "redis://localhost:6379"
     CACHE_TTL_SECONDS: int = 3600
+    DOCUMENT_CACHE_TTL_SECONDS: int = 86400
     DOWNLOADS_DIR: Path = DOWNLOADS_DIR
     LOG_LEVEL: str = "INFO"
     UNSPLASH_ACCESS_KEY: SecretStr
     MAX_CONCURRENT_LLM_CALLS: int = 2
 
+    # Prompt budgeting (tokens)
+    MODEL_CONTEXT_WINDOW: int = 32768
+    MAX_OUTPUT_TOKENS: int = 4096
+    TOKENIZER_ENCODING: str = "cl100k_base"
+
+    # Document summarization (map-reduce over token-bounded chunks)
+    MAX_GLOBAL_LLM_CALLS: int = 8
+    MAX_DOCUMENT_CHARS: int = 400_000
+    SUMMARY_CHUNK_TOKENS: int = 6000
+    SUMMARY_MAX_CHUNKS: int = 16
+    # Local extractive pre-compression target applied before summarization
+    EXTRACTIVE_CONTEXT_TOKENS: int = 24000
+
+    # Per-slide retrieval over uploaded documents (BM25)
+    RETRIEVAL_PASSAGE_TOKENS: int = 300
+    RETRIEVAL_TOP_K: int = 6
+    RETRIEVAL_MAX_TOKENS: int = 2000
+
+    # Text extraction process pool
+    EXTRACTION_WORKERS: int = 2
+    EXTRACTION_TIMEOUT_SECONDS: float = 30.0
+    PDF_PARALLEL_MIN_PAGES: int = 32
+    # "pypdf", "pypdfium2", "pdfminer" or "auto" (fastest installed); others act as fallbacks
+    PDF_BACKEND: str = "pypdf"
+
+    # Image search: results fetched per query, and how long they are cached
+    UNSPLASH_RESULTS_PER_QUERY: int = 10
+    IMAGE_SEARCH_CACHE_TTL_SECONDS: int = 604800
+
+    # Concurrent slide image downloads per export
+    IMAGE_PREFETCH_CONCURRENCY: int = 6
+    # Look up and download slide images in the background while a deck is drafted.
+    # Off by default: it spends image search quota on decks that may never be exported
+    SPECULATIVE_IMAGE_PREFETCH: bool = False
+    SPECULATIVE_IMAGE_CONCURRENCY: int = 2
+    # On-disk cache of downloaded slide images, shared by all workers
+    IMAGE_CACHE_DIR: Path = IMAGE_CACHE_DIR
+    IMAGE_CACHE_MAX_BYTES: int = 268_435_456
+    # Embedded images are downscaled to this resolution for their slot and re-encoded
+    IMAGE_TARGET_DPI: int = 150
+    IMAGE_JPEG_QUALITY: int = 80
+
+    # Export render process pool
+    RENDER_WORKERS: int = 2
+    RENDER_TIMEOUT_SECONDS: float = 60.0
+    # "xml" (writes slide XML directly, fast) or "python-pptx"; both produce the same file
+    PPTX_ENGINE: str = "xml"
+
+    # Pre-uploaded documents (processed in the background, referenced by file ID)
+    UPLOAD_TTL_SECONDS: int = 3600
+    UPLOAD_MAX_ENTRIES: int = 256
+    # Background LLM summaries of uploads running at once; the rest wait their turn
+    UPLOAD_SUMMARY_CONCURRENCY: int = 2
+    # Uploads larger than this are spooled to a temporary file instead of kept in memory
+    UPLOAD_SPOOL_THRESHOLD_BYTES: int = 1_048_576
+
+    # Request deadlines (seconds); clients may override via X-Request-Timeout
+    GENERATION_DEADLINE_SECONDS: float = 120.0
+    EXPORT_DEADLINE_SECONDS: float = 30.0
+    MAX_REQUEST_DEADLINE_SECONDS: float = 300.0
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -0,0 +1,53 @@
+"""
+Request-scoped time budgets.
+
+A ``Deadline`` is created once per request (from the ``X-Request-Timeout``
+header or a per-endpoint default) and passed down through generation, image
+fetching and export so each stage can cap its own timeouts and degrade
+gracefully instead of letting the client time out with nothing.
+"""
+
+import math
+import time
+
+
+class Deadline:
+    """An absolute point in time by which a request should finish."""
+
+    def __init__(self, seconds: float):
+        self.budget = seconds
+        self._expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def from_header(cls, value: str | None, default_seconds: float, max_seconds: float) -> "Deadline":
+        """Build a deadline from a header value (seconds), falling back to the default.
+
+        Client-supplied budgets are clamped to ``max_seconds``.
+        """
+        seconds = default_seconds
+        if value:
+            try:
+                seconds = float(value)
+            except ValueError:
+                seconds = default_seconds
+        if not math.isfinite(seconds) or seconds <= 0:
+            seconds = default_seconds
+        return cls(min(seconds, max_seconds))
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def has_time(self, seconds: float) -> bool:
+        """Whether at least ``seconds`` remain in the budget."""
+        return self.remaining() >= seconds
+
+    def timeout(self, cap: float) -> float:
+        """Per-operation timeout: the smaller of ``cap`` and the remaining budget."""
+        return min(cap, self.remaining())
+
+    def __repr__(self) -> str:
+        return f"Deadline(budget={self.budget}s, remaining={self.remaining():.2f}s)"
@@ -5,7 +5,13 @@ from langchain_core.runnables import RunnableConfig
 from slideia.core.config import settings
 from slideia.core.logging import get_logger
 from slideia.domain.agent.state import AgentState
+from slideia.domain.deck.images import ImagePrefetcher
+from slideia.domain.deck.services import cancel_pending
+from slideia.domain.llm.budget import count_tokens, prompt_budget, truncate_to_tokens
 from slideia.infra.openrouter import OpenRouterLLM
+from slideia.services.extraction import run_in_extraction_pool
+from slideia.services.ingest import compress_document
+from slideia.services.summarize import summarize_reference
 
 logger = get_logger(__name__)
 
@@ -68,7 +74,7 @@ Depending on each slide's "layout", generate the corresponding fields:
   - "statement": A single bold, high-impact statement, key takeaway, or quote (1 sentence, max 15 words) summarizing the core message.
   - "bullets": [], "big_number": null, "big_number_context": null
 - For layout "big_number":
-  - "big_number": A single key statistic, percentage, or metric (e.g., "73%", "5.2 Billion", "$10M+").
+  - "big_number": A single key statistic, percentage, or metric (e.g., "73%", "5.2 Billion", "$10M+"). If the reference material lists "Key figures", prefer one of those.
   - "big_number_context": A short phrase/sentence providing the context for this number (max 8-10 words).
   - "bullets": [], "statement": null
 
@@ -119,16 +125,22 @@ async def classify_intent_node(state: AgentState, config: RunnableConfig) -> dic
     logger.info("Node: classify_intent_node")
     await push_to_queue(config, {"status": "Analyzing request..."})
 
-    # Prepare chat history formatted for LLM call
-    history_str = ""
+    # Prepare chat history formatted for LLM call, keeping the most recent turns that fit
+    max_tokens = prompt_budget.output_tokens("intent")
+    history_lines = []
     for msg in state["messages"][:-1]:
         role = "User" if isinstance(msg, HumanMessage) else "Assistant"
-        history_str += f"{role}: {msg.content}\n"
+        history_lines.append(f"{role}: {msg.content}\n")
+
+    history_budget = prompt_budget.input_budget(max_tokens) - count_tokens(
+        INTENT_SYSTEM_PROMPT + state["prompt"]
+    )
+    history_str = "".join(prompt_budget.fit_history(history_lines, history_budget))
 
     prompt = f"{INTENT_SYSTEM_PROMPT}\n\nHISTORY:\n{history_str}\nCURRENT PROMPT:\n{state['prompt']}\n"
 
     try:
-        result = await llm._call(prompt)
+        result = await llm._call(prompt, max_tokens=max_tokens)
         intent = result.get("intent", "CHAT")
         instruction = result.get("instruction")
 
@@ -177,11 +189,9 @@ async def propose_outline_node(state: AgentState, config: RunnableConfig) -> dic
     slide_count = state.get("slide_count") or 5
     theme_preset = state.get("theme_preset") or "Default"
 
-    # Inject file context if present (prioritize summarized_context if available)
-    theme_instruction = theme_preset
+    # Inject file context if present (prioritize summarized_context if available);
+    # the LLM client trims it to fit the outline prompt budget
     ref_material = state.get("summarized_context") or state.get("file_context")
-    if ref_material:
-        theme_instruction += f"\n\nReference Material:\n{ref_material}"
 
     try:
         outline = await llm.propose_outline(
@@ -189,7 +199,8 @@ async def propose_outline_node(state: AgentState, config: RunnableConfig) -> dic
             audience=audience,
             tone=tone,
             slide_count=slide_count,
-            theme_instruction=theme_instruction,
+            theme_instruction=theme_preset,
+            reference_material=ref_material,
         )
 
         return {
@@ -234,11 +245,19 @@ async def draft_slides_node(state: AgentState, config: RunnableConfig) -> dict:
     topic = state.get("topic") or state["prompt"]
     audience = state.get("audience") or "General Audience"
 
-    # Inject file context if present (prioritize summarized_context if available)
-    theme_instruction = theme_preset
+    # Inject file context if present (prioritize summarized_context if available); with an
+    # index, each batch only gets the passages relevant to its own slides
     ref_material = state.get("summarized_context") or state.get("file_context")
-    if ref_material:
-        theme_instruction += f"\n\nReference Material:\n{ref_material}"
+    document_index = state.get("document_index")
+
+    def batch_reference(batch: list[dict]) -> str | None:
+        if not document_index:
+            return ref_material
+        query = " ".join(f"{spec.get('title', '')} {spec.get('summary', '')}" for spec in batch)
+        passages = document_index.retrieve(
+            f"{topic} {query}", top_k=settings.RETRIEVAL_TOP_K, max_tokens=settings.RETRIEVAL_MAX_TOKENS
+        )
+        return passages or ref_material
 
     semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_LLM_CALLS)
     batch_size = 3
@@ -250,32 +269,52 @@ async def draft_slides_node(state: AgentState, config: RunnableConfig) -> dict:
         async with semaphore:
             try:
                 res = await llm.draft_slides_batch(
-                    topic, audience, batch, theme_instruction=theme_instruction
+                    topic,
+                    audience,
+                    batch,
+                    theme_instruction=theme_preset,
+                    reference_material=batch_reference(batch),
                 )
                 return res.get("slides", []), start_idx
             except Exception as e:
                 logger.error(f"Batch generation failed: {e}")
                 return [], start_idx
 
-    tasks = [process_batch(b, i * batch_size) for i, b in enumerate(batches)]
-
-    for future in asyncio.as_completed(tasks):
-        batch_slides, batch_start = await future
-        for j, slide in enumerate(batch_slides):
-            idx = batch_start + j
-            if idx < total_slides:
-                slides_content[idx] = slide
-                slides_processed += 1
-                await push_to_queue(
-                    config,
-                    {
-                        "status": f"Drafting slides ({slides_processed}/{total_slides}): {slide.get('title')}...",
-                        "token": f"✓ {slide.get('title')} ",
-                    },
-                )
+    tasks = [asyncio.create_task(process_batch(b, i * batch_size)) for i, b in enumerate(batches)]
+
+    # Warm the image caches for the export while the remaining batches are drafted
+    images = ImagePrefetcher() if settings.SPECULATIVE_IMAGE_PREFETCH else None
+    drafted = False
+
+    try:
+        for future in asyncio.as_completed(tasks):
+            batch_slides, batch_start = await future
+            if images is not None:
+                images.add(batch_slides)
+            for j, slide in enumerate(batch_slides):
+                idx = batch_start + j
+                if idx < total_slides:
+                    slides_content[idx] = slide
+                    slides_processed += 1
+                    await push_to_queue(
+                        config,
+                        {
+                            "status": f"Drafting slides ({slides_processed}/{total_slides}): {slide.get('title')}...",
+                            "token": f"✓ {slide.get('title')} ",
+                        },
+                    )
+        drafted = True
+    finally:
+        # Stop any remaining batches if the agent run is cancelled (e.g. client disconnect)
+        await cancel_pending(tasks)
+        if images is not None and not drafted:
+            await images.cancel()
 
     # Flatten and validate non-null slides
     slides_content = [s for s in slides_content if s is not None]
+    if images is not None:
+        images.attach()
+        images.detach()
 
     deck["slides"] = slides_content
     logger.info(f"Finished drafting {len(slides_content)} slides.")
@@ -300,23 +339,33 @@ async def refine_deck_node(state: AgentState, config: RunnableConfig) -> dict:
 
     instruction = state.get("instruction") or state["prompt"]
 
+    slides = deck.get("slides", [])
+    max_tokens = prompt_budget.output_tokens("refine", len(slides) + 1)
+
+    def build_prompt(file_block: str) -> str:
+        return REFINEMENT_PROMPT_TEMPLATE.format(
+            topic=state.get("topic", "Presentation"),
+            audience=state.get("audience", "Audience"),
+            tone=state.get("tone", "Professional"),
+            theme_preset=state.get("theme_preset", "Default"),
+            slides_json=json.dumps(slides, indent=2),
+            instruction=instruction,
+            file_context_block=file_block,
+        )
+
     file_block = ""
     ref_material = state.get("summarized_context") or state.get("file_context")
     if ref_material:
-        file_block = f"USER UPLOADED FILE CONTEXT:\n{ref_material}\n"
-
-    prompt = REFINEMENT_PROMPT_TEMPLATE.format(
-        topic=state.get("topic", "Presentation"),
-        audience=state.get("audience", "Audience"),
-        tone=state.get("tone", "Professional"),
-        theme_preset=state.get("theme_preset", "Default"),
-        slides_json=json.dumps(deck.get("slides", []), indent=2),
-        instruction=instruction,
-        file_context_block=file_block,
-    )
+        ref_material = prompt_budget.fit_reference(
+            ref_material, build_prompt("USER UPLOADED FILE CONTEXT:\n"), max_tokens
+        )
+        if ref_material:
+            file_block = f"USER UPLOADED FILE CONTEXT:\n{ref_material}\n"
+
+    prompt = build_prompt(file_block)
 
     try:
-        updated_deck = await llm._call(prompt, max_tokens=4096)
+        updated_deck = await llm._call(prompt, max_tokens=max_tokens)
 
         # Retain outline title & citations if absent from model output
         deck_update = {
@@ -387,13 +436,24 @@ async def general_chat_node(state: AgentState, config: RunnableConfig) -> dict:
     )
     messages.append({"role": "system", "content": system_prompt})
 
+    # Budget the window: the current prompt always goes in, then reference material
+    # (capped at 60% of what remains), then as much recent history as still fits
+    max_tokens = prompt_budget.output_tokens("chat")
+    remaining = prompt_budget.input_budget(max_tokens) - count_tokens(system_prompt + state["prompt"])
+
+    ref_material = state.get("summarized_context") or state.get("file_context")
+    if ref_material:
+        ref_material, _ = truncate_to_tokens(ref_material, int(remaining * 0.6))
+        remaining -= count_tokens(ref_material)
+
     # History
-    for msg in state["messages"][:-1]:
+    history = state["messages"][:-1]
+    kept = prompt_budget.fit_history([msg.content for msg in history], remaining)
+    for msg in history[len(history) - len(kept) :]:
         role = "user" if isinstance(msg, HumanMessage) else "assistant"
         messages.append({"role": role, "content": msg.content})
 
     # File context
-    ref_material = state.get("summarized_context") or state.get("file_context")
     if ref_material:
         messages.append({"role": "user", "content": f"Context files:\n{ref_material}"})
 
@@ -403,7 +463,7 @@ async def general_chat_node(state: AgentState, config: RunnableConfig) -> dict:
     # Stream the tokens through queue
     full_response = ""
     try:
-        async for token in llm.stream_call(messages):
+        async for token in llm.stream_call(messages, max_tokens=max_tokens):
             await push_to_queue(config, {"token": token})
             full_response += token
 
@@ -435,10 +495,23 @@ async def summarize_context_node(state: AgentState, config: RunnableConfig) -> d
         },
     )
 
+    async def report_progress(done: int, total: int):
+        await push_to_queue(
+            config, {"status": f"Summarizing uploaded documents ({done}/{total} sections)..."}
+        )
+
     try:
-        summary = await llm.summarize_document(file_context)
+        summary = await summarize_reference(file_context, llm, on_progress=report_progress)
         await push_to_queue(config, {"token": "✓ Summarized reference material.\n"})
         return {"summarized_context": summary}
     except Exception as e:
         logger.error(f"Context summarization failed: {e}")
-        return {"summarized_context": None}
+        # The extractive version still keeps downstream prompts far smaller than the raw text
+        try:
+            compressed, is_compressed = await run_in_extraction_pool(
+                compress_document, file_context, settings.EXTRACTIVE_CONTEXT_TOKENS
+            )
+        except Exception as e:
+            logger.error(f"Extractive context compression failed: {e}")
+            return {"summarized_context": None}
+        return {"summarized_context": compressed if is_compressed else None}
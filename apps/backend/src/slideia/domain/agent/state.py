@@ -2,6 +2,8 @@ from typing import Annotated, Sequence, TypedDict
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
 
+from slideia.services.ingest import DocumentIndex
+
 
 class AgentState(TypedDict):
     """The state of the presentation generation agent.
@@ -32,6 +34,9 @@ class AgentState(TypedDict):
     # Condensed summary of the file_context to fit in prompt limits
     summarized_context: str | None
 
+    # BM25 index over file_context passages, built at upload time for per-slide retrieval
+    document_index: DocumentIndex | None
+
     # Intent classified by the intent classifier node:
     # "CREATE_DECK" | "EDIT_DECK" | "CHAT" | "UNKNOWN"
     intent: str
@@ -2,48 +2,151 @@
 Exporter module for the slideia package.
 """
 
+import functools
 import json
 import os
+import tempfile
+from dataclasses import dataclass
 from io import BytesIO
+from typing import BinaryIO
 
-import httpx
 from pptx import Presentation
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.util import Inches, Pt
+from slideia.core.config import settings
+from slideia.core.deadline import Deadline
 from slideia.core.logging import get_logger
+from slideia.domain.deck.images import PPTX_IMAGE_BOX, attach_slide_images
+from slideia.domain.deck.models import DeckData, deck_data
+from slideia.domain.deck.pptx_writer import write_content_slides
 from slideia.domain.deck.services import create_minimal_template
 
 logger = get_logger(__name__)
 
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), "templates", "base_template.pptx")
 
-async def export_slides(input_path: str, output_path: str):
+# "xml" writes content slides as XML (fast); "python-pptx" builds them through its object API
+PPTX_ENGINES = ("xml", "python-pptx")
+
+
+@dataclass(frozen=True)
+class PreparedTemplate:
+    """The PPTX template with its sample slides removed, as immutable bytes."""
+
+    data: bytes
+    blank_layout_index: int
+
+    def open(self):
+        """A fresh, independent ``Presentation`` of the template."""
+        return Presentation(BytesIO(self.data))
+
+
+def _find_blank_layout(prs) -> int:
+    for index, layout in enumerate(prs.slide_layouts):
+        if len(layout.placeholders) == 0 or "blank" in layout.name.lower():
+            logger.info(f"Found blank layout: {layout.name}")
+            return index
+
+    if len(prs.slide_layouts) > 6:
+        logger.info("Using layout 6 as blank")
+        return 6
+    logger.warning("Using layout 1, blank not found")
+    return 1
+
+
+def _write_template(path: str, data: bytes):
+    """Save a generated template for later customization; atomic, so concurrent processes can't clash."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".pptx")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not save generated template to {path}: {e}")
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+@functools.cache
+def prepared_template() -> PreparedTemplate:
+    """
+    Load and prepare the PPTX template once per process.
+
+    A minimal template is generated (and saved to ``TEMPLATE_PATH``) if none
+    exists. Render workers call this on startup, so exports only pay for
+    opening the prepared bytes.
+    """
+    if os.path.exists(TEMPLATE_PATH):
+        prs = Presentation(TEMPLATE_PATH)
+    else:
+        logger.warning(f"Template not found: {TEMPLATE_PATH}, generating minimal template")
+        buffer = BytesIO()
+        create_minimal_template(buffer)
+        _write_template(TEMPLATE_PATH, buffer.getvalue())
+        buffer.seek(0)
+        prs = Presentation(buffer)
+
+    # Remove all slides from the template to avoid duplicates in output
+    while len(prs.slides) > 0:
+        rId = prs.slides._sldIdLst[0].rId
+        prs.part.drop_rel(rId)
+        del prs.slides._sldIdLst[0]
+
+    output = BytesIO()
+    prs.save(output)
+    return PreparedTemplate(data=output.getvalue(), blank_layout_index=_find_blank_layout(prs))
+
+
+async def export_slides(input_path: str, output_path: str, deadline: Deadline | None = None):
     """
     Export slides from a JSON file to a PowerPoint file.
+
+    File-based wrapper around ``render_pptx``, kept for the MCP tool.
     """
     if not os.path.exists(input_path):
         logger.error(f"Input file not found: {input_path}")
         raise FileNotFoundError(f"Input file not found: {input_path}")
 
-    # Use the minimal professional template
-    template_path = os.path.join(os.path.dirname(__file__), "templates", "base_template.pptx")
-    if not os.path.exists(template_path):
-        logger.warning(f"Template not found: {template_path}, generating minimal template")
-        out_path = os.path.join(os.path.dirname(__file__), "templates", "base_template.pptx")
-        os.makedirs(os.path.dirname(out_path), exist_ok=True)
-        create_minimal_template(out_path)
-        logger.info(f"Template saved to {out_path}")
-
     with open(input_path, "r", encoding="utf-8") as f:
         data = json.load(f)
 
-    prs = Presentation(template_path)
+    buffer = await render_pptx(data, deadline=deadline)
+    with open(output_path, "wb") as f:
+        f.write(buffer.getbuffer())
+    logger.info(f"Exported slides to {output_path}")
 
-    # Remove all slides from the template to avoid duplicates in output
-    while len(prs.slides) > 0:
-        rId = prs.slides._sldIdLst[0].rId
-        prs.part.drop_rel(rId)
-        del prs.slides._sldIdLst[0]
+
+async def render_pptx(
+    deck: DeckData,
+    output: BinaryIO | None = None,
+    deadline: Deadline | None = None,
+    engine: str | None = None,
+) -> BinaryIO:
+    """
+    Render a deck to PowerPoint in memory.
+
+    Writes the .pptx into ``output`` (a new ``BytesIO`` by default) and returns
+    it, rewound when seekable. Slide images are taken from ``image_data`` bytes;
+    slides that only have an ``image_url`` are downloaded concurrently before
+    rendering, within the ``deadline`` if given. Slides without an image get a
+    placeholder box. ``engine`` (default ``PPTX_ENGINE``) selects how content
+    slides are built; both produce the same file.
+    """
+    engine = engine or settings.PPTX_ENGINE
+    if engine not in PPTX_ENGINES:
+        logger.warning(f"Unknown PPTX engine '{engine}', using python-pptx")
+        engine = "python-pptx"
+
+    data = deck_data(deck)
+    output = output if output is not None else BytesIO()
+    slides = [dict(s) for s in data.get("slides", [])]
+    await attach_slide_images(slides, deadline=deadline, search=False, box=PPTX_IMAGE_BOX)
+
+    # Use the minimal professional template
+    template = prepared_template()
+    prs = template.open()
 
     # Title slide (use first layout)
     title_slide_layout = prs.slide_layouts[0]
@@ -61,22 +164,13 @@ async def export_slides(input_path: str, output_path: str):
         slide.placeholders[1].text = subtitle
 
     # Content slides - Use BLANK layout
-    blank_layout = None
-    for layout in prs.slide_layouts:
-        if len(layout.placeholders) == 0 or "blank" in layout.name.lower():
-            blank_layout = layout
-            logger.info(f"Found blank layout: {layout.name}")
-            break
+    blank_layout = prs.slide_layouts[template.blank_layout_index]
 
-    if blank_layout is None:
-        try:
-            blank_layout = prs.slide_layouts[6]
-            logger.info("Using layout 6 as blank")
-        except IndexError:
-            blank_layout = prs.slide_layouts[1]
-            logger.warning("Using layout 1, blank not found")
+    if engine == "xml":
+        write_content_slides(prs, blank_layout, slides, data)
+        return _save(prs, output)
 
-    for slide_index, s in enumerate(data.get("slides", [])):
+    for slide_index, s in enumerate(slides):
         logger.info(f"Processing slide {slide_index + 1}")
 
         content_slide = prs.slides.add_slide(blank_layout)
@@ -141,8 +235,8 @@ async def export_slides(input_path: str, output_path: str):
 
         # Determine if slide has an image (only bullets layout uses images)
         image_path = s.get("image_path")
-        image_url = s.get("image_url")
-        has_image = (bool(image_url) or bool(image_path)) and layout == "bullets"
+        image_data = s.get("image_data")
+        has_image = (bool(image_data) or bool(s.get("image_url")) or bool(image_path)) and layout == "bullets"
 
         # Position and size the content text box dynamically to prevent overlap with the image slot
         if has_image:
@@ -415,8 +509,6 @@ async def export_slides(input_path: str, output_path: str):
             notes_frame.text = notes
 
         # Image handling
-        image_path = s.get("image_path")
-        image_url = s.get("image_url")
         image_prompt = s.get("image_prompt", "")
 
         if not isinstance(image_prompt, str):
@@ -427,30 +519,23 @@ async def export_slides(input_path: str, output_path: str):
         # Start low enough to clear the title bar and give breathing room
         if has_image:
             img_left = Inches(6.8)
-            img_width = Inches(2.7)
-            img_height = Inches(2.2)
+            img_width = Inches(PPTX_IMAGE_BOX[0])
+            img_height = Inches(PPTX_IMAGE_BOX[1])
             # Center the image vertically within the content area (1.8 to 6.3)
             img_top = Inches(1.8) + (Inches(4.5) - img_height) / 2
 
             pic = None
 
-            # Try to fetch image URL first
-            if image_url:
+            # Prefer the prefetched image
+            if image_data:
                 try:
-                    logger.info(f"Downloading image from {image_url}...")
-                    async with httpx.AsyncClient(timeout=10.0) as client:
-                        response = await client.get(image_url)
-                    if response.status_code == 200:
-                        image_stream = BytesIO(response.content)
-                        pic = content_slide.shapes.add_picture(
-                            image_stream, img_left, img_top, width=img_width, height=img_height
-                        )
-                    else:
-                        logger.warning(f"Failed to download image: status {response.status_code}")
+                    pic = content_slide.shapes.add_picture(
+                        BytesIO(image_data), img_left, img_top, width=img_width, height=img_height
+                    )
                 except Exception as e:
-                    logger.warning(f"Error downloading image: {e}")
+                    logger.warning(f"Image insert failed: {e}")
 
-            # If no URL or download failed, try local path
+            # If there is no image or it could not be inserted, try local path
             if not pic and image_path and os.path.exists(image_path):
                 try:
                     pic = content_slide.shapes.add_picture(
@@ -548,5 +633,11 @@ async def export_slides(input_path: str, output_path: str):
             p.space_after = Pt(12)
             p.alignment = PP_ALIGN.LEFT
 
-    prs.save(output_path)
-    logger.info(f"Exported slides to {output_path}")
+    return _save(prs, output)
+
+
+def _save(prs, output: BinaryIO) -> BinaryIO:
+    prs.save(output)
+    if output.seekable():
+        output.seek(0)
+    return output
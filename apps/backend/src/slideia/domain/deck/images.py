@@ -0,0 +1,244 @@
+"""
+Slide image resolution for export.
+
+Images are resolved (searched) and downloaded for the whole deck up front, with
+bounded concurrency, and handed to the renderers as bytes. Export time is then
+bounded by the slowest image rather than the sum of all of them, and the
+renderers themselves never touch the network for a prepared deck. Downloaded
+images are downscaled to the size of the slot they are placed in, so full
+resolution photos don't bloat the output.
+"""
+
+import asyncio
+from io import BytesIO
+
+from PIL import Image, ImageOps
+from slideia.core.config import settings
+from slideia.core.deadline import Deadline
+from slideia.core.logging import get_logger
+from slideia.infra.cache import image_cache
+from slideia.infra.image_fetcher import ImageFetcher, normalize_query
+
+logger = get_logger(__name__)
+
+# Slide layouts that have an image slot
+IMAGE_LAYOUTS = frozenset({"bullets"})
+
+# Size of the image slot (width, height in inches) in each export format
+PPTX_IMAGE_BOX = (2.7, 2.2)
+PDF_IMAGE_BOX = (3.0, 3.0 / 1.78)
+
+
+def slide_layout(slide: dict) -> str:
+    """The slide's layout, defaulting to "bullets" for backward compatibility."""
+    return slide.get("layout") or "bullets"
+
+
+def image_prompt(slide: dict) -> str:
+    prompt = slide.get("image_prompt")
+    if not isinstance(prompt, str):
+        prompt = str(prompt) if prompt else ""
+    return prompt.strip()
+
+
+def shows_image(slide: dict) -> bool:
+    """Whether the slide can display an image and has something to fill the slot with."""
+    if slide_layout(slide) not in IMAGE_LAYOUTS:
+        return False
+    return bool(slide.get("image_data") or slide.get("image_url") or image_prompt(slide))
+
+
+def prepare_image(
+    data: bytes, box: tuple[float, float], dpi: int | None = None, quality: int | None = None
+) -> bytes:
+    """Downscale and re-encode image ``data`` for a slot of ``box`` inches.
+
+    The image keeps its aspect ratio and is scaled to just cover the slot at
+    ``dpi`` (default ``IMAGE_TARGET_DPI``); it is never enlarged. Opaque images
+    are saved as JPEG at ``quality`` (default ``IMAGE_JPEG_QUALITY``), ones with
+    transparency as PNG. Results are cached by (source digest, target size,
+    quality), so the same image always yields the same bytes. The original is
+    returned if it is already smaller or cannot be decoded.
+    """
+    dpi = dpi or settings.IMAGE_TARGET_DPI
+    quality = quality or settings.IMAGE_JPEG_QUALITY
+    target = (round(box[0] * dpi), round(box[1] * dpi))
+    key = f"variant:{image_cache.digest(data)}:{target[0]}x{target[1]}:q{quality}"
+
+    cached = image_cache.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        processed = _transcode(data, target, quality)
+    except Exception as e:
+        logger.warning(f"Could not process image, embedding as-is: {e}")
+        return data
+    if len(processed) >= len(data):
+        processed = data
+    image_cache.put(key, processed)
+    return processed
+
+
+def _transcode(data: bytes, target: tuple[int, int], quality: int) -> bytes:
+    with Image.open(BytesIO(data)) as source:
+        # Let the JPEG decoder skip detail that would be thrown away anyway
+        source.draft("RGB", target)
+        image = ImageOps.exif_transpose(source)
+        scale = max(target[0] / image.width, target[1] / image.height)
+        if scale < 1:
+            size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            image = image.resize(size, Image.Resampling.LANCZOS)
+
+        output = BytesIO()
+        if image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info:
+            image.save(output, format="PNG", optimize=True)
+        else:
+            image.convert("RGB").save(output, format="JPEG", quality=quality, optimize=True)
+        return output.getvalue()
+
+
+async def attach_slide_images(
+    slides: list[dict],
+    deadline: Deadline | None = None,
+    search: bool = True,
+    fetcher: ImageFetcher | None = None,
+    concurrency: int | None = None,
+    box: tuple[float, float] | None = None,
+) -> int:
+    """Download the images for ``slides`` concurrently and store them as ``image_data`` bytes.
+
+    Slides that cannot show an image, or already carry ``image_data``, are
+    skipped. A slide's ``image_url`` is used when present; otherwise, with
+    ``search``, one is looked up from its ``image_prompt``. Identical or
+    near-identical prompts share a single search and are handed different
+    photos from its results, and each URL is downloaded once. With ``box`` the
+    images are prepared for a slot of that size (see ``prepare_image``). Slides
+    whose image could not be obtained are left as they are, so the renderers
+    fall back to a placeholder. At most ``concurrency`` (default
+    ``IMAGE_PREFETCH_CONCURRENCY``) requests run at a time.
+
+    Returns the number of images attached.
+    """
+    pending = [
+        slide
+        for slide in slides
+        if shows_image(slide)
+        and not slide.get("image_data")
+        and (slide.get("image_url") or (search and image_prompt(slide)))
+    ]
+    if not pending:
+        return 0
+
+    fetcher = fetcher or ImageFetcher()
+    semaphore = asyncio.Semaphore(concurrency or settings.IMAGE_PREFETCH_CONCURRENCY)
+
+    # One search per distinct normalized prompt
+    queries: dict[str, str] = {}
+    for slide in pending:
+        if not slide.get("image_url"):
+            queries.setdefault(normalize_query(image_prompt(slide)), image_prompt(slide))
+
+    async def search(query: str) -> list[str]:
+        async with semaphore:
+            return await fetcher.fetch_image_urls(query, deadline=deadline)
+
+    results = dict(zip(queries, await asyncio.gather(*(search(query) for query in queries.values()))))
+
+    # Hand out photos in slide order, avoiding repeats within the deck while results last
+    used = {slide["image_url"] for slide in pending if slide.get("image_url")}
+    for slide in pending:
+        if slide.get("image_url"):
+            continue
+        urls = results[normalize_query(image_prompt(slide))]
+        if not urls:
+            continue
+        url = next((url for url in urls if url not in used), urls[0])
+        slide["image_url"] = url
+        used.add(url)
+
+    by_url: dict[str, list[dict]] = {}
+    for slide in pending:
+        if slide.get("image_url"):
+            by_url.setdefault(slide["image_url"], []).append(slide)
+
+    async def download(url: str, group: list[dict]) -> int:
+        async with semaphore:
+            data = await fetcher.download_image(url, deadline=deadline)
+        if not data:
+            return 0
+        if box is not None:
+            data = await asyncio.to_thread(prepare_image, data, box)
+        for slide in group:
+            slide["image_data"] = data
+        return len(group)
+
+    attached = sum(await asyncio.gather(*(download(url, group) for url, group in by_url.items())))
+    logger.info(
+        f"Prefetched {attached}/{len(pending)} slide images "
+        f"({len(queries)} searches, {len(by_url)} downloads)"
+    )
+    return attached
+
+
+class ImagePrefetcher:
+    """
+    Best-effort image resolution for slides while a deck is still being drafted.
+
+    ``add`` schedules a lookup for each newly drafted slide that can show an
+    image and returns at once; a small concurrency limit keeps the lookups from
+    competing with the LLM calls. Each lookup searches for the slide's prompt
+    and downloads the chosen photo into the image cache, so a later export
+    finds both caches warm. ``attach`` copies the URLs resolved so far onto the
+    slides without waiting for the rest, ``detach`` lets outstanding lookups
+    finish in the background and ``cancel`` drops them.
+    """
+
+    # Lookups left running after their deck was returned; referenced so they aren't garbage collected
+    _background: set[asyncio.Task] = set()
+
+    def __init__(self, fetcher: ImageFetcher | None = None, concurrency: int | None = None):
+        self._fetcher = fetcher or ImageFetcher()
+        self._semaphore = asyncio.Semaphore(concurrency or settings.SPECULATIVE_IMAGE_CONCURRENCY)
+        self._tasks: list[asyncio.Task] = []
+        self._resolved: list[tuple[dict, str]] = []
+        self._used: set[str] = set()
+
+    def add(self, slides: list[dict]):
+        for slide in slides:
+            if shows_image(slide) and not slide.get("image_url") and image_prompt(slide):
+                self._tasks.append(asyncio.create_task(self._resolve(slide)))
+
+    async def _resolve(self, slide: dict):
+        try:
+            async with self._semaphore:
+                urls = await self._fetcher.fetch_image_urls(image_prompt(slide))
+                if not urls:
+                    return
+                url = next((url for url in urls if url not in self._used), urls[0])
+                self._used.add(url)
+                self._resolved.append((slide, url))
+                await self._fetcher.download_image(url)
+        except Exception as e:
+            logger.warning(f"Speculative image lookup failed: {e}")
+
+    def attach(self) -> int:
+        """Set ``image_url`` on the slides resolved so far; returns how many."""
+        for slide, url in self._resolved:
+            slide.setdefault("image_url", url)
+        pending = sum(not task.done() for task in self._tasks)
+        logger.info(f"Attached {len(self._resolved)} speculative images ({pending} still warming)")
+        return len(self._resolved)
+
+    def detach(self):
+        for task in self._tasks:
+            if not task.done():
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+        self._tasks = []
+
+    async def cancel(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
@@ -1,5 +1,15 @@
 from dataclasses import dataclass
 
+from pydantic import BaseModel
+
+# A deck in the exporters' input shape: the export JSON as a dict, or a pydantic model of it
+DeckData = dict | BaseModel
+
+
+def deck_data(deck: DeckData) -> dict:
+    """Plain-dict view of an export deck."""
+    return deck.model_dump() if isinstance(deck, BaseModel) else deck
+
 
 @dataclass
 class Slide:
@@ -2,11 +2,15 @@
 PDF Exporter module for the slideia package.
 """
 
+import functools
 import json
 import os
+from contextlib import contextmanager
+from dataclasses import dataclass
 from io import BytesIO
+from typing import BinaryIO
 
-import httpx
+from reportlab import rl_config
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
@@ -14,7 +18,10 @@ from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from reportlab.pdfgen import canvas
 from reportlab.platypus import Paragraph
+from slideia.core.deadline import Deadline
 from slideia.core.logging import get_logger
+from slideia.domain.deck.images import PDF_IMAGE_BOX, attach_slide_images
+from slideia.domain.deck.models import DeckData, deck_data
 
 logger = get_logger(__name__)
 
@@ -51,9 +58,168 @@ def _parse_palette(palette: list[str]) -> dict:
     }
 
 
-async def export_deck_to_pdf(input_path: str, output_path: str):
+# Name of the form XObject holding the background and header divider of content pages
+CHROME_FORM = "SlideChrome"
+
+
+@dataclass(frozen=True, eq=False)
+class PdfTheme:
+    """
+    Resolved colours and paragraph styles for one palette.
+
+    Built once per palette by ``pdf_theme`` and shared by every export using it,
+    so neither the colours nor the styles may be modified. Colours are read as
+    ``theme["primary"]``, styles as ``theme.styles["Bullet"]``.
+    """
+
+    colors: dict
+    styles: dict[str, ParagraphStyle]
+
+    def __getitem__(self, name: str):
+        return self.colors[name]
+
+
+@functools.lru_cache(maxsize=64)
+def pdf_theme(palette: tuple = ()) -> PdfTheme:
+    """Theme for a palette key from ``_palette_key``; parsed and styled once per distinct palette."""
+    theme = _parse_palette(list(palette)) if palette else THEME_DEFAULTS.copy()
+    return PdfTheme(colors=theme, styles=_paragraph_styles(theme))
+
+
+def _palette_key(raw_palette) -> tuple:
+    """
+    Hashable key for ``pdf_theme``.
+
+    Only the first two entries are used; anything but a string falls back to
+    the default colour when parsed, so it is keyed as ``None``.
+    """
+    if not raw_palette:
+        return ()
+    return tuple(value if isinstance(value, str) else None for value in raw_palette[:2])
+
+
+def _paragraph_styles(theme: dict) -> dict[str, ParagraphStyle]:
+    """Paragraph styles of every slide layout in ``theme``'s colours, keyed by style name."""
+    normal = getSampleStyleSheet()["Normal"]
+    styles = [
+        ParagraphStyle(
+            "Summary",
+            parent=normal,
+            fontName="Helvetica",
+            fontSize=14,
+            textColor=theme["text"],
+            leading=18,
+            spaceAfter=12,
+        ),
+        ParagraphStyle(
+            "Bullet",
+            parent=normal,
+            fontName="Helvetica",
+            fontSize=16,
+            textColor=theme["text"],
+            leading=22,
+            leftIndent=20,
+            bulletIndent=5,
+            spaceAfter=8,
+        ),
+        ParagraphStyle(
+            "Statement",
+            parent=normal,
+            fontName="Helvetica-BoldOblique",
+            fontSize=36,
+            textColor=theme["text"],
+            leading=44,
+            spaceAfter=12,
+            alignment=TA_CENTER,
+        ),
+        ParagraphStyle(
+            "BigNumber",
+            parent=normal,
+            fontName="Helvetica-Bold",
+            fontSize=100,
+            textColor=theme["primary"],
+            leading=110,
+            spaceAfter=14,
+            alignment=TA_CENTER,
+        ),
+        ParagraphStyle(
+            "BigNumberContext",
+            parent=normal,
+            fontName="Helvetica",
+            fontSize=24,
+            textColor=theme["text"],
+            leading=28,
+            spaceAfter=12,
+            alignment=TA_CENTER,
+        ),
+        ParagraphStyle(
+            "ColTitle",
+            parent=normal,
+            fontName="Helvetica-Bold",
+            fontSize=12,
+            textColor=theme["primary"],
+            leading=16,
+            spaceAfter=6,
+            alignment=TA_LEFT,
+        ),
+        ParagraphStyle(
+            "ColItem",
+            parent=normal,
+            fontName="Helvetica",
+            fontSize=14,
+            textColor=theme["text"],
+            leading=18,
+            spaceAfter=5,
+            alignment=TA_LEFT,
+        ),
+        ParagraphStyle(
+            "Step",
+            parent=normal,
+            fontName="Helvetica",
+            fontSize=18,
+            textColor=theme["text"],
+            leading=24,
+            spaceAfter=10,
+            alignment=TA_LEFT,
+        ),
+        ParagraphStyle(
+            "QuoteText",
+            parent=normal,
+            fontName="Helvetica-Oblique",
+            fontSize=26,
+            textColor=theme["text"],
+            leading=34,
+            spaceAfter=14,
+            alignment=TA_CENTER,
+        ),
+        ParagraphStyle(
+            "QuoteAttr",
+            parent=normal,
+            fontName="Helvetica",
+            fontSize=14,
+            textColor=theme["secondary"],
+            leading=18,
+            spaceAfter=0,
+            alignment=TA_CENTER,
+        ),
+        ParagraphStyle(
+            "ReferenceItem",
+            parent=normal,
+            fontName="Helvetica",
+            fontSize=14,
+            textColor=theme["text"],
+            leading=18,
+            spaceAfter=12,
+        ),
+    ]
+    return {style.name: style for style in styles}
+
+
+async def export_deck_to_pdf(input_path: str, output_path: str, deadline: Deadline | None = None):
     """
     Export slides from a JSON file to a PDF file.
+
+    File-based wrapper around ``render_pdf``.
     """
     if not os.path.exists(input_path):
         logger.error(f"Input file not found: {input_path}")
@@ -62,36 +228,79 @@ async def export_deck_to_pdf(input_path: str, output_path: str):
     with open(input_path, "r", encoding="utf-8") as f:
         data = json.load(f)
 
-    # Resolve theme colours: prefer explicit palette from data, fallback to defaults
-    raw_palette = data.get("palette") or []
-    theme = _parse_palette(raw_palette) if raw_palette else THEME_DEFAULTS.copy()
+    buffer = await render_pdf(data, deadline=deadline)
+    with open(output_path, "wb") as f:
+        f.write(buffer.getbuffer())
+    logger.info(f"Exported PDF to {output_path}")
 
-    # Setup canvas
-    c = canvas.Canvas(output_path, pagesize=landscape(A4))
-    width, height = landscape(A4)
 
-    # 1. Title Slide
-    _draw_title_slide(c, data, width, height, theme)
-    c.showPage()
+async def render_pdf(
+    deck: DeckData, output: BinaryIO | None = None, deadline: Deadline | None = None
+) -> BinaryIO:
+    """
+    Render a deck to PDF in memory.
 
-    # 2. Content Slides
-    for slide_index, s in enumerate(data.get("slides", [])):
-        logger.info(f"Processing PDF slide {slide_index + 1}")
-        await _draw_content_slide(c, s, slide_index, width, height, theme)
-        c.showPage()
+    Writes the PDF into ``output`` (a new ``BytesIO`` by default) and returns it,
+    rewound when seekable. Slide images are taken from ``image_data`` bytes;
+    slides that only have an ``image_url`` are downloaded concurrently before
+    rendering, within the ``deadline`` if given. Missing images are drawn as
+    placeholders.
+    """
+    data = deck_data(deck)
+    output = output if output is not None else BytesIO()
+    slides = [dict(s) for s in data.get("slides", [])]
+    await attach_slide_images(slides, deadline=deadline, search=False, box=PDF_IMAGE_BOX)
 
-    # 3. References Slide
-    citations = data.get("citations")
-    if isinstance(citations, list) and len(citations) > 0:
-        logger.info("Adding References slide to PDF")
-        _draw_references_slide(c, citations, width, height, theme)
+    # Resolve theme colours: prefer explicit palette from data, fallback to defaults
+    theme = pdf_theme(_palette_key(data.get("palette")))
+
+    with _binary_streams():
+        # Setup canvas
+        c = canvas.Canvas(output, pagesize=landscape(A4))
+        width, height = landscape(A4)
+
+        # 1. Title Slide
+        _draw_title_slide(c, data, width, height, theme)
         c.showPage()
 
-    c.save()
-    logger.info(f"Exported PDF to {output_path}")
+        # 2. Content Slides
+        image_readers: dict[bytes, object] = {}
+        for slide_index, s in enumerate(slides):
+            logger.info(f"Processing PDF slide {slide_index + 1}")
+            _draw_content_slide(c, s, slide_index, width, height, theme, image_readers)
+            c.showPage()
 
+        # 3. References Slide
+        citations = data.get("citations")
+        if isinstance(citations, list) and len(citations) > 0:
+            logger.info("Adding References slide to PDF")
+            _draw_references_slide(c, citations, width, height, theme)
+            c.showPage()
 
-def _draw_title_slide(c, data, width, height, theme: dict):
+        c.save()
+    if output.seekable():
+        output.seek(0)
+    return output
+
+
+@contextmanager
+def _binary_streams():
+    """
+    Write compressed streams (pages, forms, images) as binary rather than ASCII85 text.
+
+    ASCII85 only keeps the file 7-bit clean and adds a quarter to every stream.
+    reportlab reads the global ``useA85`` while drawing images and saving, so it
+    is switched off around the synchronous drawing only and restored afterwards.
+    """
+    previous = rl_config.useA85
+    rl_config.useA85 = 0
+    try:
+        yield
+    finally:
+        rl_config.useA85 = previous
+
+
+def _draw_title_slide(c, data, width, height, theme: PdfTheme):
     """Draws the title slide."""
     # Background
     c.setFillColor(theme["background"])
@@ -115,11 +324,28 @@ def _draw_title_slide(c, data, width, height, theme: dict):
     c.drawCentredString(width / 2, height / 2 - 40, subtitle)
 
 
-async def _draw_content_slide(c, s, slide_index, width, height, theme: dict):
+def _draw_page_chrome(c, width, height, theme: PdfTheme):
+    """
+    Draws the background and header divider of a content page.
+
+    They are identical on every page, so they are drawn once per document as a
+    form XObject and each page just references it.
+    """
+    if not c.hasForm(CHROME_FORM):
+        c.beginForm(CHROME_FORM)
+        c.setFillColor(theme["background"])
+        c.rect(0, 0, width, height, fill=1, stroke=0)
+        c.setStrokeColor(theme["secondary"])
+        c.setLineWidth(2)
+        c.line(0.5 * inch, height - 1.0 * inch, width - 0.5 * inch, height - 1.0 * inch)
+        c.endForm()
+    c.doForm(CHROME_FORM)
+
+
+def _draw_content_slide(c, s, slide_index, width, height, theme: PdfTheme, image_readers: dict | None = None):
     """Draws a single content slide."""
-    # Background
-    c.setFillColor(theme["background"])
-    c.rect(0, 0, width, height, fill=1, stroke=0)
+    # Background and divider line
+    _draw_page_chrome(c, width, height, theme)
 
     # Title
     title_text = s.get("title", f"Slide {slide_index + 1}")
@@ -127,23 +353,18 @@ async def _draw_content_slide(c, s, slide_index, width, height, theme: dict):
     c.setFillColor(theme["primary"])
     c.drawString(0.5 * inch, height - 0.8 * inch, title_text)
 
-    # Divider line
-    c.setStrokeColor(theme["secondary"])
-    c.setLineWidth(2)
-    c.line(0.5 * inch, height - 1.0 * inch, width - 0.5 * inch, height - 1.0 * inch)
-
     # Get slide layout (default to "bullets" for backward compatibility)
     layout = s.get("layout", "bullets")
     if not layout:
         layout = "bullets"
 
     # Layout dimensions and image detection
-    image_width = 3 * inch
-    image_height = image_width / 1.78
+    image_width = PDF_IMAGE_BOX[0] * inch
+    image_height = PDF_IMAGE_BOX[1] * inch
 
-    image_url = s.get("image_url")
+    image_data = s.get("image_data")
     image_prompt = s.get("image_prompt", "")
-    has_image = (bool(image_url) or bool(image_prompt)) and layout == "bullets"
+    has_image = (bool(image_data) or bool(s.get("image_url")) or bool(image_prompt)) and layout == "bullets"
 
     if has_image:
         content_width = 6.5 * inch
@@ -153,63 +374,12 @@ async def _draw_content_slide(c, s, slide_index, width, height, theme: dict):
         content_x = 0.5 * inch
 
     # Summary & Bullets using Platypus Paragraphs for wrapping
-    styles = getSampleStyleSheet()
-
-    # Custom Styles
-    summary_style = ParagraphStyle(
-        "Summary",
-        parent=styles["Normal"],
-        fontName="Helvetica",
-        fontSize=14,
-        textColor=theme["text"],
-        leading=18,
-        spaceAfter=12,
-    )
-
-    bullet_style = ParagraphStyle(
-        "Bullet",
-        parent=styles["Normal"],
-        fontName="Helvetica",
-        fontSize=16,
-        textColor=theme["text"],
-        leading=22,
-        leftIndent=20,
-        bulletIndent=5,
-        spaceAfter=8,
-    )
-
-    statement_style = ParagraphStyle(
-        "Statement",
-        parent=styles["Normal"],
-        fontName="Helvetica-BoldOblique",
-        fontSize=36,
-        textColor=theme["text"],
-        leading=44,
-        spaceAfter=12,
-        alignment=TA_CENTER,
-    )
-
-    big_number_style = ParagraphStyle(
-        "BigNumber",
-        parent=styles["Normal"],
-        fontName="Helvetica-Bold",
-        fontSize=100,
-        textColor=theme["primary"],
-        leading=110,
-        spaceAfter=14,
-        alignment=TA_CENTER,
-    )
-
-    big_number_context_style = ParagraphStyle(
-        "BigNumberContext",
-        parent=styles["Normal"],
-        fontName="Helvetica",
-        fontSize=24,
-        textColor=theme["text"],
-        leading=28,
-        spaceAfter=12,
-        alignment=TA_CENTER,
-    )
+    styles = theme.styles
+    summary_style = styles["Summary"]
+    bullet_style = styles["Bullet"]
+    statement_style = styles["Statement"]
+    big_number_style = styles["BigNumber"]
+    big_number_context_style = styles["BigNumberContext"]
 
     current_y = height - 1.5 * inch
 
@@ -300,26 +470,8 @@ async def _draw_content_slide(c, s, slide_index, width, height, theme: dict):
         col_right = s.get("column_right") or []
 
         col_w = (width - 1.5 * inch) / 2.0
-        col_title_style = ParagraphStyle(
-            "ColTitle",
-            parent=styles["Normal"],
-            fontName="Helvetica-Bold",
-            fontSize=12,
-            textColor=theme["primary"],
-            leading=16,
-            spaceAfter=6,
-            alignment=TA_LEFT,
-        )
-        col_item_style = ParagraphStyle(
-            "ColItem",
-            parent=styles["Normal"],
-            fontName="Helvetica",
-            fontSize=14,
-            textColor=theme["text"],
-            leading=18,
-            spaceAfter=5,
-            alignment=TA_LEFT,
-        )
+        col_title_style = styles["ColTitle"]
+        col_item_style = styles["ColItem"]
 
         for col_idx, (col_title, col_items) in enumerate(
             [(col_left_title, col_left), (col_right_title, col_right)]
@@ -347,16 +499,7 @@ async def _draw_content_slide(c, s, slide_index, width, height, theme: dict):
 
     elif layout == "steps":
         steps = s.get("steps") or []
-        step_style = ParagraphStyle(
-            "Step",
-            parent=styles["Normal"],
-            fontName="Helvetica",
-            fontSize=18,
-            textColor=theme["text"],
-            leading=24,
-            spaceAfter=10,
-            alignment=TA_LEFT,
-        )
+        step_style = styles["Step"]
         step_paragraphs = []
         total_h = 0
         for i, step in enumerate(steps):
@@ -381,26 +524,8 @@ async def _draw_content_slide(c, s, slide_index, width, height, theme: dict):
         if not quote_text:
             quote_text = s.get("summary", "")
 
-        quote_style = ParagraphStyle(
-            "QuoteText",
-            parent=styles["Normal"],
-            fontName="Helvetica-Oblique",
-            fontSize=26,
-            textColor=theme["text"],
-            leading=34,
-            spaceAfter=14,
-            alignment=TA_CENTER,
-        )
-        attr_style = ParagraphStyle(
-            "QuoteAttr",
-            parent=styles["Normal"],
-            fontName="Helvetica",
-            fontSize=14,
-            textColor=theme["secondary"],
-            leading=18,
-            spaceAfter=0,
-            alignment=TA_CENTER,
-        )
+        quote_style = styles["QuoteText"]
+        attr_style = styles["QuoteAttr"]
 
         p_q = Paragraph(f"\u201c{quote_text}\u201d", quote_style) if quote_text else None
         p_attr = Paragraph(quote_attribution, attr_style) if quote_attribution else None
@@ -420,25 +545,17 @@ async def _draw_content_slide(c, s, slide_index, width, height, theme: dict):
         img_x = width - image_width - 0.5 * inch
         img_y = (height - 1.0 * inch) / 2.0 - image_height / 2.0
 
-        if image_url:
+        if image_data:
             try:
-                logger.info(f"Downloading image for PDF: {image_url}")
-                async with httpx.AsyncClient(timeout=10.0) as client:
-                    response = await client.get(image_url)
-                if response.status_code == 200:
-                    img_data = BytesIO(response.content)
-                    c.drawImage(
-                        reportlab_image_from_stream(img_data),
-                        img_x,
-                        img_y,
-                        width=image_width,
-                        height=image_height,
-                        preserveAspectRatio=True,
-                        mask="auto",
-                    )
-                else:
-                    logger.warning(f"Failed to download image: status {response.status_code}")
-                    _draw_image_placeholder(c, image_prompt, img_x, img_y, image_width, image_height, theme)
+                c.drawImage(
+                    _image_reader(image_data, image_readers),
+                    img_x,
+                    img_y,
+                    width=image_width,
+                    height=image_height,
+                    preserveAspectRatio=True,
+                    mask="auto",
+                )
             except Exception as e:
                 logger.warning(f"Failed to add image to PDF: {e}")
                 _draw_image_placeholder(c, image_prompt, img_x, img_y, image_width, image_height, theme)
@@ -446,9 +563,10 @@ async def _draw_content_slide(c, s, slide_index, width, height, theme: dict):
             _draw_image_placeholder(c, image_prompt, img_x, img_y, image_width, image_height, theme)
 
 
-def _draw_image_placeholder(c, prompt, img_x, img_y, img_w, img_h, theme: dict):
+def _draw_image_placeholder(c, prompt, img_x, img_y, img_w, img_h, theme: PdfTheme):
     """Draws a dashed placeholder rectangle where an image would appear."""
     c.setStrokeColor(theme["secondary"])
+    c.setLineWidth(2)
     c.setDash(3, 3)
     c.rect(img_x, img_y, img_w, img_h, stroke=1, fill=0)
 
@@ -459,6 +577,20 @@ def _draw_image_placeholder(c, prompt, img_x, img_y, img_w, img_h, theme: dict):
     c.setDash()
 
 
+def _image_reader(image_data: bytes, image_readers: dict | None):
+    """ImageReader for ``image_data``, shared by every slide using the same image.
+
+    reportlab embeds identical images once, but only finds out by decoding each
+    one; reusing the reader decodes it once per render.
+    """
+    if image_readers is None:
+        return reportlab_image_from_stream(BytesIO(image_data))
+    reader = image_readers.get(image_data)
+    if reader is None:
+        reader = image_readers[image_data] = reportlab_image_from_stream(BytesIO(image_data))
+    return reader
+
+
 def reportlab_image_from_stream(stream):
     """Helper to convert stream to reportlab compatible image."""
     from reportlab.lib.utils import ImageReader
@@ -466,33 +598,17 @@ def reportlab_image_from_stream(stream):
     return ImageReader(stream)
 
 
-def _draw_references_slide(c, citations, width, height, theme: dict):
+def _draw_references_slide(c, citations, width, height, theme: PdfTheme):
     """Draws the references page."""
-    # Background
-    c.setFillColor(theme["background"])
-    c.rect(0, 0, width, height, fill=1, stroke=0)
+    # Background and divider line
+    _draw_page_chrome(c, width, height, theme)
 
     # Title
     c.setFont("Helvetica-Bold", 32)
     c.setFillColor(theme["primary"])
     c.drawString(0.5 * inch, height - 0.8 * inch, "References")
 
-    # Divider line
-    c.setStrokeColor(theme["secondary"])
-    c.setLineWidth(2)
-    c.line(0.5 * inch, height - 1.0 * inch, width - 0.5 * inch, height - 1.0 * inch)
-
-    # Styles
-    styles = getSampleStyleSheet()
-    ref_style = ParagraphStyle(
-        "ReferenceItem",
-        parent=styles["Normal"],
-        fontName="Helvetica",
-        fontSize=14,
-        textColor=theme["text"],
-        leading=18,
-        spaceAfter=12,
-    )
+    ref_style = theme.styles["ReferenceItem"]
 
     current_y = height - 1.5 * inch
     content_width = width - 1.0 * inch
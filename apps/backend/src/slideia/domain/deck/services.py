@@ -1,9 +1,11 @@
 import asyncio
-from typing import AsyncGenerator
+from typing import AsyncGenerator, BinaryIO
 
 from pptx import Presentation
 from slideia.core.config import settings
+from slideia.core.deadline import Deadline
 from slideia.core.logging import get_logger
+from slideia.domain.deck.images import ImagePrefetcher
 from slideia.domain.deck.models import Deck, Slide
 from slideia.infra.cache import Cache, RedisCache
 from slideia.infra.openrouter import OpenRouterLLM
@@ -11,11 +13,11 @@ from slideia.infra.openrouter import OpenRouterLLM
 logger = get_logger(__name__)
 
 
-def create_minimal_template(path: str):
+def create_minimal_template(path: str | BinaryIO):
     """Create a minimal PowerPoint template with one title slide and one content slide.
 
     Args:
-        path (str): The file path to save the template.
+        path (str | BinaryIO): The file path or binary stream to save the template to.
     """
     prs = Presentation()
 
@@ -39,6 +41,32 @@ def create_minimal_template(path: str):
     prs.save(path)
 
 
+async def cancel_pending(tasks: list[asyncio.Task]) -> None:
+    """Cancel any still-running tasks and wait for them to unwind.
+
+    Used when a generation is abandoned (client disconnect, consumer closed the
+    stream) so that queued and in-flight LLM batches stop consuming tokens.
+    """
+    pending = [t for t in tasks if not t.done()]
+    if not pending:
+        return
+
+    logger.info(f"Cancelling {len(pending)} pending generation task(s).")
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def run_within_deadline(awaitable, deadline: Deadline | None, stage: str):
+    """Await ``awaitable``, bounded by the remaining request budget if one is set."""
+    if deadline is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, timeout=deadline.remaining())
+    except TimeoutError:
+        raise TimeoutError(f"{stage} exceeded the request deadline ({deadline.budget:.0f}s)") from None
+
+
 async def generate_full_deck(
     topic: str,
     audience: str,
@@ -47,7 +75,14 @@ async def generate_full_deck(
     llm: OpenRouterLLM,
     cache: Cache | RedisCache,
     theme_preset: str = "Default",
+    deadline: Deadline | None = None,
 ) -> Deck:
+    """Generate (or load from cache) a full deck.
+
+    When a ``deadline`` is given, slide batches still running when it expires are
+    cancelled and the deck is returned with the slides drafted so far. Partial
+    decks are not cached.
+    """
     cached = cache.get(topic, audience, tone, slide_count)
     if cached:
         return Deck(
@@ -60,12 +95,16 @@ async def generate_full_deck(
 
     logger.info("Generating new deck...")
 
-    outline_data = await llm.propose_outline(
-        topic=topic,
-        audience=audience,
-        tone=tone,
-        slide_count=slide_count,
-        theme_instruction=theme_preset,
+    outline_data = await run_within_deadline(
+        llm.propose_outline(
+            topic=topic,
+            audience=audience,
+            tone=tone,
+            slide_count=slide_count,
+            theme_instruction=theme_preset,
+        ),
+        deadline,
+        stage="Outline generation",
     )
 
     # Use Semaphore to limit concurrent calls to respect rate limits
@@ -84,11 +123,24 @@ async def generate_full_deck(
                 return []
 
     logger.info(f"Drafting {len(slide_specs)} slides in {len(batches)} batches...")
-    tasks = [process_batch(b) for b in batches]
-    results = await asyncio.gather(*tasks)
-
-    # Flatten results
-    slides_content = [slide for batch_result in results for slide in batch_result]
+    tasks = [asyncio.create_task(process_batch(b)) for b in batches]
+    partial = False
+
+    try:
+        if tasks:
+            timeout = deadline.remaining() if deadline else None
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            if pending:
+                partial = True
+                logger.warning(
+                    f"Deadline reached with {len(pending)} of {len(tasks)} batches unfinished; "
+                    "returning a partial deck."
+                )
+    finally:
+        await cancel_pending(tasks)
+
+    # Flatten results (in outline order), skipping batches cut off by the deadline
+    slides_content = [slide for task in tasks if not task.cancelled() for slide in task.result()]
 
     logger.info("Deck generation complete!")
     result = {
@@ -99,8 +151,9 @@ async def generate_full_deck(
         "citations": outline_data.get("citations"),
     }
 
-    cache.set(topic, audience, tone, slide_count, result)
-    logger.info("Cached the generated deck.")
+    if not partial:
+        cache.set(topic, audience, tone, slide_count, result)
+        logger.info("Cached the generated deck.")
 
     return Deck(
         outline=outline_data,
@@ -119,9 +172,16 @@ async def generate_full_deck_stream(
     llm: OpenRouterLLM,
     cache: Cache | RedisCache,
     theme_preset: str = "Default",
+    deadline: Deadline | None = None,
 ) -> AsyncGenerator[dict, None]:
     """
     Generate a full deck and yield progress events.
+
+    If the ``deadline`` expires while slides are still being drafted, the
+    remaining batches are cancelled and the ``complete`` event carries the
+    partial deck with ``"partial": True``. With ``SPECULATIVE_IMAGE_PREFETCH``,
+    slide images are looked up and downloaded in the background as slides are
+    drafted; those resolved by completion get their ``image_url`` attached.
     """
     cached = cache.get(topic, audience, tone, slide_count)
     if cached:
@@ -134,12 +194,16 @@ async def generate_full_deck_stream(
     # Step 1: Outline
     yield {"step": "outline", "progress": 10, "message": "Analyzing topic and structuring the story..."}
 
-    outline_data = await llm.propose_outline(
-        topic=topic,
-        audience=audience,
-        tone=tone,
-        slide_count=slide_count,
-        theme_instruction=theme_preset,
+    outline_data = await run_within_deadline(
+        llm.propose_outline(
+            topic=topic,
+            audience=audience,
+            tone=tone,
+            slide_count=slide_count,
+            theme_instruction=theme_preset,
+        ),
+        deadline,
+        stage="Outline generation",
     )
 
     slide_specs = outline_data.get("slides", [])
@@ -161,28 +225,53 @@ async def generate_full_deck_stream(
                 logger.error(f"Batch failed (slides {start_idx + 1}–{start_idx + len(batch)}): {e}")
                 return [], start_idx
 
-    tasks = [process_batch_with_progress(b, i * batch_size) for i, b in enumerate(batches)]
-
-    for future in asyncio.as_completed(tasks):
-        batch_slides, batch_start = await future
-        for j, slide in enumerate(batch_slides):
-            idx = batch_start + j
-            if idx < total_slides:
-                slides_content[idx] = slide
-                slides_processed += 1
-                progress = 10 + int((slides_processed / total_slides) * 80)
-
-                yield {
-                    "step": "slide",
-                    "index": idx + 1,
-                    "total": total_slides,
-                    "title": slide.get("title", "Untitled"),
-                    "progress": progress,
-                    "message": f"Drafted slide {slides_processed} of {total_slides}: {slide.get('title')}",
-                }
+    # Schedule batches as real tasks so they can be cancelled if the consumer goes away
+    tasks = [
+        asyncio.create_task(process_batch_with_progress(b, i * batch_size)) for i, b in enumerate(batches)
+    ]
+
+    images = ImagePrefetcher() if settings.SPECULATIVE_IMAGE_PREFETCH else None
+    partial = False
+    drafted = False
+
+    try:
+        timeout = deadline.remaining() if deadline else None
+        for future in asyncio.as_completed(tasks, timeout=timeout):
+            batch_slides, batch_start = await future
+            if images is not None:
+                images.add(batch_slides)
+            for j, slide in enumerate(batch_slides):
+                idx = batch_start + j
+                if idx < total_slides:
+                    slides_content[idx] = slide
+                    slides_processed += 1
+                    progress = 10 + int((slides_processed / total_slides) * 80)
+
+                    yield {
+                        "step": "slide",
+                        "index": idx + 1,
+                        "total": total_slides,
+                        "title": slide.get("title", "Untitled"),
+                        "progress": progress,
+                        "message": f"Drafted slide {slides_processed} of {total_slides}: {slide.get('title')}",
+                    }
+        drafted = True
+    except TimeoutError:
+        partial = drafted = True
+        logger.warning(
+            f"Deadline reached after {slides_processed}/{total_slides} slides; returning partial deck."
+        )
+    finally:
+        await cancel_pending(tasks)
+        if images is not None and not drafted:
+            # The consumer went away, so no export is coming
+            await images.cancel()
 
     # Ensure all slots are filled (in case of model errors we could have None)
     slides_content = [s for s in slides_content if s is not None]
+    if images is not None:
+        images.attach()
+        images.detach()
 
     # Step 3: Complete
     result = {
@@ -193,6 +282,16 @@ async def generate_full_deck_stream(
         "citations": outline_data.get("citations"),
     }
 
+    if partial:
+        yield {
+            "step": "complete",
+            "progress": 100,
+            "message": f"Time budget reached: returning {len(slides_content)} of {total_slides} slides.",
+            "data": result,
+            "partial": True,
+        }
+        return
+
     cache.set(topic, audience, tone, slide_count, result)
 
     yield {"step": "complete", "progress": 100, "message": "Presentation ready!", "data": result}
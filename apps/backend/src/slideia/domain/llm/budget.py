@@ -0,0 +1,159 @@
+"""
+Token counting and prompt budgeting.
+
+Prompts are sized against the model's context window before they are sent, so
+oversized reference material is trimmed locally instead of paying for a failed
+call (plus retries). Token counts use ``tiktoken`` when it is installed and its
+encoding files are available; otherwise a conservative local heuristic is used.
+"""
+
+import math
+import re
+from functools import lru_cache
+
+from slideia.core.config import settings
+from slideia.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Words, numbers and individual punctuation marks, roughly how BPE tokenizers split text
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+# Expected output size per call type: (fixed overhead, tokens per slide)
+OUTPUT_TOKEN_ESTIMATES: dict[str, tuple[int, int]] = {
+    "outline": (400, 150),
+    "batch": (200, 500),
+    "slide": (200, 500),
+    "refine": (300, 450),
+    "intent": (256, 0),
+    "summarize": (2048, 0),
+    "summarize_chunk": (768, 0),
+    "chat": (2048, 0),
+}
+
+# Never send a call that leaves the model less room than this to answer
+MIN_OUTPUT_TOKENS = 256
+
+
+class ContextWindowExceededError(ValueError):
+    """Raised when a prompt cannot fit in the model's context window."""
+
+
+@lru_cache
+def _get_encoding():
+    """Load the tiktoken encoding once, or return None to use the heuristic."""
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(settings.TOKENIZER_ENCODING)
+    except Exception as e:
+        logger.info(f"tiktoken unavailable ({e.__class__.__name__}); using heuristic token counts.")
+        return None
+
+
+def count_tokens(text: str | None) -> int:
+    """Count (or conservatively estimate) the number of tokens in ``text``."""
+    if not text:
+        return 0
+
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    # Heuristic: long words split into several BPE pieces (~4 chars each)
+    return sum(math.ceil(len(piece) / 4) for piece in _TOKEN_PATTERN.findall(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> tuple[str, bool]:
+    """Trim ``text`` to at most ``max_tokens``, preferring paragraph or line boundaries.
+
+    Returns a tuple of (truncated_text, is_truncated).
+    """
+    if max_tokens <= 0:
+        return "", bool(text)
+
+    total = count_tokens(text)
+    if total <= max_tokens:
+        return text, False
+
+    # Start from the proportional character cut and shrink until it fits
+    cut = int(len(text) * max_tokens / total)
+    while cut > 0:
+        candidate = text[:cut]
+        for sep in ("\n\n", "\n", " "):
+            boundary = candidate.rfind(sep)
+            if boundary > cut * 0.8:
+                candidate = candidate[:boundary]
+                break
+
+        if count_tokens(candidate) <= max_tokens:
+            return candidate.rstrip(), True
+        cut = int(cut * 0.9)
+
+    return "", True
+
+
+class PromptBudget:
+    """Plans how many tokens each part of a prompt may use for a given call type."""
+
+    def __init__(self, context_window: int, max_output_tokens: int, safety_ratio: float = 0.1):
+        self.context_window = context_window
+        self.max_output_tokens = max_output_tokens
+        self.safety_ratio = safety_ratio
+
+    def output_tokens(self, call_type: str, slide_count: int = 1) -> int:
+        """Pick ``max_tokens`` for a call from its expected output size."""
+        base, per_slide = OUTPUT_TOKEN_ESTIMATES.get(call_type, (2048, 0))
+        return min(base + per_slide * max(slide_count, 1), self.max_output_tokens)
+
+    def input_budget(self, max_tokens: int) -> int:
+        """Tokens available to the prompt once output and a safety margin are reserved."""
+        return int((self.context_window - max_tokens) * (1 - self.safety_ratio))
+
+    def fit_reference(self, reference: str | None, fixed_prompt: str, max_tokens: int) -> str:
+        """Trim reference material so ``fixed_prompt`` plus the reference fits the window."""
+        if not reference:
+            return ""
+
+        available = self.input_budget(max_tokens) - count_tokens(fixed_prompt)
+        fitted, truncated = truncate_to_tokens(reference, available)
+        if truncated:
+            logger.warning(
+                f"Reference material trimmed to {count_tokens(fitted)} tokens to fit the context window."
+            )
+        return fitted
+
+    def fit_history(self, history: list[str], budget_tokens: int) -> list[str]:
+        """Keep the most recent history entries that fit within ``budget_tokens``."""
+        kept: list[str] = []
+        used = 0
+        for entry in reversed(history):
+            tokens = count_tokens(entry)
+            if used + tokens > budget_tokens:
+                logger.info(f"Dropped {len(history) - len(kept)} oldest history message(s) to fit budget.")
+                break
+            kept.append(entry)
+            used += tokens
+        return list(reversed(kept))
+
+    def guard(self, prompt_tokens: int, max_tokens: int) -> int:
+        """Validate a call before sending it and return the ``max_tokens`` to use.
+
+        Shrinks ``max_tokens`` when the prompt leaves less room than requested, and
+        raises ``ContextWindowExceededError`` if the prompt alone does not fit.
+        """
+        room = self.context_window - prompt_tokens
+        if room < min(max_tokens, MIN_OUTPUT_TOKENS):
+            raise ContextWindowExceededError(
+                f"Prompt is ~{prompt_tokens} tokens, exceeding the {self.context_window}-token context window."
+            )
+        if room < max_tokens:
+            logger.warning(f"Reducing max_tokens from {max_tokens} to {room} to fit the context window.")
+            return room
+        return max_tokens
+
+
+prompt_budget = PromptBudget(
+    context_window=settings.MODEL_CONTEXT_WINDOW,
+    max_output_tokens=settings.MAX_OUTPUT_TOKENS,
+)
@@ -62,7 +62,7 @@ Depending on the requested "Layout", generate the corresponding fields:
    - All other layout fields: null or []
 
 3. For layout "big_number":
-   - "big_number": A single key statistic, percentage, or metric (e.g., "73%", "5.2 Billion", "$10M+").
+   - "big_number": A single key statistic, percentage, or metric (e.g., "73%", "5.2 Billion", "$10M+"). If the reference material lists "Key figures", prefer one of those.
    - "big_number_context": A short phrase/sentence providing the context for this number (max 8-10 words).
    - All other layout fields: null or []
 
@@ -130,7 +130,7 @@ Depending on the requested "Layout", generate the corresponding fields:
    - All other layout fields: null or []
 
 3. For layout "big_number":
-   - "big_number": A single key statistic, percentage, or metric (e.g., "73%", "5.2 Billion", "$10M+").
+   - "big_number": A single key statistic, percentage, or metric (e.g., "73%", "5.2 Billion", "$10M+"). If the reference material lists "Key figures", prefer one of those.
    - "big_number_context": A short phrase/sentence providing the context for this number (max 8-10 words).
    - All other layout fields: null or []
 
@@ -203,7 +203,7 @@ Depending on each slide's "layout", generate the corresponding fields:
    - All other layout fields: null or []
 
 3. For layout "big_number":
-   - "big_number": A single key statistic, percentage, or metric (e.g., "73%", "5.2 Billion", "$10M+").
+   - "big_number": A single key statistic, percentage, or metric (e.g., "73%", "5.2 Billion", "$10M+"). If the reference material lists "Key figures", prefer one of those.
    - "big_number_context": A short phrase/sentence providing context (max 8-10 words).
    - All other layout fields: null or []
 
@@ -285,3 +285,33 @@ Keep the total summary size between 1000 and 2000 tokens (approximately 700 to 1
 SOURCE MATERIAL:
 {text}
 """
+
+
+CHUNK_SUMMARIZATION_PROMPT = """You are a professional research assistant. The following text is section {index} of {total} from a longer set of source materials that will be used to create a presentation deck.
+
+Extract the essential content of this section only:
+1. Main Points: The key ideas or arguments made in this section (3-6 concise bullet points).
+2. Data & Statistics: Every metric, date, percentage, or figure mentioned, with what it refers to.
+3. Notable Quotes: Verbatim quotes or essential statements worth featuring on a slide (with attribution if given).
+
+Be faithful to the source. Do not add outside knowledge. Keep the output under 500 words.
+
+SOURCE SECTION {index}/{total}:
+{text}
+"""
+
+
+COMBINE_SUMMARIES_PROMPT = """You are a professional research assistant. The following are notes extracted from consecutive sections of a longer set of source materials. Combine them into a single summary to help create a presentation deck.
+
+Create a highly structured summary including:
+1. Executive Summary: Core message and main takeaway of the documents (1-2 sentences).
+2. Key Themes: List 3-5 main themes, each with a brief explanation (2-3 sentences).
+3. Critical Data & Statistics: List any key metrics, dates, percentages, or figures mentioned in the notes.
+4. Key Takeaways/Quotes: List notable quotes or essential statements that could be featured on individual slides.
+
+Merge duplicate points, keep the most specific figures, and preserve the order in which topics appear in the source.
+Keep the total summary size between 1000 and 2000 tokens (approximately 700 to 1500 words).
+
+SECTION NOTES:
+{summaries}
+"""
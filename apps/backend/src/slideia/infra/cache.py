@@ -1,9 +1,17 @@
 """Cache utility for Slideia."""
 
+import contextlib
 import hashlib
 import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 from copy import deepcopy
 from datetime import datetime, timedelta
+from pathlib import Path
 
 import redis
 from slideia.core.logging import get_logger
@@ -116,3 +124,305 @@ class Cache:
         """Clear all cached data."""
         self._cache.clear()
         logger.info("CLEARED cache keys")
+
+
+class LayeredCache:
+    """
+    String cache with TTL. Uses Redis when available, with a bounded in-process
+    copy that also serves as the fallback when Redis is down. Subclasses keep
+    their keys under ``PREFIX``.
+    """
+
+    PREFIX = ""
+
+    def __init__(self, ttl_seconds: int, use_redis: bool = True, max_local_entries: int = 256):
+        self._ttl_seconds = ttl_seconds
+        self._max_local_entries = max_local_entries
+        self._local: OrderedDict[str, tuple[str, float]] = OrderedDict()  # key -> (value, expiry)
+        self._client = None
+        if use_redis and settings.REDIS_URL:
+            self._client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+    def _get(self, key: str) -> str | None:
+        entry = self._local.get(key)
+        if entry is not None:
+            value, expiry = entry
+            if time.monotonic() < expiry:
+                self._local.move_to_end(key)
+                logger.info(f"HIT (local) {key[:20]}...")
+                return value
+            del self._local[key]
+
+        if self._client is not None:
+            try:
+                value = self._client.get(key)
+                if value is not None:
+                    logger.info(f"HIT {key[:20]}...")
+                    self._set_local(key, value)
+                    return value
+            except redis.exceptions.RedisError as e:
+                logger.error(f"GET Error for key {key[:20]}...: {e}")
+
+        logger.info(f"MISS {key[:20]}...")
+        return None
+
+    def _set_local(self, key: str, value: str):
+        self._local[key] = (value, time.monotonic() + self._ttl_seconds)
+        self._local.move_to_end(key)
+        while len(self._local) > self._max_local_entries:
+            self._local.popitem(last=False)
+
+    def _set(self, key: str, value: str):
+        self._set_local(key, value)
+        if self._client is not None:
+            try:
+                self._client.setex(key, self._ttl_seconds, value)
+            except redis.exceptions.RedisError as e:
+                logger.error(f"SET Error for key {key[:20]}...: {e}")
+        logger.info(f"SET {key[:20]}... (ttl={self._ttl_seconds}s)")
+
+    def clear(self):
+        self._local.clear()
+        if self._client is not None:
+            try:
+                for key in self._client.scan_iter(match=f"{self.PREFIX}*"):
+                    self._client.delete(key)
+            except redis.exceptions.RedisError as e:
+                logger.error(f"CLEAR Error: {e}")
+        logger.info(f"CLEARED {self.PREFIX}* cache keys")
+
+
+class DocumentCache(LayeredCache):
+    """
+    Content-addressed cache for extracted document text and document summaries.
+    Keys are SHA-256 digests, so the same file attached on several chat turns is
+    parsed and summarized once.
+    """
+
+    PREFIX = "doc:"
+
+    def __init__(self, use_redis: bool = True, max_local_entries: int = 256):
+        super().__init__(settings.DOCUMENT_CACHE_TTL_SECONDS, use_redis, max_local_entries)
+
+    @staticmethod
+    def digest(content: bytes | str) -> str:
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def hasher():
+        """Incremental hasher whose ``hexdigest()`` matches ``digest`` for content fed in chunks."""
+        return hashlib.sha256()
+
+    @staticmethod
+    def file_digest(path: str) -> str:
+        """``digest`` of a file's content, read from disk in chunks."""
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    @staticmethod
+    def _text_key(digest: str, budget: int | None) -> str:
+        return f"doc:text:{digest}" if budget is None else f"doc:text:{digest}:{budget}"
+
+    def get_text(self, digest: str, budget: int | None = None) -> tuple[str, bool] | None:
+        """Extracted (text, is_truncated) for a file, keyed by the digest of its raw bytes.
+
+        ``budget`` is the character limit the extraction stopped at, if any.
+        """
+        value = self._get(self._text_key(digest, budget))
+        if value is None:
+            return None
+        try:
+            entry = json.loads(value)
+            return entry["text"], entry["truncated"]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return None
+
+    def set_text(self, digest: str, text: str, truncated: bool = False, budget: int | None = None):
+        # A complete extraction is valid for any budget, so store it under the unbudgeted key
+        key = self._text_key(digest, budget if truncated else None)
+        self._set(key, json.dumps({"text": text, "truncated": truncated}))
+
+    def get_summary(self, digest: str) -> str | None:
+        """Summary of a document context, keyed by the digest of the summarized text."""
+        return self._get(f"doc:summary:{digest}")
+
+    def set_summary(self, digest: str, summary: str):
+        self._set(f"doc:summary:{digest}", summary)
+
+
+class ImageSearchCache(LayeredCache):
+    """
+    Image search results (photo URLs) per normalized query, so repeated and
+    near-identical prompts across exports and workers cost one search API call
+    per TTL window.
+    """
+
+    PREFIX = "img:search:"
+
+    def __init__(self, use_redis: bool = True, max_local_entries: int = 1024):
+        super().__init__(settings.IMAGE_SEARCH_CACHE_TTL_SECONDS, use_redis, max_local_entries)
+
+    def _key(self, query_key: str) -> str:
+        return f"{self.PREFIX}{hashlib.sha256(query_key.encode('utf-8')).hexdigest()}"
+
+    def get_results(self, query_key: str) -> list[str] | None:
+        value = self._get(self._key(query_key))
+        if value is None:
+            return None
+        try:
+            urls = json.loads(value)
+        except json.JSONDecodeError:
+            return None
+        return urls if isinstance(urls, list) else None
+
+    def set_results(self, query_key: str, urls: list[str]):
+        self._set(self._key(query_key), json.dumps(urls))
+
+
+class ImageCache:
+    """
+    Content-addressed on-disk cache for downloaded image bytes.
+    Images are stored once under the SHA-256 digest of their content, with a
+    small index file per URL naming that digest. Every write goes to a temporary
+    file that is renamed into place, so workers sharing the directory never read
+    a partial image. Once the cache grows past ``max_bytes`` the least recently
+    used images are evicted.
+    """
+
+    # Eviction trims to this fraction of the quota so it doesn't run on every write
+    EVICT_TO = 0.9
+
+    def __init__(self, root: Path | None = None, max_bytes: int | None = None):
+        self._root = Path(root or settings.IMAGE_CACHE_DIR)
+        self._max_bytes = settings.IMAGE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._size: int | None = None  # bytes stored, counted on first write
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+    def _blob_path(self, digest: str) -> Path:
+        return self._root / "blobs" / digest[:2] / digest
+
+    def _url_path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self._root / "urls" / key[:2] / key
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+
+    def get(self, url: str) -> bytes | None:
+        """Cached image bytes previously downloaded from ``url``."""
+        index = self._url_path(url)
+        try:
+            digest = index.read_text(encoding="utf-8").strip()
+        except OSError:
+            logger.info(f"MISS image {url[:40]}...")
+            return None
+
+        content = self.get_blob(digest)
+        if content is None:
+            # The image was evicted; drop the stale index entry
+            with contextlib.suppress(OSError):
+                index.unlink()
+            logger.info(f"MISS image {url[:40]}... (evicted)")
+            return None
+        logger.info(f"HIT image {url[:40]}...")
+        return content
+
+    def get_blob(self, digest: str) -> bytes | None:
+        """Cached image bytes by content digest."""
+        path = self._blob_path(digest)
+        try:
+            content = path.read_bytes()
+        except OSError:
+            return None
+        # The modification time doubles as the last-access time for LRU eviction
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return content
+
+    def put(self, url: str, content: bytes) -> str:
+        """Store ``content`` downloaded from ``url`` and return its digest."""
+        digest = self.digest(content)
+        if len(content) > self._max_bytes:
+            return digest
+
+        blob = self._blob_path(digest)
+        try:
+            if blob.exists():
+                os.utime(blob)
+            else:
+                self._write_atomic(blob, content)
+                self._added(len(content))
+            self._write_atomic(self._url_path(url), digest.encode("utf-8"))
+        except OSError as e:
+            logger.error(f"SET Error for image {url[:40]}...: {e}")
+            return digest
+        logger.info(f"SET image {digest[:12]}... ({len(content)} bytes)")
+        return digest
+
+    def _blobs(self) -> list[tuple[float, int, Path]]:
+        """(mtime, size, path) of every stored image."""
+        entries = []
+        for path in (self._root / "blobs").glob("*/*"):
+            if path.name.startswith(".tmp-"):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in self._blobs())
+
+    def _added(self, size: int):
+        with self._lock:
+            if self._size is None:
+                self._size = self.size_bytes()
+            else:
+                self._size += size
+            if self._size > self._max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Other workers write to the same directory, so rescan rather than trust the running total
+        entries = sorted(self._blobs())
+        total = sum(size for _, size, _ in entries)
+        target = int(self._max_bytes * self.EVICT_TO)
+        evicted = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+                evicted += 1
+            total -= size
+        self._size = total
+        logger.info(f"EVICTED {evicted} images ({total} bytes kept)")
+
+    def clear(self):
+        with self._lock:
+            shutil.rmtree(self._root, ignore_errors=True)
+            self._size = 0
+        logger.info("CLEARED image cache")
+
+
+document_cache = DocumentCache(use_redis=settings.ENVIRONMENT != "test")
+image_cache = ImageCache()
+image_search_cache = ImageSearchCache(use_redis=settings.ENVIRONMENT != "test")
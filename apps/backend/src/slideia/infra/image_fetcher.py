@@ -1,10 +1,41 @@
+import asyncio
 import logging
+import re
 
 import httpx
 from slideia.core.config import settings
+from slideia.core.deadline import Deadline
+from slideia.infra.cache import image_cache, image_search_cache
 
 logger = logging.getLogger(__name__)
 
+SEARCH_TIMEOUT_SECONDS = 5.0
+DOWNLOAD_TIMEOUT_SECONDS = 10.0
+
+# Below this much remaining budget, image work is skipped so there is still time to render
+MIN_IMAGE_BUDGET_SECONDS = 1.0
+
+# Words that don't change what an image search returns
+QUERY_STOPWORDS = frozenset(
+    "a an and as at by for from in into of on or showing the to with image photo picture illustration "
+    "depicting featuring".split()
+)
+
+
+def normalize_query(query: str) -> str:
+    """Cache key for an image query: near-identical prompts map to the same key.
+
+    Case, punctuation, word order, filler words and simple plurals are ignored.
+    """
+    words = set()
+    for word in re.findall(r"[a-z0-9]+", query.lower()):
+        if word in QUERY_STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.add(word)
+    return " ".join(sorted(words))
+
 
 class ImageFetcher:
     def __init__(self):
@@ -14,40 +45,65 @@ class ImageFetcher:
             "Accept-Version": "v1",
         }
 
-    async def fetch_image_url(self, query: str) -> str | None:
+    async def fetch_image_url(self, query: str, deadline: Deadline | None = None) -> str | None:
         """
         Searches for an image and returns the URL.
+
+        Returns None without searching if the request deadline is nearly spent.
+        """
+        urls = await self.fetch_image_urls(query, deadline)
+        return urls[0] if urls else None
+
+    async def fetch_image_urls(self, query: str, deadline: Deadline | None = None) -> list[str]:
+        """
+        Searches for images and returns up to ``UNSPLASH_RESULTS_PER_QUERY`` URLs, best match first.
+
+        Results are cached per normalized query, so repeated and near-identical
+        prompts don't search again. Returns an empty list without searching if
+        the request deadline is nearly spent.
         """
         if not query:
-            return None
+            return []
+
+        query_key = normalize_query(query)
+        cached = image_search_cache.get_results(query_key)
+        if cached is not None:
+            return cached
+
+        if deadline and not deadline.has_time(MIN_IMAGE_BUDGET_SECONDS):
+            logger.info(f"Skipping image search for '{query}': request deadline nearly reached.")
+            return []
 
         # Try Unsplash first
         if settings.UNSPLASH_ACCESS_KEY:
-            url = await self._fetch_unsplash_url(query)
-            if url:
-                return url
+            urls = await self._fetch_unsplash_urls(query, deadline)
+            if urls is not None:
+                # An empty result is cached too, so a query with no matches isn't retried every export
+                image_search_cache.set_results(query_key, urls)
+                return urls
 
         # TODO: Fallback to AI image generation once implemented
 
-        return None
+        return []
 
-    async def _fetch_unsplash_url(self, query: str) -> str | None:
+    async def _fetch_unsplash_urls(self, query: str, deadline: Deadline | None = None) -> list[str] | None:
+        """Photo URLs for ``query``, or None if the search failed."""
         params = {
             "query": query,
-            "per_page": 1,
+            "per_page": settings.UNSPLASH_RESULTS_PER_QUERY,
             "orientation": "landscape",
             "content_filter": "high",
         }
 
+        timeout = deadline.timeout(SEARCH_TIMEOUT_SECONDS) if deadline else SEARCH_TIMEOUT_SECONDS
+
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with httpx.AsyncClient(timeout=timeout) as client:
                 response = await client.get(self.unsplash_url, headers=self.unsplash_headers, params=params)
 
                 if response.status_code == 200:
                     data = response.json()
-                    results = data.get("results", [])
-                    if results:
-                        return results[0]["urls"]["regular"]
+                    return [result["urls"]["regular"] for result in data.get("results", [])]
                 else:
                     logger.warning(f"Unsplash API Error: {response.status_code}")
         except Exception as e:
@@ -62,15 +118,31 @@ class ImageFetcher:
         """
         return None
 
-    async def download_image(self, url: str) -> bytes | None:
-        """Downloads the actual image bytes to embed in PPTX."""
+    async def download_image(self, url: str, deadline: Deadline | None = None) -> bytes | None:
+        """Downloads the actual image bytes to embed in PPTX.
+
+        Images are served from the on-disk image cache when they have been
+        downloaded before. Returns None (so callers fall back to a placeholder)
+        if the request deadline is nearly spent.
+        """
         if not url:
             return None
 
+        cached = await asyncio.to_thread(image_cache.get, url)
+        if cached is not None:
+            return cached
+
+        if deadline and not deadline.has_time(MIN_IMAGE_BUDGET_SECONDS):
+            logger.info(f"Skipping image download from {url}: request deadline nearly reached.")
+            return None
+
+        timeout = deadline.timeout(DOWNLOAD_TIMEOUT_SECONDS) if deadline else DOWNLOAD_TIMEOUT_SECONDS
+
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with httpx.AsyncClient(timeout=timeout) as client:
                 response = await client.get(url)
                 if response.status_code == 200:
+                    await asyncio.to_thread(image_cache.put, url, response.content)
                     return response.content
         except Exception as e:
             logger.error(f"Failed to download image from {url}: {e}")
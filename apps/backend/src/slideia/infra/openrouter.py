@@ -4,10 +4,14 @@ import re
 from collections.abc import AsyncGenerator
 
 import httpx
+from slideia.core.config import settings
 from slideia.core.logging import get_logger
+from slideia.domain.llm.budget import count_tokens, prompt_budget
 from slideia.domain.llm.interfaces import OutlineGenerator, SlideGenerator
 from slideia.domain.llm.prompts import (
     BATCH_SLIDE_PROMPT,
+    CHUNK_SUMMARIZATION_PROMPT,
+    COMBINE_SUMMARIES_PROMPT,
     OUTLINE_PROMPT,
     REGENERATE_SLIDE_PROMPT,
     SLIDE_PROMPT,
@@ -18,6 +22,10 @@ logger = get_logger(__name__)
 
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
 
+# Process-wide cap on concurrent OpenRouter calls for fan-out work (e.g. map-reduce
+# summarization) so one large upload cannot monopolise the rate limit
+llm_limiter = asyncio.Semaphore(settings.MAX_GLOBAL_LLM_CALLS)
+
 
 def _extract_json(text: str | None) -> str:
     if text is None:
@@ -48,6 +56,23 @@ def _extract_json(text: str | None) -> str:
     return text.strip()
 
 
+def _with_reference(
+    theme_instruction: str,
+    reference_material: str | None,
+    build_prompt,
+    max_tokens: int,
+) -> str:
+    """Append reference material to the theme instruction, trimmed to the prompt budget."""
+    if not reference_material:
+        return theme_instruction
+
+    fixed_prompt = build_prompt(f"{theme_instruction}\n\nReference Material:\n")
+    fitted = prompt_budget.fit_reference(reference_material, fixed_prompt, max_tokens)
+    if not fitted:
+        return theme_instruction
+    return f"{theme_instruction}\n\nReference Material:\n{fitted}"
+
+
 class OpenRouterLLM(OutlineGenerator, SlideGenerator):
     def __init__(self, api_key: str, model: str):
         self.api_key = api_key
@@ -58,9 +83,16 @@ class OpenRouterLLM(OutlineGenerator, SlideGenerator):
         max_retries = 3
         base_delay = 2.0
 
+        # Fail fast (without paying for a call) if the prompt cannot fit the context window
+        max_tokens = prompt_budget.guard(count_tokens(prompt), max_tokens)
+
         for attempt in range(max_retries):
             try:
                 return await self._execute_call(prompt, max_tokens, json_mode=json_mode)
+            except asyncio.CancelledError:
+                # Leaving the AsyncClient context aborts the in-flight HTTP request
+                logger.info("OpenRouter call cancelled; aborting request.")
+                raise
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 429 and attempt < max_retries - 1:
                     delay = base_delay * (2**attempt)
@@ -141,20 +173,49 @@ class OpenRouterLLM(OutlineGenerator, SlideGenerator):
 
     async def summarize_document(self, text: str) -> str:
         """Summarizes a long raw document to 1000-2000 tokens."""
+        max_tokens = prompt_budget.output_tokens("summarize")
+        text = prompt_budget.fit_reference(text, SUMMARIZATION_PROMPT.format(text=""), max_tokens)
         prompt = SUMMARIZATION_PROMPT.format(text=text)
-        return await self._call(prompt, max_tokens=2048, json_mode=False)
+        return await self._call(prompt, max_tokens=max_tokens, json_mode=False)
+
+    async def summarize_chunk(self, text: str, index: int, total: int) -> str:
+        """Extract key points, data and quotes from one section of a long document (map step)."""
+        max_tokens = prompt_budget.output_tokens("summarize_chunk")
+        prompt = CHUNK_SUMMARIZATION_PROMPT.format(text=text, index=index, total=total)
+        return await self._call(prompt, max_tokens=max_tokens, json_mode=False)
+
+    async def combine_summaries(self, summaries: list[str]) -> str:
+        """Merge per-section notes into a single structured summary (reduce step)."""
+        max_tokens = prompt_budget.output_tokens("summarize")
+        joined = "\n\n".join(f"--- Section {i + 1} ---\n{summary}" for i, summary in enumerate(summaries))
+        joined = prompt_budget.fit_reference(
+            joined, COMBINE_SUMMARIES_PROMPT.format(summaries=""), max_tokens
+        )
+        prompt = COMBINE_SUMMARIES_PROMPT.format(summaries=joined)
+        return await self._call(prompt, max_tokens=max_tokens, json_mode=False)
 
     async def propose_outline(
-        self, topic: str, audience: str, tone: str, slide_count: int, theme_instruction: str = "Default"
+        self,
+        topic: str,
+        audience: str,
+        tone: str,
+        slide_count: int,
+        theme_instruction: str = "Default",
+        reference_material: str | None = None,
     ) -> dict:
-        prompt = OUTLINE_PROMPT.format(
-            topic=topic,
-            audience=audience,
-            tone=tone,
-            slide_count=slide_count,
-            theme_instruction=theme_instruction,
-        )
-        return await self._call(prompt)
+        max_tokens = prompt_budget.output_tokens("outline", slide_count)
+
+        def build(instruction: str) -> str:
+            return OUTLINE_PROMPT.format(
+                topic=topic,
+                audience=audience,
+                tone=tone,
+                slide_count=slide_count,
+                theme_instruction=instruction,
+            )
+
+        prompt = build(_with_reference(theme_instruction, reference_material, build, max_tokens))
+        return await self._call(prompt, max_tokens=max_tokens)
 
     async def draft_slide(self, slide_spec: dict) -> dict:
         prompt = SLIDE_PROMPT.format(
@@ -162,10 +223,15 @@ class OpenRouterLLM(OutlineGenerator, SlideGenerator):
             summary=slide_spec.get("summary", ""),
             layout=slide_spec.get("layout", "bullets"),
         )
-        return await self._call(prompt)
+        return await self._call(prompt, max_tokens=prompt_budget.output_tokens("slide"))
 
     async def draft_slides_batch(
-        self, topic: str, audience: str, slide_specs: list[dict], theme_instruction: str = "Default"
+        self,
+        topic: str,
+        audience: str,
+        slide_specs: list[dict],
+        theme_instruction: str = "Default",
+        reference_material: str | None = None,
     ) -> dict:
         """Draft content for multiple slides in a single LLM call."""
         specs_str = "\n".join(
@@ -174,14 +240,19 @@ class OpenRouterLLM(OutlineGenerator, SlideGenerator):
                 for i, s in enumerate(slide_specs)
             ]
         )
-        prompt = BATCH_SLIDE_PROMPT.format(
-            topic=topic,
-            audience=audience,
-            slides_specs=specs_str,
-            theme_instruction=theme_instruction,
-        )
-        # Increase max_tokens for batch calls
-        return await self._call(prompt, max_tokens=4096)
+        # Size max_tokens from the number of slides in this batch
+        max_tokens = prompt_budget.output_tokens("batch", len(slide_specs))
+
+        def build(instruction: str) -> str:
+            return BATCH_SLIDE_PROMPT.format(
+                topic=topic,
+                audience=audience,
+                slides_specs=specs_str,
+                theme_instruction=instruction,
+            )
+
+        prompt = build(_with_reference(theme_instruction, reference_material, build, max_tokens))
+        return await self._call(prompt, max_tokens=max_tokens)
 
     async def regenerate_slide(
         self, title: str, summary: str, instruction: str | None = None, layout: str = "bullets"
@@ -198,7 +269,7 @@ class OpenRouterLLM(OutlineGenerator, SlideGenerator):
             layout=layout,
             instruction_block=instruction_block,
         )
-        return await self._call(prompt)
+        return await self._call(prompt, max_tokens=prompt_budget.output_tokens("slide"))
 
     async def stream_call(
         self,
@@ -209,12 +280,18 @@ class OpenRouterLLM(OutlineGenerator, SlideGenerator):
         max_retries = 3
         base_delay = 2.0
 
+        prompt_tokens = sum(count_tokens(m.get("content")) for m in messages)
+        max_tokens = prompt_budget.guard(prompt_tokens, max_tokens)
+
         for attempt in range(max_retries):
             try:
                 async for chunk in self._execute_stream_call(messages, max_tokens):
                     yield chunk
                 # Successfully finished streaming
                 return
+            except asyncio.CancelledError:
+                logger.info("OpenRouter stream cancelled; closing connection.")
+                raise
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 429:
                     if attempt < max_retries - 1:
@@ -8,17 +8,23 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from slideia.api.chat_routes import chat_router
+from slideia.api.chat_routes import MAX_REQUEST_BODY_BYTES, chat_router
+from slideia.api.limits import BodySizeLimitMiddleware
 from slideia.api.routes import router as api_router
 from slideia.core.config import settings
 from slideia.core.logging import setup_logging
+from slideia.services.extraction import shutdown_extraction_pool
+from slideia.services.rendering import shutdown_render_pool, start_render_pool
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for FastAPI app."""
     setup_logging()
+    start_render_pool()
     yield
+    shutdown_extraction_pool()
+    shutdown_render_pool()
 
 
 app = FastAPI(
@@ -29,6 +35,10 @@ app = FastAPI(
     redoc_url=None if settings.ENVIRONMENT == "production" else "/redoc",
 )
 
+# Reject oversized uploads before the multipart parser buffers them; added before CORS so
+# CORSMiddleware wraps it and the 413 responses carry CORS headers
+app.add_middleware(BodySizeLimitMiddleware, max_body_bytes=MAX_REQUEST_BODY_BYTES, path_prefix="/api/v1/chat")
+
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
@@ -0,0 +1,196 @@
+"""Off-loop document text extraction.
+
+PDF and DOCX parsing is CPU-bound and holds the GIL, so running it on the event
+loop (or in a thread) stalls every other SSE stream on the worker. Extraction,
+and the local compression and indexing of extracted text, run in a bounded
+process pool shared by all ingestion call sites instead.
+"""
+
+import asyncio
+import math
+import os
+import tempfile
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TypeVar
+
+from slideia.core.config import settings
+from slideia.core.logging import get_logger
+from slideia.infra.cache import document_cache
+from slideia.services.ingest import (
+    DocumentSource,
+    chunk_document_text,
+    count_pdf_pages,
+    extract_file_text_within,
+    extract_pdf_page_range,
+)
+from slideia.services.pools import WorkerPool
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Smallest page range worth sending to a separate worker
+MIN_PAGES_PER_SHARD = 8
+
+extraction_pool = WorkerPool("extraction", lambda: settings.EXTRACTION_WORKERS)
+
+
+def get_extraction_pool() -> ProcessPoolExecutor:
+    """Return the shared extraction pool, creating it on first use."""
+    return extraction_pool.get()
+
+
+def shutdown_extraction_pool():
+    extraction_pool.shutdown()
+
+
+async def _guarded(submit: Callable[[ProcessPoolExecutor], Awaitable[T]], timeout: float, task: str) -> T:
+    """Run ``submit(pool)`` on the extraction pool; on timeout or a dead worker the pool is recycled.
+
+    A job killed because another caller recycled the pool under it is retried
+    once on the fresh pool, within what is left of ``timeout``.
+    """
+    loop = asyncio.get_running_loop()
+    expires = loop.time() + timeout
+    retried = False
+    while True:
+        pool = get_extraction_pool()
+        try:
+            return await asyncio.wait_for(submit(pool), timeout=max(0.0, expires - loop.time()))
+        except TimeoutError:
+            # A running worker cannot be cancelled; recycling kills it
+            extraction_pool.recycle(f"{task} exceeded {timeout}s", pool)
+            raise TimeoutError(f"{task} took longer than {timeout:.0f}s")
+        except BrokenProcessPool:
+            if not retried and extraction_pool.was_recycled(pool):
+                logger.info(f"{task} was interrupted by a pool recycle; retrying")
+                retried = False
+                continue
+            extraction_pool.recycle("worker process died", pool)
+            raise
+
+
+async def run_in_extraction_pool(func: Callable[..., T], *args, timeout: float | None = None) -> T:
+    """Run ``func(*args)`` in the extraction pool, e.g. ``compress_document`` or ``build_document_index``.
+
+    Raises ``TimeoutError`` if it takes longer than ``timeout`` (default
+    ``EXTRACTION_TIMEOUT_SECONDS``).
+    """
+    loop = asyncio.get_running_loop()
+    return await _guarded(
+        lambda pool: loop.run_in_executor(pool, func, *args),
+        timeout or settings.EXTRACTION_TIMEOUT_SECONDS,
+        f"{func.__name__}()",
+    )
+
+
+async def extract_text(
+    source: DocumentSource,
+    ext: str,
+    timeout: float | None = None,
+    max_chars: int | None = None,
+    digest: str | None = None,
+) -> tuple[str, bool]:
+    """Extract text from raw file bytes, or a file on disk, in the process pool.
+
+    Files on disk are opened by path in the workers, so their content is never
+    held in memory or pickled here. With ``max_chars`` extraction stops as soon
+    as the budget is met, so the cost scales with the budget rather than the
+    document. Identical files are served from the document cache; pass the
+    content ``digest`` if it is already known. Raises ``TimeoutError`` if
+    extraction takes longer than ``timeout`` (default ``EXTRACTION_TIMEOUT_SECONDS``).
+
+    Returns a tuple of (text, is_truncated).
+    """
+    if digest is None:
+        if isinstance(source, bytes):
+            digest = document_cache.digest(source)
+        else:
+            digest = await asyncio.to_thread(document_cache.file_digest, source)
+    cached = document_cache.get_text(digest, max_chars)
+    if cached is None and max_chars is not None:
+        full = document_cache.get_text(digest)
+        cached = chunk_document_text(full[0], max_chars=max_chars) if full else None
+    if cached is not None:
+        return cached
+
+    loop = asyncio.get_running_loop()
+
+    def submit(pool: ProcessPoolExecutor) -> Awaitable[tuple[str, bool]]:
+        if ext == "pdf":
+            return extract_pdf_text_parallel(source, max_chars, pool=pool)
+        return loop.run_in_executor(pool, extract_file_text_within, source, ext, max_chars)
+
+    timeout = timeout or settings.EXTRACTION_TIMEOUT_SECONDS
+    text, truncated = await _guarded(submit, timeout, "Text extraction")
+    document_cache.set_text(digest, text, truncated=truncated, budget=max_chars)
+    return text, truncated
+
+
+def _page_shards(page_count: int, workers: int) -> list[tuple[int, int]]:
+    """Split ``page_count`` pages into contiguous ranges, about two per worker for load balancing."""
+    shard_count = max(1, min(workers * 2, page_count // MIN_PAGES_PER_SHARD))
+    size = math.ceil(page_count / shard_count)
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+async def extract_pdf_text_parallel(
+    source: DocumentSource, max_chars: int | None = None, pool: ProcessPoolExecutor | None = None
+) -> tuple[str, bool]:
+    """Extract PDF text with page ranges spread across the extraction pool.
+
+    Every worker opens the document by path rather than receiving the whole
+    document pickled into each task; raw bytes are first written once to a
+    temporary file. Small PDFs (under ``PDF_PARALLEL_MIN_PAGES``) are handled by
+    a single worker. Shards are scheduled one wave (one per worker) at a time.
+    With ``max_chars``, each shard stops parsing page by page once its own text
+    exceeds the budget left, and no further waves are started once it is met.
+
+    Returns a tuple of (text, is_truncated).
+    """
+    loop = asyncio.get_running_loop()
+    pool = pool or get_extraction_pool()
+    workers = settings.EXTRACTION_WORKERS
+
+    if isinstance(source, bytes):
+        fd, path = tempfile.mkstemp(suffix=".pdf")
+        with os.fdopen(fd, "wb") as f:
+            await asyncio.to_thread(f.write, source)
+    else:
+        path = source
+    try:
+        page_count = await loop.run_in_executor(pool, count_pdf_pages, path)
+        if page_count < settings.PDF_PARALLEL_MIN_PAGES:
+            shards = [(0, page_count)]
+        else:
+            shards = _page_shards(page_count, workers)
+            logger.info(f"Extracting {page_count} PDF pages in {len(shards)} parallel shards")
+
+        pages: list[str] = []
+        collected = 0
+        for wave_start in range(0, len(shards), workers):
+            wave = shards[wave_start : wave_start + workers]
+            remaining = None if max_chars is None else max_chars - collected
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, extract_pdf_page_range, path, start, stop, remaining)
+                    for start, stop in wave
+                )
+            )
+            for shard_pages in results:
+                pages.extend(text for text in shard_pages if text)
+                collected += sum(len(text) for text in shard_pages)
+
+            if max_chars is not None and collected > max_chars:
+                if wave_start + workers < len(shards):
+                    logger.info(f"Stopped PDF extraction at page {wave[-1][1]}/{page_count}: budget reached")
+                break
+    finally:
+        if isinstance(source, bytes):
+            os.unlink(path)
+
+    if max_chars is None:
+        return "\n\n".join(pages), False
+    return chunk_document_text(pages, max_chars=max_chars)
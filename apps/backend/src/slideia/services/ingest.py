@@ -1,25 +1,91 @@
 """Document content ingestion and chunking utilities."""
 
+import codecs
+import re
+import zipfile
+import zlib
+from collections.abc import Iterable, Iterator
 from io import BytesIO
-from pypdf import PdfReader
-from docx import Document
+from typing import BinaryIO
+from xml.etree.ElementTree import iterparse
+
+import numpy as np
+
+from slideia.core.logging import get_logger
+from slideia.domain.llm.budget import count_tokens, truncate_to_tokens
+from slideia.services import pdf_backends
+from slideia.services.profiling import profile_data
+
+logger = get_logger(__name__)
+
+# Raw file content, or the path of a file holding it (e.g. a spooled upload)
+DocumentSource = bytes | str
+
+# Bytes decoded per step when streaming plain-text files
+PLAIN_TEXT_READ_CHUNK = 64 * 1024
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+# ── Extractive compression settings ──────────────────────────────────────
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[A-Z0-9])")
+# File delimiters added by the chat upload handler; always kept verbatim
+_PINNED_LINE = re.compile(r"^--- .+ ---$")
+
+_STOPWORDS = frozenset(
+    """a an and are as at be been but by can do for from has have if in into is it its of on or
+    our so that the their there these they this to was we were which will with you your""".split()
+)
+
+MINHASH_PERMUTATIONS = 64
+MINHASH_SHINGLE_SIZE = 3
+NEAR_DUPLICATE_THRESHOLD = 0.8
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_ITERATIONS = 50
+# Caps the TF-IDF vocabulary on very large documents
+MAX_VOCABULARY = 4096
+# TextRank's similarity graph is quadratic in its size; beyond this many sentences only
+# the ones closest to the document centroid are ranked (about 16 MB per graph matrix)
+MAX_RANKED_SENTENCES = 2000
+
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(seed=1)
+_MINHASH_A = _rng.integers(1, int(_MERSENNE_PRIME), size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+_MINHASH_B = _rng.integers(0, int(_MERSENNE_PRIME), size=MINHASH_PERMUTATIONS, dtype=np.uint64)
 
 
 def extract_text_from_pdf(content: bytes) -> str:
-    """Extract text from PDF file content using pypdf."""
-    reader = PdfReader(BytesIO(content))
+    """Extract text from PDF file content using the configured PDF backend."""
+    return "\n\n".join(text for text in pdf_backends.iter_pages(content) if text)
+
+
+def count_pdf_pages(path: str) -> int:
+    """Number of pages in the PDF at ``path``."""
+    return pdf_backends.count_pages(path)
+
+
+def extract_pdf_page_range(path: str, start: int, stop: int, max_chars: int | None = None) -> list[str]:
+    """Extract the text of pages ``start``..``stop`` (exclusive) from the PDF at ``path``.
+
+    Used by the page-parallel extractor: each worker opens the file itself, so the
+    document bytes never have to be pickled across processes. With ``max_chars``
+    parsing stops after the page that takes the range's text past it.
+    """
     pages: list[str] = []
-    for page in reader.pages:
-        text = page.extract_text()
-        if text:
-            pages.append(text)
-    return "\n\n".join(pages)
+    collected = 0
+    for text in pdf_backends.iter_pages(path, start, stop):
+        pages.append(text)
+        collected += len(text)
+        if max_chars is not None and collected > max_chars:
+            break
+    return pages
 
 
 def extract_text_from_docx(content: bytes) -> str:
-    """Extract text from Word .docx file content using python-docx."""
-    doc = Document(BytesIO(content))
-    return "\n\n".join(para.text for para in doc.paragraphs if para.text)
+    """Extract text (paragraphs and table rows) from Word .docx file content."""
+    return "\n\n".join(iter_docx_paragraphs(content))
 
 
 def extract_text_from_plain(content: bytes) -> str:
@@ -30,49 +96,498 @@ def extract_text_from_plain(content: bytes) -> str:
 def extract_file_text(content: bytes, ext: str) -> str:
     """Extract text content from raw bytes according to the file extension.
 
-    Supported extensions: pdf, docx, txt, md, csv, json.
+    Supported extensions: pdf, docx, txt, md, csv, json. CSV and JSON data is
+    profiled into a compact data brief rather than returned verbatim.
     """
     if ext == "pdf":
         return extract_text_from_pdf(content)
     if ext == "docx":
         return extract_text_from_docx(content)
+    if ext in ("csv", "json") and (brief := profile_data(content, ext)) is not None:
+        return brief
     return extract_text_from_plain(content)
 
 
-def chunk_document_text(text: str, max_chars: int = 30000) -> tuple[str, bool]:
+# ── Streaming extraction ──────────────────────────────────────────────────
+
+
+def _open_source(source: DocumentSource) -> BinaryIO:
+    return BytesIO(source) if isinstance(source, bytes) else open(source, "rb")
+
+
+def iter_pdf_pages(content: DocumentSource) -> Iterator[str]:
+    """Yield the text of each non-empty PDF page, parsing pages only as they are consumed."""
+    for text in pdf_backends.iter_pages(content):
+        if text:
+            yield text
+
+
+def iter_docx_paragraphs(content: DocumentSource) -> Iterator[str]:
+    """Yield the text of a .docx file's paragraphs and table rows in document order.
+
+    Streams ``word/document.xml`` with ``iterparse`` instead of building the
+    python-docx object model, clearing elements as they are consumed so memory
+    stays flat. Table rows are yielded as ``cell | cell | ...``; nested tables
+    are folded into their parent cell.
+    """
+    archive_file = BytesIO(content) if isinstance(content, bytes) else content
+    with zipfile.ZipFile(archive_file) as archive, archive.open("word/document.xml") as xml:
+        paragraph_stack: list[list[str]] = []  # text pieces of each open paragraph
+        row_stack: list[list[str]] = []  # cells of each open table row
+        cell_stack: list[list[str]] = []  # paragraphs of each open table cell
+        run_depth = 0
+        fallback_depth = 0  # skip mc:Fallback copies of text boxes
+
+        for event, elem in iterparse(xml, events=("start", "end")):
+            tag = elem.tag
+            if tag == _MC_FALLBACK:
+                fallback_depth += 1 if event == "start" else -1
+                continue
+            if fallback_depth:
+                continue
+
+            if event == "start":
+                if tag == f"{_W}p":
+                    paragraph_stack.append([])
+                elif tag == f"{_W}r":
+                    run_depth += 1
+                elif tag == f"{_W}tr":
+                    row_stack.append([])
+                elif tag == f"{_W}tc":
+                    cell_stack.append([])
+                continue
+
+            if tag == f"{_W}r":
+                run_depth -= 1
+            elif run_depth and paragraph_stack and tag in (f"{_W}t", f"{_W}tab", f"{_W}br", f"{_W}cr"):
+                if tag == f"{_W}t":
+                    paragraph_stack[-1].append(elem.text or "")
+                else:
+                    paragraph_stack[-1].append("\t" if tag == f"{_W}tab" else "\n")
+            elif tag == f"{_W}p":
+                text = "".join(paragraph_stack.pop())
+                if cell_stack:
+                    cell_stack[-1].append(text)
+                elif text:
+                    yield text
+                if not cell_stack:
+                    elem.clear()
+            elif tag == f"{_W}tc":
+                cell = " ".join(p for p in cell_stack.pop() if p)
+                if row_stack:
+                    row_stack[-1].append(cell)
+            elif tag == f"{_W}tr":
+                cells = row_stack.pop()
+                row = " | ".join(cells) if any(cells) else ""
+                if cell_stack:
+                    cell_stack[-1].append(row)
+                elif row:
+                    yield row
+                    elem.clear()
+            elif tag == f"{_W}tbl" and not cell_stack:
+                elem.clear()
+
+
+def iter_plain_paragraphs(content: DocumentSource) -> Iterator[str]:
+    """Incrementally decode plain text and yield it paragraph by paragraph."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    with _open_source(content) as f:
+        while chunk := f.read(PLAIN_TEXT_READ_CHUNK):
+            pending += decoder.decode(chunk)
+            *paragraphs, pending = pending.split("\n\n")
+            yield from paragraphs
+    pending += decoder.decode(b"", final=True)
+    yield pending
+
+
+def iter_file_text(content: DocumentSource, ext: str) -> Iterator[str]:
+    """Lazily extract text segments (pages or paragraphs) according to the file extension.
+
+    Joining the segments with blank lines gives the same text as ``extract_file_text``;
+    consumers that stop early never pay for parsing the rest of the document.
+    """
+    if ext == "pdf":
+        return iter_pdf_pages(content)
+    if ext == "docx":
+        return iter_docx_paragraphs(content)
+    if ext in ("csv", "json") and (brief := profile_data(content, ext)) is not None:
+        return iter([brief])
+    return iter_plain_paragraphs(content)
+
+
+def extract_file_text_within(
+    content: DocumentSource, ext: str, max_chars: int | None = None, max_tokens: int | None = None
+) -> tuple[str, bool]:
+    """Extract text only until ``max_chars`` (or ``max_tokens``) is reached.
+
+    Returns a tuple of (text, is_truncated).
+    """
+    if max_chars is None and max_tokens is None:
+        return "\n\n".join(iter_file_text(content, ext)), False
+    return chunk_document_text(iter_file_text(content, ext), max_chars=max_chars, max_tokens=max_tokens)
+
+
+def frame_document(filename: str, text: str) -> str:
+    """Wrap a file's text in the delimiters used to separate documents in the reference context."""
+    return f"--- File: {filename} ---\n{text}\n--- End of {filename} ---"
+
+
+def chunk_document_text(
+    source: str | Iterable[str], max_chars: int | None = 30000, max_tokens: int | None = None
+) -> tuple[str, bool]:
     """Chunk or truncate text to fit the max_chars limit, splitting at natural boundaries.
 
+    ``source`` may be a string or an iterable of text segments (e.g. from
+    ``iter_file_text``), which is consumed lazily and abandoned once the budget is
+    met. Passing ``max_tokens`` budgets by tokens instead of characters.
+
     Returns a tuple of (truncated_text, is_truncated).
     """
-    if len(text) <= max_chars:
-        return text, False
+    if max_tokens is not None:
+        limit, measure, newline_cost = max_tokens, count_tokens, 0
+    else:
+        limit, measure, newline_cost = max_chars, len, 1
+
+    if isinstance(source, str):
+        if measure(source) <= limit:
+            return source, False
+        source = [source]
 
     # Try to split by paragraph first
-    paragraphs = text.split("\n\n")
     current_text = []
     current_len = 0
 
-    for para in paragraphs:
-        # Account for the double newline separator when joining
-        sep_len = 2 if current_text else 0
-        if current_len + sep_len + len(para) <= max_chars:
-            current_text.append(para)
-            current_len += sep_len + len(para)
-        else:
+    for segment in source:
+        for para in segment.split("\n\n"):
+            # Account for the double newline separator when joining
+            sep_len = 2 * newline_cost if current_text else 0
+            para_len = measure(para)
+            if current_len + sep_len + para_len <= limit:
+                current_text.append(para)
+                current_len += sep_len + para_len
+                continue
+
             # If we couldn't even fit the first paragraph, try line-by-line
             if not current_text:
                 lines = para.split("\n")
                 for line in lines:
-                    line_sep_len = 1 if current_text else 0
-                    if current_len + line_sep_len + len(line) <= max_chars:
+                    line_sep_len = newline_cost if current_text else 0
+                    line_len = measure(line)
+                    if current_len + line_sep_len + line_len <= limit:
                         current_text.append(line)
-                        current_len += line_sep_len + len(line)
+                        current_len += line_sep_len + line_len
                     else:
-                        # Hard character cut if a single line is too large
+                        # Hard cut if a single line is too large
                         if not current_text:
-                            return para[:max_chars], True
+                            if max_tokens is not None:
+                                return truncate_to_tokens(para, limit)[0], True
+                            return para[:limit], True
                         break
                 return "\n".join(current_text), True
-            break
+            return "\n\n".join(current_text), True
+
+    return "\n\n".join(current_text), False
+
+
+def split_text_by_tokens(text: str, max_tokens: int) -> list[str]:
+    """Split text into chunks of at most ``max_tokens``, keeping paragraphs intact where possible.
+
+    Paragraphs larger than ``max_tokens`` are themselves split at line or word boundaries.
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+
+    for para in text.split("\n\n"):
+        if not para.strip():
+            continue
+
+        para_tokens = count_tokens(para)
+        if current and current_tokens + para_tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+
+        # Oversized paragraph: cut it into budget-sized pieces
+        while para_tokens > max_tokens:
+            piece, _ = truncate_to_tokens(para, max_tokens)
+            if not piece:
+                piece = para[: max(1, len(para) * max_tokens // para_tokens)]
+            chunks.append(piece)
+            para = para[len(piece) :].lstrip()
+            para_tokens = count_tokens(para)
+
+        if para:
+            current.append(para)
+            current_tokens += para_tokens
+
+    if current:
+        chunks.append("\n\n".join(current))
+
+    return chunks
+
+
+# ── Extractive compression ────────────────────────────────────────────────
+
+
+def _words(text: str) -> list[str]:
+    return [w for w in _WORD_PATTERN.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def _minhash_signature(paragraph: str) -> np.ndarray:
+    """MinHash signature of a paragraph's word shingles."""
+    words = _WORD_PATTERN.findall(paragraph.lower())
+    size = min(MINHASH_SHINGLE_SIZE, len(words)) or 1
+    shingles = {" ".join(words[i : i + size]) for i in range(max(len(words) - size + 1, 1))}
+    hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64) % _MERSENNE_PRIME
+    return ((_MINHASH_A[:, None] * hashes[None, :] + _MINHASH_B[:, None]) % _MERSENNE_PRIME).min(axis=1)
+
+
+def dedupe_paragraphs(paragraphs: list[str], threshold: float = NEAR_DUPLICATE_THRESHOLD) -> list[str]:
+    """Drop paragraphs whose estimated Jaccard similarity to an earlier one reaches ``threshold``.
+
+    Catches repeated page headers/footers, boilerplate and copy-pasted sections.
+    """
+    kept: list[str] = []
+    signatures = np.empty((len(paragraphs), MINHASH_PERMUTATIONS), dtype=np.uint64)
+    seen = 0
+    for para in paragraphs:
+        if _PINNED_LINE.match(para.strip()):
+            kept.append(para)
+            continue
+
+        signature = _minhash_signature(para)
+        if seen and (signatures[:seen] == signature).mean(axis=1).max() >= threshold:
+            continue
+        signatures[seen] = signature
+        seen += 1
+        kept.append(para)
+
+    return kept
+
+
+def split_sentences(paragraph: str) -> list[str]:
+    """Split a paragraph into sentences (and standalone lines such as headings or bullets)."""
+    sentences: list[str] = []
+    for line in paragraph.split("\n"):
+        sentences.extend(s.strip() for s in _SENTENCE_BOUNDARY.split(line) if s.strip())
+    return sentences
+
+
+def _tfidf_entries(sentences: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """Sparse L2-normalised TF-IDF rows, one per sentence, as (row, column, value) arrays and the width.
+
+    Kept sparse so memory grows with the number of words, not sentences x vocabulary.
+    """
+    tokenized = [_words(s) for s in sentences]
+
+    doc_freq: dict[str, int] = {}
+    for words in tokenized:
+        for word in set(words):
+            doc_freq[word] = doc_freq.get(word, 0) + 1
+    vocabulary = sorted(doc_freq, key=lambda w: (-doc_freq[w], w))[:MAX_VOCABULARY]
+    index = {word: i for i, word in enumerate(vocabulary)}
+    width = len(vocabulary)
+
+    keys = [
+        row * width + col
+        for row, words in enumerate(tokenized)
+        for col in map(index.get, words)
+        if col is not None
+    ]
+    cells, counts = np.unique(np.array(keys, dtype=np.int64), return_counts=True)
+    rows, cols = cells // width, cells % width
+    counts = counts.astype(np.float32)
+
+    df = np.array([doc_freq[w] for w in vocabulary], dtype=np.float32)
+    idf = np.log((1 + len(sentences)) / (1 + df)) + 1
+    lengths = np.bincount(rows, weights=counts, minlength=len(sentences))
+    values = counts / lengths[rows] * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=len(sentences)))
+    return rows, cols, (values / norms[rows]).astype(np.float32), width
+
+
+def _textrank(similarity: np.ndarray) -> np.ndarray:
+    """PageRank over the sentence similarity graph (``similarity`` is reused as scratch space)."""
+    n = similarity.shape[0]
+    transition = similarity
+    np.fill_diagonal(transition, 0.0)
+    out_weight = transition.sum(axis=1, keepdims=True)
+    np.divide(transition, out_weight, out=transition, where=out_weight > 0)
+    # Sentences with no similar neighbours distribute their rank uniformly
+    transition[out_weight[:, 0] == 0] = 1.0 / n
+
+    rank = np.full(n, 1.0 / n, dtype=np.float32)
+    for _ in range(TEXTRANK_ITERATIONS):
+        updated = (1 - TEXTRANK_DAMPING) / n + TEXTRANK_DAMPING * (transition.T @ rank)
+        if np.abs(updated - rank).sum() < 1e-6:
+            return updated
+        rank = updated
+    return rank
+
+
+def score_sentences(sentences: list[str]) -> np.ndarray:
+    """Score sentences by TextRank centrality blended with similarity to the document's TF-IDF centroid.
+
+    Only the ``MAX_RANKED_SENTENCES`` sentences closest to the centroid are ranked
+    by TextRank; the rest score on centroid similarity alone.
+    """
+    n = len(sentences)
+    if n <= 1:
+        return np.ones(n, dtype=np.float32)
+
+    rows, cols, values, width = _tfidf_entries(sentences)
+    centroid = np.bincount(cols, weights=values, minlength=width) / n
+    relevance = np.bincount(rows, weights=values * centroid[cols], minlength=n)
+
+    ranked = np.argsort(-relevance, kind="stable")[:MAX_RANKED_SENTENCES]
+    position = np.full(n, -1)
+    position[ranked] = np.arange(len(ranked))
+    keep = position[rows] >= 0
+    tfidf = np.zeros((len(ranked), width), dtype=np.float32)
+    tfidf[position[rows[keep]], cols[keep]] = values[keep]
+    rank = np.zeros(n, dtype=np.float32)
+    rank[ranked] = _textrank(tfidf @ tfidf.T)
+
+    def normalise(values: np.ndarray) -> np.ndarray:
+        spread = values.max() - values.min()
+        return (values - values.min()) / spread if spread > 0 else np.ones_like(values)
+
+    return 0.5 * normalise(rank) + 0.5 * normalise(relevance)
+
+
+def compress_document(text: str, max_tokens: int) -> tuple[str, bool]:
+    """Reduce ``text`` to at most ``max_tokens`` by keeping its most informative sentences.
+
+    Near-duplicate paragraphs are removed first (MinHash); if the text still does
+    not fit, sentences are ranked (TF-IDF + TextRank) and the best ones are kept in
+    their original order. Runs entirely locally.
+
+    Returns a tuple of (compressed_text, is_compressed).
+    """
+    if count_tokens(text) <= max_tokens:
+        return text, False
+
+    original = [p for p in text.split("\n\n") if p.strip()]
+    paragraphs = dedupe_paragraphs(original)
+    deduped = "\n\n".join(paragraphs)
+    if count_tokens(deduped) <= max_tokens:
+        logger.info(f"Removed {len(original) - len(paragraphs)} near-duplicate paragraphs.")
+        return deduped, True
+
+    # Flatten to (paragraph index, sentence), keeping file delimiters out of the ranking
+    entries: list[tuple[int, str]] = []
+    heads: dict[int, list[str]] = {}
+    tails: dict[int, list[str]] = {}
+    for p_index, para in enumerate(paragraphs):
+        lines = para.split("\n")
+        while lines and _PINNED_LINE.match(lines[0].strip()):
+            heads.setdefault(p_index, []).append(lines.pop(0).strip())
+        while lines and _PINNED_LINE.match(lines[-1].strip()):
+            tails.setdefault(p_index, []).insert(0, lines.pop().strip())
+        entries.extend((p_index, sentence) for sentence in split_sentences("\n".join(lines)))
+
+    pinned_tokens = sum(count_tokens(line) for lines in (*heads.values(), *tails.values()) for line in lines)
+    budget = max_tokens - pinned_tokens
+    scores = score_sentences([sentence for _, sentence in entries])
+    token_counts = [count_tokens(sentence) for _, sentence in entries]
+
+    selected: set[int] = set()
+    used = 0
+    for i in np.argsort(-scores, kind="stable"):
+        if used + token_counts[i] <= budget:
+            selected.add(int(i))
+            used += token_counts[i]
+
+    bodies: dict[int, list[str]] = {}
+    for i, (p_index, sentence) in enumerate(entries):
+        if i in selected:
+            bodies.setdefault(p_index, []).append(sentence)
+
+    blocks = []
+    for p_index in sorted(heads.keys() | bodies.keys() | tails.keys()):
+        body = " ".join(bodies.get(p_index, []))
+        blocks.append(
+            "\n".join([*heads.get(p_index, []), *([body] if body else []), *tails.get(p_index, [])])
+        )
+
+    compressed = "\n\n".join(blocks)
+    logger.info(
+        f"Compressed document from {count_tokens(text)} to {count_tokens(compressed)} tokens "
+        f"({len(selected)}/{len(entries)} sentences kept)."
+    )
+    return compressed, True
+
+
+# ── Retrieval ─────────────────────────────────────────────────────────────
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+class DocumentIndex:
+    """BM25 index over token-bounded passages of the uploaded documents.
+
+    Built once per upload so each slide batch can pull only the passages that
+    are relevant to it instead of re-sending the whole document.
+    """
+
+    def __init__(self, passages: list[str]):
+        self.passages = passages
+        tokenized = [_words(p) for p in passages]
+        self._lengths = np.array([len(words) for words in tokenized], dtype=np.float32)
+        self._avg_length = float(self._lengths.mean()) if passages else 0.0
+
+        postings: dict[str, dict[int, int]] = {}
+        for doc_id, words in enumerate(tokenized):
+            for word in words:
+                freqs = postings.setdefault(word, {})
+                freqs[doc_id] = freqs.get(doc_id, 0) + 1
+
+        n = len(passages)
+        self._postings: dict[str, tuple[np.ndarray, np.ndarray, float]] = {}
+        for word, freqs in postings.items():
+            doc_ids = np.fromiter(freqs.keys(), dtype=np.intp, count=len(freqs))
+            tfs = np.fromiter(freqs.values(), dtype=np.float32, count=len(freqs))
+            idf = float(np.log(1 + (n - len(freqs) + 0.5) / (len(freqs) + 0.5)))
+            self._postings[word] = (doc_ids, tfs, idf)
+
+    def __len__(self) -> int:
+        return len(self.passages)
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every passage for ``query``."""
+        scores = np.zeros(len(self.passages), dtype=np.float32)
+        for word in set(_words(query)):
+            posting = self._postings.get(word)
+            if posting is None:
+                continue
+            doc_ids, tfs, idf = posting
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[doc_ids] / self._avg_length)
+            scores[doc_ids] += idf * tfs * (BM25_K1 + 1) / (tfs + norm)
+        return scores
+
+    def search(self, query: str, top_k: int) -> list[int]:
+        """Indices of the ``top_k`` best-matching passages (best first), ignoring non-matches."""
+        scores = self.scores(query)
+        ranked = np.argsort(-scores, kind="stable")[:top_k]
+        return [int(i) for i in ranked if scores[i] > 0]
+
+    def retrieve(self, query: str, top_k: int, max_tokens: int | None = None) -> str:
+        """Join the best passages for ``query`` in document order, optionally within ``max_tokens``."""
+        chosen: list[int] = []
+        used = 0
+        for i in self.search(query, top_k):
+            tokens = count_tokens(self.passages[i])
+            if max_tokens is not None and used + tokens > max_tokens:
+                continue
+            chosen.append(i)
+            used += tokens
+        return "\n\n".join(self.passages[i] for i in sorted(chosen))
+
 
-    return "\n\n".join(current_text), True
+def build_document_index(text: str, passage_tokens: int) -> DocumentIndex:
+    """Split ``text`` into passages of at most ``passage_tokens`` and index them for BM25 search."""
+    passages = split_text_by_tokens(text, passage_tokens)
+    logger.info(f"Indexed {len(passages)} passages for retrieval.")
+    return DocumentIndex(passages)
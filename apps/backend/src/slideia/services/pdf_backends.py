@@ -0,0 +1,185 @@
+"""Pluggable PDF text extraction backends.
+
+pypdf is always available and is the default. pypdfium2 (``pdfium`` extra) is
+much faster and pdfminer.six (``pdfminer`` extra) handles some unusual layouts
+better; either is used when installed and selected via ``PDF_BACKEND``, and
+every available backend doubles as a fallback when the preferred one fails.
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from io import BytesIO
+
+from pypdf import PdfReader
+
+from slideia.core.config import settings
+from slideia.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# A PDF given either as raw bytes or as a filesystem path
+PdfSource = bytes | str
+
+# Preference order for PDF_BACKEND=auto, fastest first
+AUTO_ORDER = ("pypdfium2", "pypdf", "pdfminer")
+
+
+class PdfBackend(ABC):
+    """Extracts per-page text from a PDF."""
+
+    name = ""
+
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def count_pages(self, source: PdfSource) -> int:
+        """Return the number of pages in the PDF."""
+        pass
+
+    @abstractmethod
+    def iter_pages(self, source: PdfSource, start: int = 0, stop: int | None = None) -> Iterator[str]:
+        """Yield the text of pages ``start``..``stop`` (exclusive), ``""`` for pages without text."""
+        pass
+
+
+class PypdfBackend(PdfBackend):
+    name = "pypdf"
+
+    @staticmethod
+    def _reader(source: PdfSource) -> PdfReader:
+        return PdfReader(BytesIO(source) if isinstance(source, bytes) else source)
+
+    def count_pages(self, source: PdfSource) -> int:
+        return len(self._reader(source).pages)
+
+    def iter_pages(self, source: PdfSource, start: int = 0, stop: int | None = None) -> Iterator[str]:
+        reader = self._reader(source)
+        total = len(reader.pages)
+        for i in range(start, total if stop is None else min(stop, total)):
+            yield reader.pages[i].extract_text() or ""
+
+
+class PdfiumBackend(PdfBackend):
+    name = "pypdfium2"
+
+    def available(self) -> bool:
+        try:
+            import pypdfium2  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def count_pages(self, source: PdfSource) -> int:
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(source)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def iter_pages(self, source: PdfSource, start: int = 0, stop: int | None = None) -> Iterator[str]:
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(source)
+        try:
+            total = len(pdf)
+            for i in range(start, total if stop is None else min(stop, total)):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                try:
+                    # pdfium reports line breaks as CRLF
+                    yield textpage.get_text_range().replace("\r\n", "\n").strip()
+                finally:
+                    textpage.close()
+                    page.close()
+        finally:
+            pdf.close()
+
+
+class PdfminerBackend(PdfBackend):
+    name = "pdfminer"
+
+    def available(self) -> bool:
+        try:
+            import pdfminer  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    @staticmethod
+    def _open(source: PdfSource):
+        return BytesIO(source) if isinstance(source, bytes) else open(source, "rb")
+
+    def count_pages(self, source: PdfSource) -> int:
+        from pdfminer.pdfpage import PDFPage
+
+        with self._open(source) as fp:
+            return sum(1 for _ in PDFPage.get_pages(fp))
+
+    def iter_pages(self, source: PdfSource, start: int = 0, stop: int | None = None) -> Iterator[str]:
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+
+        with self._open(source) as fp:
+            page_numbers = None if stop is None else range(start, stop)
+            for index, layout in enumerate(extract_pages(fp, page_numbers=page_numbers)):
+                if stop is None and index < start:
+                    continue
+                yield "".join(el.get_text() for el in layout if isinstance(el, LTTextContainer)).strip()
+
+
+BACKENDS: dict[str, PdfBackend] = {
+    backend.name: backend for backend in (PypdfBackend(), PdfiumBackend(), PdfminerBackend())
+}
+
+
+def backend_chain(preferred: str | None = None) -> list[PdfBackend]:
+    """Available backends in the order they should be tried.
+
+    ``preferred`` (default ``PDF_BACKEND``) is a backend name, or ``auto`` for the
+    fastest installed one; the remaining available backends follow as fallbacks.
+    """
+    preferred = preferred or settings.PDF_BACKEND
+    if preferred == "auto":
+        order = list(AUTO_ORDER)
+    elif preferred in BACKENDS:
+        order = [preferred] + [name for name in AUTO_ORDER if name != preferred]
+    else:
+        logger.warning(f"Unknown PDF backend '{preferred}', using pypdf")
+        order = ["pypdf"] + [name for name in AUTO_ORDER if name != "pypdf"]
+    return [BACKENDS[name] for name in order if BACKENDS[name].available()]
+
+
+def count_pages(source: PdfSource, preferred: str | None = None) -> int:
+    """Page count from the first backend that can open the document."""
+    error: Exception | None = None
+    for backend in backend_chain(preferred):
+        try:
+            return backend.count_pages(source)
+        except Exception as e:
+            logger.warning(f"{backend.name} could not open PDF: {e}")
+            error = e
+    raise error or RuntimeError("No PDF backend available")
+
+
+def iter_pages(
+    source: PdfSource, start: int = 0, stop: int | None = None, preferred: str | None = None
+) -> Iterator[str]:
+    """Yield page texts, falling back to the next backend if one fails mid-document.
+
+    A fallback resumes at the page that failed, so pages are never duplicated.
+    """
+    page = start
+    error: Exception | None = None
+    for backend in backend_chain(preferred):
+        try:
+            for text in backend.iter_pages(source, page, stop):
+                yield text
+                page += 1
+            return
+        except Exception as e:
+            logger.warning(f"{backend.name} failed at page {page + 1}, trying next backend: {e}")
+            error = e
+    raise error or RuntimeError("No PDF backend available")
@@ -0,0 +1,89 @@
+"""Bounded process pools for CPU-bound work.
+
+Extraction and rendering each get their own pool so load on one never queues
+behind the other. A pool is created on first use and recycled when a job hangs
+or a worker dies; recycling terminates the old workers, since a worker stuck in
+a pathological document would otherwise keep burning CPU after its caller gave
+up, and every timeout would add another pool's worth of processes. Other jobs
+on a recycled pool fail with ``BrokenProcessPool`` through no fault of their
+own; callers check :meth:`WorkerPool.was_recycled` and retry those once.
+"""
+
+import os
+import weakref
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+
+from slideia.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class WorkerPool:
+    """A lazily created ``ProcessPoolExecutor`` of ``workers()`` processes that can be recycled."""
+
+    def __init__(self, name: str, workers: Callable[[], int], initializer: Callable[[], None] | None = None):
+        self.name = name
+        self._workers = workers
+        self._initializer = initializer
+        self._pool: ProcessPoolExecutor | None = None
+        self._started = False
+        self._recycled: weakref.WeakSet[ProcessPoolExecutor] = weakref.WeakSet()
+
+    def get(self) -> ProcessPoolExecutor:
+        """Return the pool, creating it on first use."""
+        if self._pool is None:
+            workers = self._workers()
+            self._pool = ProcessPoolExecutor(max_workers=workers, initializer=self._initializer)
+            logger.info(f"Started {self.name} pool with {workers} workers")
+        return self._pool
+
+    def start(self):
+        """Create the pool and spawn its workers now, so the first job does not wait for them.
+
+        A started pool is started again as soon as it is recycled, rather than
+        lazily (and cold) on the next job.
+        """
+        self._started = True
+        pool = self.get()
+        for _ in range(pool._max_workers):
+            pool.submit(_ping)
+
+    def recycle(self, reason: str, pool: ProcessPoolExecutor | None = None):
+        """Terminate the workers of ``pool`` (default: the current one) and replace it on next use.
+
+        Jobs still running or queued on it fail with ``BrokenProcessPool``. Nothing
+        happens if ``pool`` has already been replaced, so callers whose job failed
+        because of an earlier recycle do not recycle the fresh pool as well.
+        """
+        if self._pool is None or (pool is not None and pool is not self._pool):
+            return
+        logger.warning(f"Recycling {self.name} pool: {reason}")
+        self._recycled.add(self._pool)
+        _terminate(self._pool)
+        self._pool = None
+        if self._started:
+            self.start()
+
+    def was_recycled(self, pool: ProcessPoolExecutor) -> bool:
+        """Whether ``pool`` was terminated by :meth:`recycle`, i.e. its jobs were killed rather than crashed."""
+        return pool in self._recycled
+
+    def shutdown(self):
+        self._started = False
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _terminate(pool: ProcessPoolExecutor):
+    """Stop ``pool`` and kill its workers, including any stuck in a job."""
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
@@ -0,0 +1,502 @@
+"""Local profiling of structured (CSV and JSON) uploads.
+
+Pasting a large CSV or JSON file into a prompt mostly spends tokens on raw
+cells that get truncated anyway. Instead the data is parsed locally, each
+column is profiled with vectorized NumPy statistics (counts, ranges, top
+categories, trends, correlations) and the result is rendered as a compact
+plain-text data brief, including candidate facts for ``big_number`` slides.
+"""
+
+import csv
+import io
+import itertools
+import json
+import math
+import re
+
+import numpy as np
+
+from slideia.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Rows beyond this are ignored (the brief says so)
+MAX_PROFILE_ROWS = 200_000
+MAX_BRIEF_COLUMNS = 24
+TOP_CATEGORIES = 3
+SAMPLE_ROWS = 3
+MAX_KEY_FIGURES = 8
+MAX_CORRELATIONS = 5
+STRONG_CORRELATION = 0.7
+# Share of non-empty cells that must parse for a column to count as numeric
+MIN_NUMERIC_SHARE = 0.9
+NUMERIC_SAMPLE = 200
+# A linear trend must explain this much variance and move this much to be reported
+MIN_TREND_R2 = 0.3
+MIN_TREND_CHANGE = 0.05
+MAX_OUTLINE_DEPTH = 3
+MAX_OUTLINE_KEYS = 20
+
+KEY_FIGURES_HEADING = "Key figures (big_number candidates):"
+
+# Column names whose values are naturally summed
+_ADDITIVE_HINTS = re.compile(
+    r"revenue|sales|amount|total|count|cost|profit|spend|income|units|quantity|qty|volume|orders|users|visits",
+    re.IGNORECASE,
+)
+_ID_COLUMN = re.compile(r"(^|_|\b)(id|uuid|key|index)$", re.IGNORECASE)
+_NUMBER_JUNK = str.maketrans("", "", "$€£¥,% _")
+_CURRENCY_SYMBOLS = "$€£¥"
+
+
+def format_number(value: float, unit: str = "") -> str:
+    """Human-friendly rendering such as ``$5.2M``, ``73.4%`` or ``1,204``."""
+    if math.isnan(value):
+        return "n/a"
+    if unit == "%":
+        return f"{value:.1f}%"
+    magnitude = abs(value)
+    for threshold, scale, suffix in ((1e12, 1e12, "T"), (1e9, 1e9, "B"), (1e6, 1e6, "M"), (1e4, 1e3, "K")):
+        if magnitude >= threshold:
+            text = f"{value / scale:.1f}".rstrip("0").rstrip(".") + suffix
+            break
+    else:
+        if value == int(value):
+            text = f"{int(value):,}"
+        else:
+            text = f"{value:,.2f}".rstrip("0").rstrip(".")
+    return f"{unit}{text}" if unit else text
+
+
+def _format_change(change: float) -> str:
+    return f"{'+' if change >= 0 else ''}{change * 100:.0f}%"
+
+
+def _to_numbers(values: np.ndarray) -> np.ndarray:
+    """Parse cells as floats (ignoring currency, thousands separators and ``%``), NaN where they do not parse."""
+    try:
+        # Plain numbers convert in C; only formatted ones need cleaning first
+        return np.where(values == "", "nan", values).astype(np.float64)
+    except ValueError:
+        pass
+    cleaned = np.array([v.translate(_NUMBER_JUNK) or "nan" for v in values.tolist()])
+    try:
+        return cleaned.astype(np.float64)
+    except ValueError:
+        numbers = np.full(len(cleaned), np.nan)
+        for i, cell in enumerate(cleaned.tolist()):
+            try:
+                numbers[i] = float(cell)
+            except ValueError:
+                pass
+        return numbers
+
+
+def _to_dates(values: np.ndarray) -> np.ndarray | None:
+    """Parse ISO-8601 dates, or ``None`` if any non-empty cell is not one."""
+    if not all("-" in v for v in values[:20].tolist()):
+        return None
+    try:
+        return np.array([v[:10] for v in values.tolist()], dtype="datetime64[D]")
+    except ValueError:
+        return None
+
+
+class ColumnProfile:
+    """Summary statistics for one column."""
+
+    def __init__(self, name: str, cells: np.ndarray):
+        self.name = name
+        self.cells = cells  # object array of strings
+        self.rows = len(cells)
+        present = cells != ""
+        self.missing = int(self.rows - present.sum())
+        values = cells[present]
+        self.kind = "empty"
+        self.unit = ""
+        self.numbers: np.ndarray | None = None  # aligned with all rows, NaN where missing
+        self.dates: np.ndarray | None = None
+        self.top: list[tuple[str, float]] = []
+        self.distinct = 0
+        if not len(values):
+            return
+
+        # Screen a sample first so text columns are not parsed cell by cell
+        sample_parsed = ~np.isnan(_to_numbers(values[:NUMERIC_SAMPLE]))
+        if sample_parsed.mean() >= MIN_NUMERIC_SHARE:
+            numbers = _to_numbers(cells)
+            parsed = int((~np.isnan(numbers[present])).sum())
+        else:
+            parsed = 0
+        if parsed >= MIN_NUMERIC_SHARE * len(values):
+            self.kind = "numeric"
+            self.numbers = numbers
+            sample = values[0]
+            if sample.endswith("%"):
+                self.unit = "%"
+            elif sample[:1] in _CURRENCY_SYMBOLS:
+                self.unit = sample[0]
+            return
+
+        dates = _to_dates(values)
+        if dates is not None:
+            self.kind = "date"
+            self.dates = np.full(self.rows, np.datetime64("NaT"), dtype="datetime64[D]")
+            self.dates[present] = dates
+            return
+
+        labels, counts = np.unique(values, return_counts=True)
+        self.distinct = len(labels)
+        order = np.argsort(counts)[::-1][:TOP_CATEGORIES]
+        self.top = [(str(labels[i]), counts[i] / len(values)) for i in order]
+        self.kind = "categorical" if self.distinct <= max(20, len(values) // 20) else "text"
+
+    @property
+    def is_identifier(self) -> bool:
+        if _ID_COLUMN.search(self.name):
+            return True
+        if self.kind != "numeric":
+            return False
+        # A row counter: consecutive integers, one per row
+        return len(self.numbers) > 2 and bool(np.all(np.diff(self.numbers) == 1))
+
+    @property
+    def is_additive(self) -> bool:
+        return self.kind == "numeric" and self.unit != "%" and bool(_ADDITIVE_HINTS.search(self.name))
+
+
+class DataProfile:
+    """Profile of a table: per-column statistics, trends, correlations and key figures."""
+
+    def __init__(self, header: list[str], rows: list[list[str]], source: str, total_rows: int | None = None):
+        self.source = source
+        self.header = header
+        self.total_rows = total_rows if total_rows is not None else len(rows)
+        self.sample = rows[:SAMPLE_ROWS]
+        self.columns = []
+        # Transpose to columns; short rows are padded, cells beyond the header ignored
+        for name, column in zip(header, itertools.zip_longest(*rows, fillvalue="")):
+            cells = np.empty(len(rows), dtype=object)
+            cells[:] = column
+            self.columns.append(ColumnProfile(name, cells))
+
+        # Trends follow the first date column when there is one, file order otherwise
+        self.order_column = next((c for c in self.columns if c.kind == "date"), None)
+
+        self.measures = [c for c in self.columns if c.kind == "numeric" and not c.is_identifier]
+        self.trends = {c.name: self._trend(c) for c in self.measures}
+        self.correlations = self._correlations()
+        self.key_figures = self._key_figures()
+
+    def _series(self, column: ColumnProfile) -> np.ndarray:
+        """The column's values in order; with a date column, aggregated per month (or day, for short spans)."""
+        if self.order_column is None:
+            return column.numbers
+        dates = self.order_column.dates
+        mask = ~np.isnat(dates) & ~np.isnan(column.numbers)
+        dates, values = dates[mask], column.numbers[mask]
+        if not len(dates):
+            return values
+        if dates.max() - dates.min() >= np.timedelta64(90, "D"):
+            dates = dates.astype("datetime64[M]")
+        periods, inverse = np.unique(dates, return_inverse=True)
+        totals = np.bincount(inverse, weights=values, minlength=len(periods))
+        if column.is_additive:
+            return totals
+        return totals / np.bincount(inverse, minlength=len(periods))
+
+    def _trend(self, column: ColumnProfile) -> float | None:
+        """Relative change along a linear fit of the ordered values, if the fit is meaningful."""
+        values = self._series(column)
+        mask = ~np.isnan(values)
+        y = values[mask]
+        if len(y) < 4 or np.ptp(y) == 0:
+            return None
+        x = np.arange(len(values), dtype=np.float64)[mask]
+        slope, intercept = np.polyfit(x, y, 1)
+        fitted = slope * x + intercept
+        r2 = 1 - np.sum((y - fitted) ** 2) / np.sum((y - y.mean()) ** 2)
+        start, end = fitted[0], fitted[-1]
+        if r2 < MIN_TREND_R2 or start == 0:
+            return None
+        change = (end - start) / abs(start)
+        return float(change) if abs(change) >= MIN_TREND_CHANGE else None
+
+    def _correlations(self) -> list[tuple[str, str, float]]:
+        candidates = [c for c in self.measures if np.nanstd(c.numbers) > 0]
+        if len(candidates) < 2:
+            return []
+        matrix = np.column_stack([c.numbers for c in candidates])
+        matrix = matrix[~np.isnan(matrix).any(axis=1)]
+        if len(matrix) < 8:
+            return []
+        r = np.corrcoef(matrix, rowvar=False)
+        i, j = np.triu_indices(len(candidates), k=1)
+        strong = [(candidates[a].name, candidates[b].name, float(r[a, b])) for a, b in zip(i, j)]
+        strong = [pair for pair in strong if abs(pair[2]) >= STRONG_CORRELATION]
+        strong.sort(key=lambda pair: -abs(pair[2]))
+        return strong[:MAX_CORRELATIONS]
+
+    def _span(self) -> str:
+        if self.order_column is None:
+            return "from the first to the last row"
+        dates = self.order_column.dates[~np.isnat(self.order_column.dates)]
+        return f"from {dates.min()} to {dates.max()}"
+
+    def _key_figures(self) -> list[tuple[str, str]]:
+        figures: list[tuple[str, str]] = [(f"{self.total_rows:,}", "records in the dataset")]
+        primary = next(
+            (c for c in self.measures if c.is_additive), self.measures[0] if self.measures else None
+        )
+
+        for column in self.measures:
+            values = column.numbers[~np.isnan(column.numbers)]
+            if column.is_additive:
+                figures.append((format_number(values.sum(), column.unit), f"total {column.name}"))
+            else:
+                figures.append((format_number(values.mean(), column.unit), f"average {column.name}"))
+            change = self.trends.get(column.name)
+            if change is not None:
+                figures.append((_format_change(change), f"change in {column.name} {self._span()}"))
+
+        if primary is not None and primary.is_additive:
+            category = next((c for c in self.columns if c.kind == "categorical" and c.distinct > 1), None)
+            if category is not None:
+                figures.append(self._category_share(primary, category))
+            values = primary.numbers
+            peak = int(np.nanargmax(values))
+            when = ""
+            if self.order_column is not None and not np.isnat(self.order_column.dates[peak]):
+                when = f" ({self.order_column.dates[peak]})"
+            figures.append(
+                (format_number(values[peak], primary.unit), f"highest single {primary.name}{when}")
+            )
+
+        return figures[:MAX_KEY_FIGURES]
+
+    @staticmethod
+    def _category_share(measure: ColumnProfile, category: ColumnProfile) -> tuple[str, str]:
+        """Share of ``measure``'s total contributed by the largest ``category`` group."""
+        labels, inverse = np.unique(category.cells, return_inverse=True)
+        weights = np.nan_to_num(measure.numbers)
+        totals = np.bincount(inverse, weights=weights, minlength=len(labels))
+        index = int(np.argmax(totals))
+        share = totals[index] / totals.sum() if totals.sum() else 0.0
+        return f"{share * 100:.0f}%", f"of total {measure.name} from {labels[index]} ({category.name})"
+
+    def to_brief(self) -> str:
+        """Render the profile as a compact plain-text brief, sections separated by blank lines."""
+        title = f"Data brief: {self.total_rows:,} rows x {len(self.header)} columns ({self.source})"
+        profiled = self.columns[0].rows if self.columns else 0
+        if profiled < self.total_rows:
+            title += f"; statistics cover the first {profiled:,} rows"
+        sections = [title]
+
+        lines = ["Columns:"]
+        for column in self.columns[:MAX_BRIEF_COLUMNS]:
+            lines.append(f"- {self._describe(column)}")
+        if len(self.columns) > MAX_BRIEF_COLUMNS:
+            lines.append(f"- ... and {len(self.columns) - MAX_BRIEF_COLUMNS} more columns")
+        sections.append("\n".join(lines))
+
+        if self.correlations:
+            lines = ["Correlations:"]
+            for a, b, r in self.correlations:
+                direction = "positive" if r > 0 else "negative"
+                lines.append(f"- {a} and {b}: strong {direction} (r={r:.2f})")
+            sections.append("\n".join(lines))
+
+        if self.key_figures:
+            lines = [KEY_FIGURES_HEADING]
+            lines.extend(f"- {value}: {context}" for value, context in self.key_figures)
+            sections.append("\n".join(lines))
+
+        if self.sample:
+            lines = ["Sample rows:", " | ".join(self.header[:MAX_BRIEF_COLUMNS])]
+            lines.extend(" | ".join(cell.strip() for cell in row[:MAX_BRIEF_COLUMNS]) for row in self.sample)
+            sections.append("\n".join(lines))
+
+        return "\n\n".join(sections)
+
+    def _describe(self, column: ColumnProfile) -> str:
+        missing = f", {column.missing / column.rows:.0%} missing" if column.missing else ""
+        if column.kind == "numeric":
+            values = column.numbers[~np.isnan(column.numbers)]
+            unit = column.unit
+            text = (
+                f"{column.name} (numeric{missing}): range {format_number(values.min(), unit)} to "
+                f"{format_number(values.max(), unit)}, mean {format_number(values.mean(), unit)}, "
+                f"median {format_number(float(np.median(values)), unit)}"
+            )
+            if column.is_identifier:
+                return f"{column.name} (identifier{missing})"
+            if column.is_additive:
+                text += f", total {format_number(values.sum(), unit)}"
+            change = self.trends.get(column.name)
+            if change is not None:
+                direction = "rising" if change > 0 else "falling"
+                text += f"; {direction} {abs(change) * 100:.0f}% {self._span()}"
+            return text
+        if column.kind == "date":
+            dates = column.dates[~np.isnat(column.dates)]
+            return f"{column.name} (date{missing}): {dates.min()} to {dates.max()}"
+        if column.kind == "categorical":
+            top = ", ".join(f"{label} {share:.0%}" for label, share in column.top)
+            return f"{column.name} (categorical, {column.distinct} values{missing}): {top}"
+        if column.kind == "text":
+            return f"{column.name} (text, {column.distinct:,} distinct values{missing})"
+        return f"{column.name} (empty)"
+
+
+def _decode(source: bytes | str) -> str:
+    """Content as text; ``source`` is raw bytes or the path of a file holding them."""
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            source = f.read()
+    return source.decode("utf-8-sig", errors="replace")
+
+
+def profile_csv(source: bytes | str, name: str = "CSV") -> DataProfile | None:
+    """Profile delimited text; ``None`` if it does not look like a table."""
+    text = _decode(source)
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=",;\t|")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(io.StringIO(text), dialect, skipinitialspace=True)
+
+    header = next(reader, None)
+    if not header or len(header) < 2:
+        return None
+    header = [cell.strip() or f"column_{i + 1}" for i, cell in enumerate(header)]
+
+    rows: list[list[str]] = []
+    total = 0
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        total += 1
+        if len(rows) < MAX_PROFILE_ROWS:
+            rows.append(row)
+    if not rows:
+        return None
+    return DataProfile(header, rows, name, total_rows=total)
+
+
+def _find_records(data, path: str = "") -> tuple[list[dict], str] | None:
+    """The largest list of objects at the top level or one level down, with its key path."""
+    if isinstance(data, list) and data and all(isinstance(item, dict) for item in data[:100]):
+        return [item for item in data if isinstance(item, dict)], path
+    if isinstance(data, dict):
+        found = [_find_records(value, key) for key, value in data.items() if isinstance(value, list)]
+        found = [f for f in found if f is not None]
+        if found:
+            return max(found, key=lambda f: len(f[0]))
+    return None
+
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))[:80]
+    return str(value)
+
+
+def _outline(data, key: str, depth: int, lines: list[str]):
+    """Describe non-tabular JSON structure, a few levels deep."""
+    indent = "  " * depth
+    label = f"{key}: " if key else ""
+    if isinstance(data, dict):
+        lines.append(f"{indent}- {label}object with {len(data)} keys")
+        if depth < MAX_OUTLINE_DEPTH:
+            for child_key, value in list(data.items())[:MAX_OUTLINE_KEYS]:
+                _outline(value, child_key, depth + 1, lines)
+    elif isinstance(data, list):
+        numbers = [v for v in data if isinstance(v, (int, float)) and not isinstance(v, bool)]
+        if data and len(numbers) == len(data):
+            values = np.asarray(numbers, dtype=np.float64)
+            lines.append(
+                f"{indent}- {label}list of {len(data)} numbers, range {format_number(values.min())} to "
+                f"{format_number(values.max())}, mean {format_number(values.mean())}"
+            )
+        else:
+            lines.append(f"{indent}- {label}list of {len(data)} items")
+            if data and depth < MAX_OUTLINE_DEPTH:
+                _outline(data[0], "first item", depth + 1, lines)
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        lines.append(f"{indent}- {label}{format_number(data)}")
+    else:
+        lines.append(f"{indent}- {label}{_cell(data)[:80]}")
+
+
+def _scalar_figures(data: dict) -> list[tuple[str, str]]:
+    """Top-level numbers of a JSON object, e.g. ``{"total_users": 1200}``."""
+    return [
+        (format_number(value), key.replace("_", " "))
+        for key, value in data.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    ]
+
+
+def profile_json(source: bytes | str, name: str = "JSON") -> str | None:
+    """Data brief for JSON content; ``None`` if it is not valid JSON.
+
+    A list of objects (at the top level or under a top-level key) is profiled as
+    a table; anything else is described by its structure.
+    """
+    try:
+        data = json.loads(_decode(source))
+    except json.JSONDecodeError:
+        return None
+
+    found = _find_records(data)
+    if found is not None:
+        records, path = found
+        header: dict[str, None] = {}
+        for record in records[:1000]:
+            header.update(dict.fromkeys(record))
+        if len(header) >= 2:
+            keys = list(header)
+            rows = [[_cell(record.get(k)) for k in keys] for record in records[:MAX_PROFILE_ROWS]]
+            label = f"{name} records under '{path}'" if path else name
+            profile = DataProfile(keys, rows, label, total_rows=len(records))
+            if isinstance(data, dict):
+                profile.key_figures = (_scalar_figures(data) + profile.key_figures)[:MAX_KEY_FIGURES]
+            return profile.to_brief()
+
+    lines: list[str] = []
+    _outline(data, "", 0, lines)
+    sections = [f"Data brief: JSON document ({name})", "Structure:\n" + "\n".join(lines)]
+    figures = _scalar_figures(data) if isinstance(data, dict) else []
+    if figures:
+        sections.append(
+            "\n".join([KEY_FIGURES_HEADING] + [f"- {v}: {c}" for v, c in figures[:MAX_KEY_FIGURES]])
+        )
+    return "\n\n".join(sections)
+
+
+def profile_data(source: bytes | str, ext: str) -> str | None:
+    """Data brief for a CSV or JSON upload, or ``None`` to fall back to the raw text."""
+    try:
+        if ext == "csv":
+            profile = profile_csv(source)
+            return profile.to_brief() if profile is not None else None
+        if ext == "json":
+            return profile_json(source)
+    except Exception as e:
+        logger.warning(f"Could not profile {ext} data, using raw text: {e}")
+    return None
+
+
+def extract_key_figures(text: str) -> list[str]:
+    """The ``- value: context`` lines of every key-figures section in ``text``."""
+    figures: list[str] = []
+    for section in text.split(KEY_FIGURES_HEADING)[1:]:
+        for line in section.lstrip("\n").split("\n"):
+            if not line.startswith("- "):
+                break
+            figures.append(line)
+    return figures
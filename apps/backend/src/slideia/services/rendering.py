@@ -0,0 +1,171 @@
+"""Off-loop deck rendering.
+
+python-pptx and reportlab do all their work synchronously, so rendering an
+export on the event loop stalls every other request on the worker for the
+length of the render. Exports run in a dedicated, bounded process pool instead,
+separate from the extraction pool so export load never queues behind uploads
+(or the other way round). Workers are started with the app and warmed up with
+the PPTX template and PDF fonts/styles already loaded.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from slideia.core.config import settings
+from slideia.core.deadline import Deadline
+from slideia.core.logging import get_logger
+from slideia.domain.deck.exporter import prepared_template, render_pptx
+from slideia.domain.deck.models import DeckData, deck_data
+from slideia.domain.deck.pdf_exporter import pdf_theme, render_pdf
+from slideia.services.pools import WorkerPool
+
+logger = get_logger(__name__)
+
+RENDERERS = {"pptx": render_pptx, "pdf": render_pdf}
+
+# Fonts used by the PDF exporter; their metrics are parsed lazily on first use
+PDF_FONTS = ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Helvetica-BoldOblique")
+
+
+class RenderMetrics:
+    """Counters for the render pool, reported by the health endpoint."""
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.render_seconds = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting for a free worker."""
+        return max(0, self.in_flight - settings.RENDER_WORKERS)
+
+    def to_dict(self) -> dict:
+        return {
+            "workers": settings.RENDER_WORKERS,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "peak_in_flight": self.peak_in_flight,
+            "avg_render_seconds": round(self.render_seconds / self.completed, 3) if self.completed else None,
+        }
+
+
+render_metrics = RenderMetrics()
+
+
+def _warm_worker():
+    """Process initializer: pay the template and font loading cost once per worker, not per export."""
+    from reportlab.pdfbase import pdfmetrics
+
+    prepared_template()
+    pdf_theme()
+    for font in PDF_FONTS:
+        pdfmetrics.getFont(font)
+
+
+def _render_job(kind: str, deck: dict, deadline: Deadline | None) -> bytes:
+    """Worker entry point: render ``deck`` to ``kind`` and return the file content."""
+    buffer = asyncio.run(RENDERERS[kind](deck, deadline=deadline))
+    return buffer.getvalue()
+
+
+render_pool = WorkerPool("render", lambda: settings.RENDER_WORKERS, initializer=_warm_worker)
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    """Return the shared render pool, creating it on first use."""
+    return render_pool.get()
+
+
+def start_render_pool():
+    """Create the pool and spawn its workers now, so the first export does not wait for them.
+
+    The pool is re-warmed the same way whenever it is recycled.
+    """
+    # Prepared before the workers start, so forked workers inherit it
+    prepared_template()
+    render_pool.start()
+
+
+def shutdown_render_pool():
+    render_pool.shutdown()
+
+
+async def _submit_render(kind: str, deck: dict, deadline: Deadline | None, timeout: float) -> bytes:
+    """Run one render job in the pool, recycling the pool if the job hangs or its worker dies.
+
+    A job killed because another export recycled the pool under it is retried
+    once on the re-warmed pool, within what is left of ``timeout``.
+    """
+    loop = asyncio.get_running_loop()
+    expires = loop.time() + timeout
+    retried = False
+    while True:
+        pool = get_render_pool()
+        future = pool.submit(_render_job, kind, deck, deadline)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=max(0.0, expires - loop.time())
+            )
+        except TimeoutError:
+            # A job still waiting for a worker is simply dropped; a running one cannot be
+            # cancelled, so stop routing new work to its worker
+            if not future.cancel():
+                render_pool.recycle(f"{kind} render exceeded {timeout:.0f}s", pool)
+            raise TimeoutError(f"Rendering took longer than {timeout:.0f}s")
+        except BrokenProcessPool:
+            if not retried and render_pool.was_recycled(pool):
+                logger.info(f"{kind} render was interrupted by a pool recycle; retrying")
+                retried = False
+                continue
+            render_pool.recycle("worker process died", pool)
+            raise
+
+
+async def render_deck(
+    kind: str, deck: DeckData, deadline: Deadline | None = None, timeout: float | None = None
+) -> bytes:
+    """Render ``deck`` as ``"pptx"`` or ``"pdf"`` in the render pool and return the file content.
+
+    The job is given ``timeout`` (default ``RENDER_TIMEOUT_SECONDS``, capped by
+    ``deadline``) including any time spent queued; raises ``TimeoutError`` when
+    it is exceeded.
+    """
+    if kind not in RENDERERS:
+        raise ValueError(f"Unknown render format: {kind}")
+    timeout = timeout or settings.RENDER_TIMEOUT_SECONDS
+    if deadline is not None:
+        timeout = deadline.timeout(timeout)
+
+    metrics = render_metrics
+    metrics.submitted += 1
+    metrics.in_flight += 1
+    metrics.peak_in_flight = max(metrics.peak_in_flight, metrics.in_flight)
+    if metrics.queue_depth:
+        logger.info(f"Render job queued behind {metrics.queue_depth - 1} others")
+
+    started = time.monotonic()
+    try:
+        content = await _submit_render(kind, deck_data(deck), deadline, timeout)
+    except TimeoutError:
+        metrics.timed_out += 1
+        raise
+    except Exception:
+        metrics.failed += 1
+        raise
+    finally:
+        metrics.in_flight -= 1
+
+    metrics.completed += 1
+    metrics.render_seconds += time.monotonic() - started
+    return content
@@ -0,0 +1,125 @@
+"""Map-reduce summarization of long uploaded documents."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from slideia.core.config import settings
+from slideia.core.logging import get_logger
+from slideia.domain.llm.budget import count_tokens
+from slideia.infra.cache import document_cache
+from slideia.infra.openrouter import OpenRouterLLM, llm_limiter
+from slideia.services.extraction import run_in_extraction_pool
+from slideia.services.ingest import compress_document, split_text_by_tokens
+from slideia.services.profiling import KEY_FIGURES_HEADING, extract_key_figures
+
+logger = get_logger(__name__)
+
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+
+async def summarize_long_document(
+    text: str,
+    llm: OpenRouterLLM,
+    on_progress: ProgressCallback | None = None,
+    chunk_tokens: int | None = None,
+    max_chunks: int | None = None,
+) -> str:
+    """Summarize a document of any length.
+
+    Short documents take a single ``summarize_document`` call. Longer ones are
+    split into token-bounded chunks that are summarized in parallel under the
+    global LLM limiter (map), and the section notes are then merged into the
+    final summary (reduce), recursing if the notes themselves are too large.
+
+    ``on_progress(done, total)`` is awaited after each map chunk completes.
+    """
+    chunk_tokens = chunk_tokens or settings.SUMMARY_CHUNK_TOKENS
+    max_chunks = max_chunks or settings.SUMMARY_MAX_CHUNKS
+
+    chunks = split_text_by_tokens(text, chunk_tokens)
+    if len(chunks) <= 1:
+        async with llm_limiter:
+            return await llm.summarize_document(text)
+
+    if len(chunks) > max_chunks:
+        logger.warning(f"Document split into {len(chunks)} chunks; summarizing the first {max_chunks}.")
+        chunks = chunks[:max_chunks]
+
+    total = len(chunks)
+    done = 0
+    logger.info(f"Map-reduce summarization over {total} chunks...")
+
+    async def summarize_chunk(index: int, chunk: str) -> str | None:
+        nonlocal done
+        try:
+            async with llm_limiter:
+                return await llm.summarize_chunk(chunk, index + 1, total)
+        except Exception as e:
+            logger.error(f"Chunk {index + 1}/{total} summarization failed, skipping: {e}")
+            return None
+        finally:
+            done += 1
+            if on_progress:
+                await on_progress(done, total)
+
+    results = await asyncio.gather(*(summarize_chunk(i, c) for i, c in enumerate(chunks)))
+    partials = [r for r in results if r]
+    if not partials:
+        raise RuntimeError("All document chunks failed to summarize.")
+
+    return await _reduce_summaries(partials, llm, chunk_tokens)
+
+
+async def summarize_reference(
+    text: str,
+    llm: OpenRouterLLM,
+    on_progress: ProgressCallback | None = None,
+) -> str:
+    """Summarize reference material, reusing the cached summary of identical text.
+
+    The text is compressed extractively first so fewer chunks reach the LLM.
+    Key figures from data briefs (profiled CSV/JSON uploads) are appended to the
+    summary verbatim so exact numbers survive for ``big_number`` slides.
+    """
+    digest = document_cache.digest(text)
+    cached = document_cache.get_summary(digest)
+    if cached is not None:
+        return cached
+
+    # Drop duplicate and low-information sentences locally before paying for LLM tokens
+    compressed, _ = await run_in_extraction_pool(compress_document, text, settings.EXTRACTIVE_CONTEXT_TOKENS)
+    summary = await summarize_long_document(compressed, llm, on_progress=on_progress)
+    key_figures = extract_key_figures(text)
+    if key_figures:
+        summary = f"{summary}\n\n{KEY_FIGURES_HEADING}\n" + "\n".join(key_figures)
+    document_cache.set_summary(digest, summary)
+    return summary
+
+
+async def _reduce_summaries(partials: list[str], llm: OpenRouterLLM, chunk_tokens: int) -> str:
+    """Combine section notes, grouping them into multiple reduce passes if they exceed a chunk."""
+    while len(partials) > 1 and count_tokens("\n\n".join(partials)) > chunk_tokens:
+        groups: list[list[str]] = [[]]
+        group_tokens = 0
+        for partial in partials:
+            tokens = count_tokens(partial)
+            if groups[-1] and group_tokens + tokens > chunk_tokens:
+                groups.append([])
+                group_tokens = 0
+            groups[-1].append(partial)
+            group_tokens += tokens
+
+        if len(groups) == len(partials):
+            # Every note is a group of its own; a further pass would not shrink anything
+            break
+
+        logger.info(f"Reducing {len(partials)} section notes in {len(groups)} groups...")
+
+        async def combine(group: list[str]) -> str:
+            async with llm_limiter:
+                return await llm.combine_summaries(group)
+
+        partials = list(await asyncio.gather(*(combine(g) for g in groups)))
+
+    async with llm_limiter:
+        return await llm.combine_summaries(partials)
@@ -0,0 +1,215 @@
+"""Background pre-processing of uploaded reference documents.
+
+Files uploaded ahead of a chat turn are extracted, indexed and summarized while
+the user is still typing; the chat request then only references their IDs and
+reuses the finished results.
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from typing import BinaryIO
+
+from slideia.core.config import settings
+from slideia.core.logging import get_logger
+from slideia.infra.cache import document_cache
+from slideia.infra.openrouter import OpenRouterLLM
+from slideia.services.extraction import extract_text, run_in_extraction_pool
+from slideia.services.ingest import DocumentIndex, DocumentSource, build_document_index, frame_document
+from slideia.services.summarize import summarize_reference
+
+logger = get_logger(__name__)
+
+
+class RegistryFullError(RuntimeError):
+    """Raised when every registry slot holds a document that is still being processed."""
+
+
+class SpooledUpload:
+    """Raw content of an uploaded file, written in chunks as it is read.
+
+    Content is kept in memory up to ``UPLOAD_SPOOL_THRESHOLD_BYTES`` and spooled
+    to a temporary file beyond that, so large files are extracted from disk by
+    path. The content digest is computed while writing. Call ``discard`` once
+    the content is no longer needed.
+    """
+
+    def __init__(self, filename: str, ext: str, threshold: int | None = None):
+        self.filename = filename
+        self.ext = ext
+        self.size = 0
+        self.path: str | None = None
+        self._threshold = threshold or settings.UPLOAD_SPOOL_THRESHOLD_BYTES
+        self._buffer = bytearray()
+        self._file: BinaryIO | None = None
+        self._hasher = document_cache.hasher()
+
+    @classmethod
+    def from_bytes(cls, filename: str, ext: str, content: bytes) -> "SpooledUpload":
+        upload = cls(filename, ext)
+        upload.write(content)
+        upload.close()
+        return upload
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        self._hasher.update(chunk)
+        if self._file is None and self.path is None and self.size > self._threshold:
+            fd, self.path = tempfile.mkstemp(prefix="slideia-upload-", suffix=f".{self.ext}")
+            self._file = os.fdopen(fd, "wb")
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+        if self._file is not None:
+            self._file.write(chunk)
+        else:
+            self._buffer.extend(chunk)
+
+    def close(self):
+        """Finish writing; the content is then readable through ``source``."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def digest(self) -> str:
+        return self._hasher.hexdigest()
+
+    @property
+    def source(self) -> DocumentSource:
+        """The spooled file's path, or the content itself while it is small."""
+        return self.path if self.path is not None else bytes(self._buffer)
+
+    def discard(self):
+        """Release the buffered content and delete the spooled file, if any."""
+        self.close()
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+        self._buffer = bytearray()
+
+
+class UploadedDocument:
+    """Processing state and results for one uploaded file."""
+
+    def __init__(self, filename: str):
+        self.file_id = uuid.uuid4().hex
+        self.filename = filename
+        # "processing" -> "summarizing" -> "ready" | "failed"
+        self.status = "processing"
+        self.text: str | None = None
+        self.truncated = False
+        self.summary: str | None = None
+        self.index: DocumentIndex | None = None
+        self.error: str | None = None
+        self.task: asyncio.Task | None = None
+        self.created_at = time.monotonic()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("ready", "failed")
+
+    @property
+    def framed_text(self) -> str:
+        return frame_document(self.filename, self.text or "")
+
+    def to_dict(self) -> dict:
+        return {
+            "file_id": self.file_id,
+            "filename": self.filename,
+            "status": self.status,
+            "truncated": self.truncated,
+            "has_summary": self.summary is not None,
+            "error": self.error,
+        }
+
+
+class UploadRegistry:
+    """In-process registry of uploaded documents and their background processing tasks."""
+
+    def __init__(
+        self,
+        llm: OpenRouterLLM,
+        ttl_seconds: int | None = None,
+        max_entries: int | None = None,
+        summary_concurrency: int | None = None,
+    ):
+        self._llm = llm
+        self._ttl_seconds = ttl_seconds or settings.UPLOAD_TTL_SECONDS
+        self._max_entries = max_entries or settings.UPLOAD_MAX_ENTRIES
+        self._documents: dict[str, UploadedDocument] = {}
+        self._summaries = asyncio.Semaphore(summary_concurrency or settings.UPLOAD_SUMMARY_CONCURRENCY)
+
+    def available(self) -> int:
+        """How many more uploads can be accepted now (finished documents make way for new ones)."""
+        self._evict()
+        in_flight = sum(not doc.done for doc in self._documents.values())
+        return self._max_entries - in_flight
+
+    def submit(self, upload: SpooledUpload) -> UploadedDocument:
+        """Register a file and start processing it in the background.
+
+        The registry takes ownership of ``upload`` and discards it once extracted.
+
+        Raises:
+            RegistryFullError: If ``UPLOAD_MAX_ENTRIES`` documents are still being processed.
+        """
+        if self.available() < 1:
+            upload.discard()
+            raise RegistryFullError(f"{self._max_entries} uploads are already being processed")
+        doc = UploadedDocument(upload.filename)
+        self._documents[doc.file_id] = doc
+        doc.task = asyncio.create_task(self._process(doc, upload))
+        logger.info(f"Accepted upload '{upload.filename}' ({upload.size} bytes) as {doc.file_id}")
+        return doc
+
+    def get(self, file_id: str) -> UploadedDocument | None:
+        return self._documents.get(file_id)
+
+    async def wait(self, file_id: str) -> UploadedDocument | None:
+        """Return the document once its processing has finished."""
+        doc = self._documents.get(file_id)
+        if doc is not None and doc.task is not None and not doc.task.done():
+            await asyncio.shield(doc.task)
+        return doc
+
+    async def _process(self, doc: UploadedDocument, upload: SpooledUpload):
+        try:
+            doc.text, doc.truncated = await extract_text(
+                upload.source, upload.ext, max_chars=settings.MAX_DOCUMENT_CHARS, digest=upload.digest
+            )
+            doc.index = await run_in_extraction_pool(
+                build_document_index, doc.framed_text, settings.RETRIEVAL_PASSAGE_TOKENS
+            )
+        except Exception as e:
+            logger.error(f"Failed to process upload {doc.file_id} ('{doc.filename}'): {e}")
+            doc.error = f"Failed to extract text from file '{doc.filename}': {e}"
+            doc.status = "failed"
+            return
+        finally:
+            upload.discard()
+
+        doc.status = "summarizing"
+        try:
+            async with self._summaries:
+                doc.summary = await summarize_reference(doc.framed_text, self._llm)
+        except Exception as e:
+            # The chat turn can still summarize (or compress) the text itself
+            logger.error(f"Background summarization failed for {doc.file_id}: {e}")
+        doc.status = "ready"
+        logger.info(f"Upload {doc.file_id} ready (summary={'yes' if doc.summary else 'no'})")
+
+    def _evict(self):
+        """Drop expired documents, then the oldest finished ones beyond the size cap."""
+        now = time.monotonic()
+        for file_id, doc in list(self._documents.items()):
+            if doc.done and now - doc.created_at > self._ttl_seconds:
+                del self._documents[file_id]
+
+        finished = [file_id for file_id, doc in self._documents.items() if doc.done]
+        while len(self._documents) >= self._max_entries and finished:
+            del self._documents[finished.pop(0)]
@@ -0,0 +1,90 @@
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from slideia.api import chat_routes
+from slideia.api.chat_routes import chat_router
+
+app = FastAPI()
+app.include_router(chat_router)
+
+
+@pytest.fixture
+def client():
+    # Keep one event loop alive across requests so background processing can finish
+    with TestClient(app) as client:
+        yield client
+
+
+def _wait_until_done(client, file_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = client.get(f"/chat/files/{file_id}").json()
+        if status["status"] in ("ready", "failed"):
+            return status
+        time.sleep(0.02)
+    raise AssertionError("upload processing did not finish")
+
+
+@patch("slideia.services.uploads.summarize_reference", new_callable=AsyncMock, return_value="summary")
+def test_upload_files_returns_ids_and_processes_in_background(mock_summarize, client):
+    response = client.post(
+        "/chat/files",
+        files=[
+            ("files", ("a.txt", b"First document.", "text/plain")),
+            ("files", ("b.md", b"# Second document", "text/markdown")),
+        ],
+    )
+
+    assert response.status_code == 202
+    files = response.json()["files"]
+    assert [f["filename"] for f in files] == ["a.txt", "b.md"]
+    assert all(f["file_id"] for f in files)
+
+    status = _wait_until_done(client, files[0]["file_id"])
+    assert status["status"] == "ready"
+    assert status["has_summary"] is True
+
+
+def test_upload_files_rejects_unsupported_type(client):
+    response = client.post("/chat/files", files=[("files", ("x.exe", b"MZ", "application/octet-stream"))])
+    assert response.status_code == 415
+
+
+def test_upload_files_rejects_file_over_size_limit(client, monkeypatch):
+    monkeypatch.setattr(chat_routes, "MAX_FILE_SIZE_BYTES", 10)
+    response = client.post("/chat/files", files=[("files", ("big.txt", b"x" * 11, "text/plain"))])
+    assert response.status_code == 413
+    assert "big.txt" in response.json()["detail"]
+
+
+def test_upload_files_rejects_total_over_size_limit(client, monkeypatch):
+    monkeypatch.setattr(chat_routes, "MAX_TOTAL_SIZE_BYTES", 15)
+    response = client.post(
+        "/chat/files",
+        files=[
+            ("files", ("a.txt", b"x" * 10, "text/plain")),
+            ("files", ("b.txt", b"y" * 10, "text/plain")),
+        ],
+    )
+    assert response.status_code == 413
+    assert "Total" in response.json()["detail"]
+
+
+def test_upload_files_rejects_batch_when_registry_is_full(client, monkeypatch):
+    monkeypatch.setattr(chat_routes.upload_registry, "available", lambda: 1)
+    response = client.post(
+        "/chat/files",
+        files=[
+            ("files", ("a.txt", b"a", "text/plain")),
+            ("files", ("b.txt", b"b", "text/plain")),
+        ],
+    )
+    assert response.status_code == 503
+
+
+def test_get_file_status_unknown_id(client):
+    response = client.get("/chat/files/does-not-exist")
+    assert response.status_code == 404
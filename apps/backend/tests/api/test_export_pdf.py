@@ -1,5 +1,6 @@
 import tempfile
-from unittest.mock import patch
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi import FastAPI
@@ -46,9 +47,13 @@ def full_deck_request():
 def test_export_pdf_success(client, full_deck_request, tmp_path):
     """Test successful export returns download URL and file using provided slides."""
     with (
-        patch("slideia.api.routes.ImageFetcher.fetch_image_url", return_value="http://fake.url/img.jpg"),
-        patch("slideia.api.routes.export_deck_to_pdf") as mock_export,
-        patch("slideia.core.config.settings") as mock_settings,
+        patch(
+            "slideia.infra.image_fetcher.ImageFetcher.fetch_image_urls",
+            return_value=["http://fake.url/img.jpg"],
+        ),
+        patch("slideia.infra.image_fetcher.ImageFetcher.download_image", return_value=b"img"),
+        patch("slideia.api.routes.render_deck", new_callable=AsyncMock, return_value=b"data") as mock_export,
+        patch("slideia.api.routes.settings") as mock_settings,
     ):
         mock_settings.DOWNLOADS_DIR = tmp_path
         response = client.post("/export-pdf", json=full_deck_request)
@@ -59,6 +64,10 @@ def test_export_pdf_success(client, full_deck_request, tmp_path):
         assert "filename" in data and data["filename"].endswith(".pdf")
         assert "Accessibility_in_AI" in data["filename"]
         mock_export.assert_called_once()
+        kind, deck = mock_export.call_args.args
+        assert kind == "pdf"
+        assert "notes" not in deck["slides"][0]
+        assert (tmp_path / data["filename"]).read_bytes() == b"data"
 
 
 def test_export_pdf_invalid_request(client):
@@ -69,13 +78,17 @@ def test_export_pdf_invalid_request(client):
 
 
 def test_export_pdf_export_error(client, full_deck_request):
-    """Test export_deck_to_pdf error returns 500."""
+    """Test render error returns 500."""
     with (
-        patch("slideia.api.routes.ImageFetcher.fetch_image_url", return_value="http://fake.url/img.jpg"),
-        patch("slideia.api.routes.export_deck_to_pdf", side_effect=Exception("Export fail")),
-        patch("slideia.core.config.settings") as mock_settings,
+        patch(
+            "slideia.infra.image_fetcher.ImageFetcher.fetch_image_urls",
+            return_value=["http://fake.url/img.jpg"],
+        ),
+        patch("slideia.infra.image_fetcher.ImageFetcher.download_image", return_value=b"img"),
+        patch("slideia.api.routes.render_deck", side_effect=Exception("Export fail")),
+        patch("slideia.api.routes.settings") as mock_settings,
     ):
-        mock_settings.DOWNLOADS_DIR = tempfile.gettempdir()
+        mock_settings.DOWNLOADS_DIR = Path(tempfile.gettempdir())
         response = client.post("/export-pdf", json=full_deck_request)
         assert response.status_code == 500
         assert response.json()["detail"].startswith("Oops! Something went wrong")
@@ -85,8 +98,8 @@ def test_export_pdf_empty_slides(client, full_deck_request, tmp_path):
     """Test export with empty slides list."""
     full_deck_request["slides"] = []
     with (
-        patch("slideia.api.routes.export_deck_to_pdf") as mock_export,
-        patch("slideia.core.config.settings") as mock_settings,
+        patch("slideia.api.routes.render_deck", new_callable=AsyncMock, return_value=b"data") as mock_export,
+        patch("slideia.api.routes.settings") as mock_settings,
     ):
         mock_settings.DOWNLOADS_DIR = tmp_path
         response = client.post("/export-pdf", json=full_deck_request)
@@ -1,5 +1,6 @@
 import tempfile
-from unittest.mock import patch
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi import FastAPI
@@ -45,9 +46,13 @@ def full_deck_request():
 def test_export_pptx_success(client, full_deck_request, tmp_path):
     """Test successful export returns download URL and file using provided slides."""
     with (
-        patch("slideia.api.routes.ImageFetcher.fetch_image_url", return_value="http://fake.url/img.jpg"),
-        patch("slideia.api.routes.export_slides") as mock_export,
-        patch("slideia.core.config.settings") as mock_settings,
+        patch(
+            "slideia.infra.image_fetcher.ImageFetcher.fetch_image_urls",
+            return_value=["http://fake.url/img.jpg"],
+        ),
+        patch("slideia.infra.image_fetcher.ImageFetcher.download_image", return_value=b"img"),
+        patch("slideia.api.routes.render_deck", new_callable=AsyncMock, return_value=b"data") as mock_export,
+        patch("slideia.api.routes.settings") as mock_settings,
     ):
         mock_settings.DOWNLOADS_DIR = tmp_path
         response = client.post("/export-pptx", json=full_deck_request)
@@ -58,6 +63,12 @@ def test_export_pptx_success(client, full_deck_request, tmp_path):
         assert "filename" in data and data["filename"].endswith(".pptx")
         assert "Accessibility_in_AI" in data["filename"]
         mock_export.assert_called_once()
+        kind, deck = mock_export.call_args.args
+        assert kind == "pptx"
+        assert deck["slides"][0]["notes"] == "Speaker notes here"
+        assert deck["slides"][0]["image_url"] == "http://fake.url/img.jpg"
+        assert deck["slides"][0]["image_data"] == b"img"
+        assert (tmp_path / data["filename"]).read_bytes() == b"data"
 
 
 def test_export_pptx_invalid_request(client):
@@ -69,24 +80,44 @@ def test_export_pptx_invalid_request(client):
 
 
 def test_export_pptx_export_error(client, full_deck_request):
-    """Test export_slides error returns 500."""
+    """Test render error returns 500."""
     with (
-        patch("slideia.api.routes.ImageFetcher.fetch_image_url", return_value="http://fake.url/img.jpg"),
-        patch("slideia.api.routes.export_slides", side_effect=Exception("Export fail")),
-        patch("slideia.core.config.settings") as mock_settings,
+        patch(
+            "slideia.infra.image_fetcher.ImageFetcher.fetch_image_urls",
+            return_value=["http://fake.url/img.jpg"],
+        ),
+        patch("slideia.infra.image_fetcher.ImageFetcher.download_image", return_value=b"img"),
+        patch("slideia.api.routes.render_deck", side_effect=Exception("Export fail")),
+        patch("slideia.api.routes.settings") as mock_settings,
     ):
-        mock_settings.DOWNLOADS_DIR = tempfile.gettempdir()
+        mock_settings.DOWNLOADS_DIR = Path(tempfile.gettempdir())
         response = client.post("/export-pptx", json=full_deck_request)
         assert response.status_code == 500
         assert response.json()["detail"].startswith("Oops! Something went wrong")
 
 
+def test_export_pptx_render_timeout(client, full_deck_request):
+    """Test a render that exceeds its timeout returns 504."""
+    with (
+        patch(
+            "slideia.infra.image_fetcher.ImageFetcher.fetch_image_urls",
+            return_value=["http://fake.url/img.jpg"],
+        ),
+        patch("slideia.infra.image_fetcher.ImageFetcher.download_image", return_value=b"img"),
+        patch("slideia.api.routes.render_deck", side_effect=TimeoutError("Rendering took longer than 60s")),
+        patch("slideia.api.routes.settings") as mock_settings,
+    ):
+        mock_settings.DOWNLOADS_DIR = Path(tempfile.gettempdir())
+        response = client.post("/export-pptx", json=full_deck_request)
+        assert response.status_code == 504
+
+
 def test_export_pptx_empty_slides(client, full_deck_request, tmp_path):
     """Test export with empty slides list."""
     full_deck_request["slides"] = []
     with (
-        patch("slideia.api.routes.export_slides") as mock_export,
-        patch("slideia.core.config.settings") as mock_settings,
+        patch("slideia.api.routes.render_deck", new_callable=AsyncMock, return_value=b"data") as mock_export,
+        patch("slideia.api.routes.settings") as mock_settings,
     ):
         mock_settings.DOWNLOADS_DIR = tmp_path
         response = client.post("/export-pptx", json=full_deck_request)
@@ -100,9 +131,13 @@ def test_export_pptx_special_characters_topic(client, full_deck_request, tmp_pat
     """Test topic with special characters is sanitized in filename."""
     full_deck_request["topic"] = "AI: The Future? *Yes!*"
     with (
-        patch("slideia.api.routes.ImageFetcher.fetch_image_url", return_value="http://fake.url/img.jpg"),
-        patch("slideia.api.routes.export_slides") as mock_export,
-        patch("slideia.core.config.settings") as mock_settings,
+        patch(
+            "slideia.infra.image_fetcher.ImageFetcher.fetch_image_urls",
+            return_value=["http://fake.url/img.jpg"],
+        ),
+        patch("slideia.infra.image_fetcher.ImageFetcher.download_image", return_value=b"img"),
+        patch("slideia.api.routes.render_deck", new_callable=AsyncMock, return_value=b"data") as mock_export,
+        patch("slideia.api.routes.settings") as mock_settings,
     ):
         mock_settings.DOWNLOADS_DIR = tmp_path
         response = client.post("/export-pptx", json=full_deck_request)
@@ -1,10 +1,12 @@
+import asyncio
 import json
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from slideia.api.routes import router
+from slideia.api.streaming import stream_progress_events
 
 app = FastAPI()
 app.include_router(router)
@@ -76,3 +78,27 @@ def test_generate_deck_stream_error(client, deck_request):
 
         assert any(e["step"] == "error" for e in events)
         assert any("Stream failed" in e["message"] for e in events if e["step"] == "error")
+
+
+@pytest.mark.asyncio
+async def test_stream_progress_events_cancels_producer_on_disconnect():
+    """A client disconnect must cancel the service generator mid-await."""
+    cancelled = asyncio.Event()
+
+    async def slow_stream():
+        yield {"step": "outline", "progress": 10, "message": "Outline..."}
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        yield {"step": "complete", "progress": 100}
+
+    request = MagicMock()
+    request.is_disconnected = AsyncMock(side_effect=[False, True])
+
+    lines = [line async for line in stream_progress_events(request, slow_stream())]
+
+    assert len(lines) == 1
+    assert json.loads(lines[0][6:])["step"] == "outline"
+    assert cancelled.is_set()
@@ -0,0 +1,59 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from slideia.api.limits import BodySizeLimitMiddleware
+
+app = FastAPI()
+app.add_middleware(BodySizeLimitMiddleware, max_body_bytes=100, path_prefix="/upload")
+
+
+@app.post("/upload")
+async def upload(request: Request):
+    return {"size": len(await request.body())}
+
+
+@app.post("/other")
+async def other(request: Request):
+    return {"size": len(await request.body())}
+
+
+client = TestClient(app)
+
+
+def test_body_within_limit_is_accepted():
+    response = client.post("/upload", content=b"x" * 100)
+    assert response.status_code == 200
+    assert response.json() == {"size": 100}
+
+
+def test_body_over_content_length_is_rejected():
+    response = client.post("/upload", content=b"x" * 101)
+    assert response.status_code == 413
+
+
+def test_chunked_body_is_rejected_once_limit_is_crossed():
+    def chunks():
+        for _ in range(10):
+            yield b"x" * 30
+
+    response = client.post("/upload", content=chunks())
+    assert response.status_code == 413
+
+
+def test_other_paths_are_not_limited():
+    response = client.post("/other", content=b"x" * 1000)
+    assert response.status_code == 200
+
+
+def test_app_rejection_carries_cors_headers():
+    from slideia.core.config import settings
+    from slideia.main import MAX_REQUEST_BODY_BYTES
+    from slideia.main import app as slideia_app
+
+    response = TestClient(slideia_app).post(
+        "/api/v1/chat/files",
+        content=b"x" * (MAX_REQUEST_BODY_BYTES + 1),
+        headers={"Origin": settings.NEXT_FRONTEND_URL},
+    )
+
+    assert response.status_code == 413
+    assert response.headers["access-control-allow-origin"] == settings.NEXT_FRONTEND_URL
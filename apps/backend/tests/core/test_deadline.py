@@ -0,0 +1,37 @@
+from unittest.mock import patch
+
+from slideia.core.deadline import Deadline
+
+
+def test_deadline_from_header_uses_default_when_missing():
+    deadline = Deadline.from_header(None, default_seconds=30, max_seconds=300)
+    assert deadline.budget == 30
+
+
+def test_deadline_from_header_parses_and_clamps():
+    assert Deadline.from_header("12.5", default_seconds=30, max_seconds=300).budget == 12.5
+    assert Deadline.from_header("9999", default_seconds=30, max_seconds=300).budget == 300
+
+
+def test_deadline_from_header_ignores_invalid_values():
+    assert Deadline.from_header("soon", default_seconds=30, max_seconds=300).budget == 30
+    assert Deadline.from_header("-5", default_seconds=30, max_seconds=300).budget == 30
+    assert Deadline.from_header("nan", default_seconds=30, max_seconds=300).budget == 30
+    assert Deadline.from_header("inf", default_seconds=30, max_seconds=300).budget == 30
+
+
+def test_deadline_remaining_and_timeout():
+    with patch("slideia.core.deadline.time.monotonic", return_value=100.0):
+        deadline = Deadline(10)
+
+    with patch("slideia.core.deadline.time.monotonic", return_value=104.0):
+        assert deadline.remaining() == 6.0
+        assert deadline.timeout(5.0) == 5.0
+        assert deadline.timeout(10.0) == 6.0
+        assert deadline.has_time(6.0)
+        assert not deadline.expired()
+
+    with patch("slideia.core.deadline.time.monotonic", return_value=111.0):
+        assert deadline.remaining() == 0.0
+        assert deadline.expired()
+        assert not deadline.has_time(1.0)
@@ -1,10 +1,11 @@
 import json
 import os
 import tempfile
+from unittest.mock import patch
 
 import pytest
 from pptx import Presentation
-from slideia.domain.deck.exporter import export_slides
+from slideia.domain.deck.exporter import TEMPLATE_PATH, export_slides, prepared_template, render_pptx
 
 
 @pytest.fixture
@@ -86,20 +87,28 @@ async def test_export_slides_missing_input_raises(temp_output_file):
 
 @pytest.mark.asyncio
 async def test_export_slides_missing_template_creates_it(temp_json_file, temp_output_file, clean_templates):
-    # Remove template if exists
-    # Match the template path logic in exporter.py
-    exporter_dir = os.path.abspath(
-        os.path.join(os.path.dirname(__file__), "../../../src/slideia/domain/deck")
-    )
-    template_dir = os.path.join(exporter_dir, "templates")
-    template_path = os.path.join(template_dir, "base_template.pptx")
-    if os.path.exists(template_path):
-        os.remove(template_path)
+    if os.path.exists(TEMPLATE_PATH):
+        os.remove(TEMPLATE_PATH)
+    prepared_template.cache_clear()
     await export_slides(temp_json_file, temp_output_file)
-    assert os.path.exists(template_path)
+    assert os.path.exists(TEMPLATE_PATH)
     assert os.path.exists(temp_output_file)
 
 
+def test_prepared_template_is_built_once_without_slides(clean_templates):
+    prepared_template.cache_clear()
+    template = prepared_template()
+
+    with patch("slideia.domain.deck.exporter.Presentation") as mock_presentation:
+        assert prepared_template() is template
+        mock_presentation.assert_not_called()
+
+    first, second = template.open(), template.open()
+    assert first is not second
+    assert len(first.slides) == 0
+    assert "blank" in first.slide_layouts[template.blank_layout_index].name.lower()
+
+
 @pytest.mark.asyncio
 async def test_export_slides_handles_type_mismatches(temp_output_file, clean_templates):
     # theme as string, bullets as string, title as int, notes as int
@@ -190,3 +199,16 @@ async def test_export_slides_layouts(temp_output_file, clean_templates):
         assert prs.slides[3].shapes[0].text_frame.text == "Big Number Slide"
     finally:
         os.remove(path)
+
+
+@pytest.mark.asyncio
+async def test_render_pptx_in_memory_from_model(minimal_json_slide, clean_templates):
+    from slideia.api.schemas import FullDeckExportRequest
+
+    request = FullDeckExportRequest(topic="Testing", audience="QA", **minimal_json_slide)
+    buffer = await render_pptx(request)
+
+    assert buffer.tell() == 0
+    prs = Presentation(buffer)
+    assert len(prs.slides) == 3
+    assert prs.slides[0].shapes.title.text == "Test Presentation"
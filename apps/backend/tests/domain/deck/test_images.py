@@ -0,0 +1,237 @@
+import asyncio
+import random
+from io import BytesIO
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from PIL import Image
+from pptx import Presentation
+from slideia.domain.deck import images
+from slideia.domain.deck.exporter import render_pptx
+from slideia.domain.deck.images import (
+    PPTX_IMAGE_BOX,
+    ImagePrefetcher,
+    attach_slide_images,
+    prepare_image,
+    shows_image,
+)
+from slideia.domain.deck.pdf_exporter import render_pdf
+from slideia.infra.cache import ImageCache
+
+
+def _png() -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (16, 9), "navy").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _photo(size=(2000, 1200), mode="RGB", format="JPEG") -> bytes:
+    """A noisy image that doesn't compress away to nothing."""
+    rng = random.Random(0)
+    image = Image.frombytes(mode, size, rng.randbytes(size[0] * size[1] * len(mode)))
+    buffer = BytesIO()
+    image.save(buffer, format=format, quality=95) if format == "JPEG" else image.save(buffer, format=format)
+    return buffer.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def local_image_cache(tmp_path):
+    with patch.object(images, "image_cache", ImageCache(root=tmp_path)):
+        yield
+
+
+class SlowFetcher:
+    """Fake fetcher that records how many downloads run at once."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.fetch_image_urls = AsyncMock(side_effect=lambda query, deadline=None: [f"http://img/{query}"])
+
+    async def download_image(self, url, deadline=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return url.encode()
+
+
+def test_shows_image_only_for_image_layouts_with_content():
+    assert shows_image({"image_prompt": "a chart"})
+    assert shows_image({"layout": "bullets", "image_url": "http://img/x"})
+    assert not shows_image({"layout": "bullets", "image_prompt": "   "})
+    assert not shows_image({"layout": "statement", "image_prompt": "a chart"})
+    assert not shows_image({"layout": "big_number", "image_url": "http://img/x"})
+
+
+@pytest.mark.asyncio
+async def test_attach_slide_images_skips_slides_without_image_slot():
+    slides = [
+        {"layout": "bullets", "image_prompt": "team"},
+        {"layout": "quote", "image_prompt": "ignored"},
+        {"layout": "bullets", "image_prompt": ""},
+    ]
+    fetcher = SlowFetcher()
+
+    assert await attach_slide_images(slides, fetcher=fetcher) == 1
+
+    fetcher.fetch_image_urls.assert_awaited_once_with("team", deadline=None)
+    assert slides[0]["image_url"] == "http://img/team"
+    assert slides[0]["image_data"] == b"http://img/team"
+    assert "image_data" not in slides[1] and "image_data" not in slides[2]
+
+
+@pytest.mark.asyncio
+async def test_attach_slide_images_runs_concurrently_within_limit():
+    slides = [{"image_prompt": f"p{i}"} for i in range(8)]
+    fetcher = SlowFetcher(delay=0.1)
+
+    started = asyncio.get_running_loop().time()
+    assert await attach_slide_images(slides, fetcher=fetcher, concurrency=4) == 8
+    elapsed = asyncio.get_running_loop().time() - started
+
+    assert fetcher.peak == 4
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_attach_slide_images_shares_one_search_between_similar_prompts():
+    slides = [
+        {"image_prompt": "A chart of sales"},
+        {"image_prompt": "Sales charts"},
+        {"image_prompt": "chart showing sales."},
+        {"image_prompt": "Team photo"},
+    ]
+    fetcher = SlowFetcher()
+    fetcher.fetch_image_urls = AsyncMock(
+        side_effect=lambda query, deadline=None: [f"http://img/{query}/{i}" for i in range(2)]
+    )
+
+    assert await attach_slide_images(slides, fetcher=fetcher) == 4
+
+    assert fetcher.fetch_image_urls.await_count == 2
+    urls = [slide["image_url"] for slide in slides]
+    assert urls[:3] == [
+        "http://img/A chart of sales/0",
+        "http://img/A chart of sales/1",
+        "http://img/A chart of sales/0",
+    ]
+    assert urls[3] == "http://img/Team photo/0"
+
+
+@pytest.mark.asyncio
+async def test_attach_slide_images_without_search_only_downloads_urls():
+    slides = [{"image_url": "http://img/given"}, {"image_prompt": "needs search"}]
+    fetcher = SlowFetcher()
+
+    assert await attach_slide_images(slides, search=False, fetcher=fetcher) == 1
+
+    fetcher.fetch_image_urls.assert_not_awaited()
+    assert slides[0]["image_data"] == b"http://img/given"
+
+
+@pytest.mark.asyncio
+async def test_attach_slide_images_leaves_failed_slides_for_placeholder():
+    slides = [{"image_prompt": "missing"}]
+    fetcher = MagicMock()
+    fetcher.fetch_image_urls = AsyncMock(return_value=[])
+
+    assert await attach_slide_images(slides, fetcher=fetcher) == 0
+    assert slides == [{"image_prompt": "missing"}]
+
+
+@pytest.mark.asyncio
+async def test_render_pptx_embeds_prefetched_image_bytes():
+    deck = {
+        "title": "Images",
+        "slides": [{"title": "Pic", "bullets": ["One"], "image_prompt": "navy", "image_data": _png()}],
+    }
+
+    prs = Presentation(await render_pptx(deck))
+
+    pictures = [shape for shape in prs.slides[1].shapes if shape.shape_type == 13]
+    assert len(pictures) == 1
+
+
+def test_prepare_image_downscales_to_cover_slot_at_target_dpi():
+    original = _photo()
+
+    processed = prepare_image(original, (2.0, 1.0), dpi=100, quality=75)
+
+    image = Image.open(BytesIO(processed))
+    assert image.format == "JPEG"
+    assert image.size == (200, 120)
+    assert len(processed) < len(original)
+
+
+def test_prepare_image_keeps_transparency_as_png():
+    processed = prepare_image(_photo((800, 800), mode="RGBA", format="PNG"), (1.0, 1.0), dpi=100)
+
+    image = Image.open(BytesIO(processed))
+    assert image.format == "PNG"
+    assert image.mode == "RGBA"
+    assert image.size == (100, 100)
+
+
+def test_prepare_image_caches_variant_by_source_and_size():
+    original = _photo()
+    first = prepare_image(original, PPTX_IMAGE_BOX)
+
+    with patch.object(images, "_transcode", return_value=b"small") as mock_transcode:
+        assert prepare_image(original, PPTX_IMAGE_BOX) == first
+        mock_transcode.assert_not_called()
+        prepare_image(original, (1.0, 1.0))
+        mock_transcode.assert_called_once()
+
+
+def test_prepare_image_returns_undecodable_data_unchanged():
+    assert prepare_image(b"not an image", PPTX_IMAGE_BOX) == b"not an image"
+
+
+@pytest.mark.asyncio
+async def test_render_pdf_embeds_identical_images_once():
+    photo = prepare_image(_photo(), PPTX_IMAGE_BOX)
+    deck = {
+        "title": "Images",
+        "slides": [{"title": f"Slide {i}", "bullets": ["x"], "image_data": photo} for i in range(3)],
+    }
+
+    content = (await render_pdf(deck)).getvalue()
+
+    assert content.count(b"/Subtype /Image") == 1
+
+
+@pytest.mark.asyncio
+async def test_image_prefetcher_resolves_and_downloads_in_background():
+    slides = [
+        {"title": "A", "image_prompt": "solar panels"},
+        {"title": "B", "layout": "statement", "image_prompt": "ignored"},
+        {"title": "C", "image_prompt": "Solar panel"},
+    ]
+    fetcher = SlowFetcher(delay=0)
+    fetcher.fetch_image_urls = AsyncMock(return_value=["http://img/1", "http://img/2"])
+    fetcher.download_image = AsyncMock(return_value=b"bytes")
+    prefetcher = ImagePrefetcher(fetcher=fetcher, concurrency=1)
+
+    prefetcher.add(slides)
+    assert prefetcher.attach() == 0
+    await asyncio.sleep(0.01)
+
+    assert prefetcher.attach() == 2
+    prefetcher.detach()
+    assert [slide.get("image_url") for slide in slides] == ["http://img/1", None, "http://img/2"]
+    assert fetcher.download_image.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_image_prefetcher_cancel_stops_outstanding_lookups():
+    fetcher = SlowFetcher(delay=1)
+    prefetcher = ImagePrefetcher(fetcher=fetcher)
+
+    prefetcher.add([{"image_prompt": "slow"}])
+    await asyncio.sleep(0.01)
+    await prefetcher.cancel()
+
+    assert prefetcher.attach() == 1
+    assert fetcher.active == 1  # interrupted mid-download
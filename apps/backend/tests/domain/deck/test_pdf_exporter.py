@@ -2,7 +2,16 @@ import json
 import os
 import pytest
 from unittest.mock import patch, MagicMock
-from slideia.domain.deck.pdf_exporter import export_deck_to_pdf
+from io import BytesIO
+from pypdf import PdfReader
+from reportlab import rl_config
+from slideia.domain.deck.pdf_exporter import (
+    THEME_DEFAULTS,
+    _palette_key,
+    export_deck_to_pdf,
+    pdf_theme,
+    render_pdf,
+)
 
 
 @pytest.fixture
@@ -114,3 +123,43 @@ async def test_export_deck_to_pdf_layouts(tmp_path):
     await export_deck_to_pdf(input_path, output_pdf)
     assert os.path.exists(output_pdf)
     assert os.path.getsize(output_pdf) > 0
+
+
+@pytest.mark.asyncio
+async def test_render_pdf_into_stream():
+    deck = {"title": "In memory", "slides": [{"title": "Slide 1", "summary": "S", "bullets": ["B"]}]}
+    output = BytesIO()
+
+    result = await render_pdf(deck, output)
+
+    assert result is output
+    assert output.getvalue().startswith(b"%PDF")
+
+
+def test_pdf_theme_is_built_once_per_palette():
+    theme = pdf_theme(_palette_key(["#112233", "#445566", "#ignored"]))
+
+    assert pdf_theme(_palette_key(["#112233", "#445566"])) is theme
+    assert theme.styles["Bullet"].textColor == THEME_DEFAULTS["text"]
+    assert theme.styles["QuoteAttr"].textColor.hexval() == "0x445566"
+    assert pdf_theme(_palette_key(["not a colour", 7]))["secondary"] == THEME_DEFAULTS["secondary"]
+
+
+@pytest.mark.asyncio
+async def test_render_pdf_draws_page_chrome_as_one_form():
+    deck = {
+        "title": "Chrome",
+        "slides": [{"title": f"Slide {i}", "bullets": ["B"]} for i in range(12)],
+        "citations": ["Ref"],
+    }
+
+    content = (await render_pdf(deck)).getvalue()
+
+    assert content.count(b"/Subtype /Form") == 1
+    assert b"ASCII85Decode" not in content
+    assert rl_config.useA85
+    pages = PdfReader(BytesIO(content)).pages
+    assert len(pages) == 14
+    assert "/XObject" not in pages[0]["/Resources"]
+    assert all(b"/FormXob.SlideChrome Do" in page.get_contents().get_data() for page in pages[1:])
+    assert "References" in pages[-1].extract_text()
@@ -0,0 +1,108 @@
+import zipfile
+from io import BytesIO
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from PIL import Image
+from pptx import Presentation
+from slideia.domain.deck.exporter import render_pptx
+
+
+def _png(color="navy") -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (16, 9), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+DECK = {
+    "title": "Every Layout",
+    "subtitle": "Engine parity",
+    "font": "Arial",
+    "palette": ["#11aa33"],
+    "citations": ["Source & one", 2],
+    "slides": [
+        {
+            "title": "Bullets\nsecond line",
+            "summary": "Summary line\nanother",
+            "bullets": ["a & b\vbreak", "- dash", 3],
+            "notes": "Notes <1>\n\nafter blank",
+            "image_prompt": "navy",
+            "image_data": _png(),
+        },
+        {
+            "title": 5,
+            "bullets": "one\ntwo",
+            "image_prompt": "unavailable",
+            "image_url": "http://img/missing",
+            "theme": {"font": 'Times "New"', "color": "#zzzzzz"},
+        },
+        {"title": "Same image", "bullets": [], "image_data": _png(), "notes": "reused"},
+        {"title": "Broken image", "image_data": b"not an image", "image_prompt": "broken <img>"},
+        {"title": "Statement", "layout": "statement", "statement": "Ring\x07the bell", "notes": "s"},
+        {"title": "Empty statement", "layout": "statement"},
+        {"title": "Number", "layout": "big_number", "big_number": 42, "big_number_context": "ctx"},
+        {"title": "Default number", "layout": "big_number", "summary": "fallback"},
+        {
+            "title": "Columns",
+            "layout": "two_column",
+            "column_left_title": "Left",
+            "column_left": ["x", "▪ y"],
+            "column_right": ["z"],
+        },
+        {"title": "Empty columns", "layout": "two_column"},
+        {"title": "Steps", "layout": "steps", "steps": ["one", 2, " three "]},
+        {"title": "Quote", "layout": "quote", "quote_text": "q", "quote_attribution": "me"},
+        {"title": "Attribution", "layout": "quote", "quote_attribution": "only"},
+        {"layout": "", "summary": "no title", "theme": {"color": "#abcdef"}},
+    ],
+}
+
+
+async def _render(deck, engine) -> dict[str, bytes]:
+    with patch("slideia.infra.image_fetcher.ImageFetcher.download_image", AsyncMock(return_value=None)):
+        content = await render_pptx(deck, engine=engine)
+    with zipfile.ZipFile(content) as package:
+        return {name: package.read(name) for name in package.namelist()}
+
+
+@pytest.mark.asyncio
+async def test_xml_engine_matches_python_pptx_part_for_part():
+    expected = await _render(DECK, "python-pptx")
+    written = await _render(DECK, "xml")
+
+    assert list(written) == list(expected)
+    for name, content in expected.items():
+        assert written[name] == content, name
+
+
+@pytest.mark.asyncio
+async def test_xml_engine_shares_identical_images():
+    parts = await _render(DECK, "xml")
+
+    assert [name for name in parts if name.startswith("ppt/media/")] == ["ppt/media/image1.png"]
+
+
+@pytest.mark.asyncio
+async def test_xml_engine_large_deck_opens():
+    deck = {
+        "title": "Large",
+        "slides": [
+            {"title": f"Slide {i}", "bullets": [f"Point {j}" for j in range(5)], "notes": f"Notes {i}"}
+            for i in range(150)
+        ],
+    }
+
+    prs = Presentation(await render_pptx(deck, engine="xml"))
+
+    assert len(prs.slides) == 151
+    assert prs.slides[150].shapes[0].text_frame.text == "Slide 149"
+    assert prs.slides[150].notes_slide.notes_text_frame.text == "Notes 149"
+
+
+@pytest.mark.asyncio
+async def test_unknown_engine_falls_back_to_python_pptx():
+    with patch("slideia.domain.deck.exporter.write_content_slides") as mock_write:
+        prs = Presentation(await render_pptx({"title": "T", "slides": [{"title": "S"}]}, engine="odf"))
+
+    mock_write.assert_not_called()
+    assert len(prs.slides) == 2
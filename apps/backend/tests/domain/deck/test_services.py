@@ -1,6 +1,8 @@
+import asyncio
 import os
 
 import pytest
+from slideia.core.deadline import Deadline
 from slideia.domain.deck.models import Deck, Slide
 from slideia.domain.deck.services import create_minimal_template, generate_full_deck
 
@@ -175,3 +177,19 @@ async def test_generate_full_deck_batch_failure_resilience():
     assert isinstance(deck, Deck)
     # Slides should be empty because the only batch failed
     assert len(deck.slides) == 0
+
+
+@pytest.mark.asyncio
+async def test_generate_full_deck_outline_deadline_exceeded():
+    """An outline that cannot finish within the deadline raises a TimeoutError."""
+
+    class SlowOutlineLLM(DummyLLM):
+        async def propose_outline(self, *args, **kwargs):
+            await asyncio.sleep(60)
+
+    cache = DummyCache()
+    with pytest.raises(TimeoutError, match="Outline generation exceeded"):
+        await generate_full_deck(
+            "topic", "audience", "tone", 2, SlowOutlineLLM(), cache, deadline=Deadline(0.05)
+        )
+    assert not cache.set_called
@@ -1,5 +1,8 @@
+import asyncio
+
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
+from slideia.core.deadline import Deadline
 from slideia.domain.deck.services import generate_full_deck_stream, propose_outline_stream
 
 
@@ -45,6 +48,48 @@ async def test_generate_full_deck_stream_success(mock_llm, mock_cache):
     mock_cache.set.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_generate_full_deck_stream_prefetches_images_speculatively(mock_llm, mock_cache):
+    mock_llm.propose_outline.return_value = {"slides": [{"title": "Slide 1"}]}
+    drafted = [{"bullets": ["B1"], "image_prompt": "P1", "title": "Slide 1"}]
+    mock_llm.draft_slides_batch.return_value = {"slides": drafted}
+
+    with (
+        patch("slideia.domain.deck.services.settings.SPECULATIVE_IMAGE_PREFETCH", True),
+        patch("slideia.domain.deck.services.ImagePrefetcher") as mock_prefetcher,
+    ):
+        events = [
+            event async for event in generate_full_deck_stream("T", "A", "Tone", 1, mock_llm, mock_cache)
+        ]
+
+    images = mock_prefetcher.return_value
+    images.add.assert_called_once_with(drafted)
+    images.attach.assert_called_once()
+    images.detach.assert_called_once()
+    images.cancel.assert_not_called()
+    assert events[-1]["step"] == "complete"
+
+
+@pytest.mark.asyncio
+async def test_generate_full_deck_stream_cancels_prefetch_when_consumer_leaves(mock_llm, mock_cache):
+    mock_llm.propose_outline.return_value = {"slides": [{"title": "Slide 1"}]}
+    mock_llm.draft_slides_batch.return_value = {"slides": [{"title": "Slide 1", "image_prompt": "P1"}]}
+
+    with (
+        patch("slideia.domain.deck.services.settings.SPECULATIVE_IMAGE_PREFETCH", True),
+        patch("slideia.domain.deck.services.ImagePrefetcher") as mock_prefetcher,
+    ):
+        mock_prefetcher.return_value.cancel = AsyncMock()
+        stream = generate_full_deck_stream("T", "A", "Tone", 1, mock_llm, mock_cache)
+        async for event in stream:
+            if event["step"] == "slide":
+                break
+        await stream.aclose()
+
+    mock_prefetcher.return_value.cancel.assert_awaited_once()
+    mock_prefetcher.return_value.detach.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_generate_full_deck_stream_cache_hit(mock_llm, mock_cache):
     mock_cache.get.return_value = {"outline": {"title": "Cached"}, "slides": []}
@@ -72,3 +117,67 @@ async def test_propose_outline_stream_success(mock_llm, mock_cache):
     assert all(e["step"] == "outline" for e in events[:3])
     assert events[3]["step"] == "complete"
     assert events[3]["data"]["title"] == "New Outline"
+
+
+@pytest.mark.asyncio
+async def test_generate_full_deck_stream_cancels_pending_batches_on_close(mock_llm, mock_cache):
+    """Closing the stream early must cancel batches that are still waiting on the LLM."""
+    mock_llm.propose_outline.return_value = {
+        "title": "Cancel Test",
+        "slides": [{"title": f"Slide {i}", "summary": "S"} for i in range(6)],
+    }
+
+    first_batch_done = asyncio.Event()
+    cancelled = []
+
+    async def draft(topic, audience, batch, theme_instruction="Default"):
+        if batch[0]["title"] == "Slide 0":
+            first_batch_done.set()
+            return {"slides": [{"title": s["title"], "bullets": []} for s in batch]}
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(batch[0]["title"])
+            raise
+        return {"slides": []}
+
+    mock_llm.draft_slides_batch.side_effect = draft
+
+    stream = generate_full_deck_stream("T", "A", "Tone", 6, mock_llm, mock_cache)
+    async for event in stream:
+        if event["step"] == "slide":
+            break
+    await stream.aclose()
+
+    assert first_batch_done.is_set()
+    assert cancelled == ["Slide 3"]
+    mock_cache.set.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_generate_full_deck_stream_returns_partial_deck_on_deadline(mock_llm, mock_cache):
+    """Batches still running when the deadline expires are dropped, not awaited."""
+    mock_llm.propose_outline.return_value = {
+        "title": "Deadline Test",
+        "slides": [{"title": f"Slide {i}", "summary": "S"} for i in range(6)],
+    }
+
+    async def draft(topic, audience, batch, theme_instruction="Default"):
+        if batch[0]["title"] != "Slide 0":
+            await asyncio.sleep(60)
+        return {"slides": [{"title": s["title"], "bullets": []} for s in batch]}
+
+    mock_llm.draft_slides_batch.side_effect = draft
+
+    events = [
+        e
+        async for e in generate_full_deck_stream(
+            "T", "A", "Tone", 6, mock_llm, mock_cache, deadline=Deadline(0.2)
+        )
+    ]
+
+    complete = events[-1]
+    assert complete["step"] == "complete"
+    assert complete["partial"] is True
+    assert [s["title"] for s in complete["data"]["slides"]] == ["Slide 0", "Slide 1", "Slide 2"]
+    mock_cache.set.assert_not_called()
@@ -0,0 +1,60 @@
+import pytest
+from slideia.domain.llm.budget import (
+    ContextWindowExceededError,
+    PromptBudget,
+    count_tokens,
+    truncate_to_tokens,
+)
+
+
+def test_count_tokens_empty():
+    assert count_tokens("") == 0
+    assert count_tokens(None) == 0
+
+
+def test_count_tokens_grows_with_text():
+    short = count_tokens("A short sentence.")
+    long = count_tokens("A short sentence. " * 50)
+    assert 0 < short < long
+
+
+def test_truncate_to_tokens_within_limit():
+    text, truncated = truncate_to_tokens("Hello world", 100)
+    assert text == "Hello world"
+    assert not truncated
+
+
+def test_truncate_to_tokens_prefers_paragraph_boundary():
+    text = "\n\n".join(f"Paragraph number {i} with some filler words." for i in range(50))
+    fitted, truncated = truncate_to_tokens(text, 60)
+    assert truncated
+    assert count_tokens(fitted) <= 60
+    assert fitted.endswith("filler words.")
+
+
+def test_output_tokens_scales_with_slides_and_is_capped():
+    budget = PromptBudget(context_window=32768, max_output_tokens=4096)
+    assert budget.output_tokens("batch", 1) < budget.output_tokens("batch", 3)
+    assert budget.output_tokens("refine", 50) == 4096
+
+
+def test_fit_reference_respects_window():
+    budget = PromptBudget(context_window=2000, max_output_tokens=500)
+    reference = "\n\n".join("Important fact about the topic. " * 5 for _ in range(100))
+    fitted = budget.fit_reference(reference, "Fixed prompt text", max_tokens=500)
+    assert count_tokens(fitted) + count_tokens("Fixed prompt text") <= budget.input_budget(500)
+
+
+def test_fit_history_keeps_most_recent():
+    budget = PromptBudget(context_window=2000, max_output_tokens=500)
+    history = ["old " * 50, "middle " * 50, "recent " * 50]
+    kept = budget.fit_history(history, count_tokens(history[1] + history[2]))
+    assert kept == history[1:]
+
+
+def test_guard_shrinks_or_rejects():
+    budget = PromptBudget(context_window=4000, max_output_tokens=2048)
+    assert budget.guard(1000, 2048) == 2048
+    assert budget.guard(3000, 2048) == 1000
+    with pytest.raises(ContextWindowExceededError):
+        budget.guard(3990, 2048)
@@ -1,8 +1,10 @@
 from langgraph.graph import END
 import pytest
+from unittest.mock import AsyncMock, patch
 from slideia.domain.agent.graph import route_intent, decide_validation, compile_workflow
-from slideia.domain.agent.nodes import validate_node
+from slideia.domain.agent.nodes import draft_slides_node, validate_node
 from slideia.domain.agent.state import AgentState
+from slideia.services.ingest import DocumentIndex
 
 
 def test_route_intent():
@@ -181,3 +183,70 @@ async def test_validate_node():
     res = await validate_node(state_invalid_deck, None)
     assert "missing a title" in res["error"]
     assert res["retry_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_draft_slides_node_retrieves_passages_per_batch():
+    index = DocumentIndex(
+        [
+            "Solar panel efficiency improved with perovskite cells.",
+            "Wind turbine blades are recycled into cement.",
+            "Battery storage smooths grid demand peaks.",
+        ]
+    )
+    specs = [
+        {"title": "Solar efficiency", "summary": "Perovskite cells", "layout": "bullets"},
+        {"title": "Solar costs", "summary": "Cheaper panels", "layout": "bullets"},
+        {"title": "Solar outlook", "summary": "Panel adoption", "layout": "bullets"},
+        {"title": "Battery storage", "summary": "Grid peaks", "layout": "bullets"},
+    ]
+    state: AgentState = {
+        "messages": [],
+        "topic": "Energy",
+        "audience": "Investors",
+        "prompt": "Create a deck",
+        "theme_preset": "Default",
+        "deck": {"outline": {"slides": specs}, "slides": []},
+        "file_context": "full document text",
+        "summarized_context": "summary",
+        "document_index": index,
+    }
+
+    async def draft(topic, audience, batch, theme_instruction, reference_material):
+        return {"slides": [{"title": spec["title"]} for spec in batch]}
+
+    with patch("slideia.domain.agent.nodes.llm.draft_slides_batch", new=AsyncMock(side_effect=draft)) as mock:
+        res = await draft_slides_node(state, None)
+
+    assert len(res["deck"]["slides"]) == 4
+    references = [call.kwargs["reference_material"] for call in mock.call_args_list]
+    assert references[0] == index.passages[0]
+    assert references[1] == index.passages[2]
+
+
+@pytest.mark.asyncio
+async def test_summarize_context_node_caches_summary():
+    from slideia.domain.agent.nodes import summarize_context_node
+    from slideia.infra.cache import document_cache
+
+    file_context = "--- File: notes.txt ---\nUnique cached document body.\n--- End of notes.txt ---"
+    with patch(
+        "slideia.services.summarize.summarize_long_document", new=AsyncMock(return_value="the summary")
+    ):
+        res = await summarize_context_node({"file_context": file_context}, None)
+
+    assert res["summarized_context"] == "the summary"
+    assert document_cache.get_summary(document_cache.digest(file_context)) == "the summary"
+
+
+@pytest.mark.asyncio
+async def test_summarize_context_node_survives_failed_fallback_compression():
+    from slideia.domain.agent import nodes
+
+    with (
+        patch.object(nodes, "summarize_reference", new=AsyncMock(side_effect=RuntimeError("llm down"))),
+        patch.object(nodes, "run_in_extraction_pool", new=AsyncMock(side_effect=TimeoutError("too slow"))),
+    ):
+        res = await nodes.summarize_context_node({"file_context": "--- File: a.txt ---\nBody"}, None)
+
+    assert res == {"summarized_context": None}
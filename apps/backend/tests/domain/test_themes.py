@@ -1,5 +1,5 @@
 import pytest
-from slideia.domain.deck.exporter import export_slides
+from slideia.domain.deck.exporter import PreparedTemplate, export_slides
 import json
 import os
 import tempfile
@@ -31,7 +31,14 @@ async def test_exporter_uses_global_theme():
     try:
         # We don't want to actually generate a PPTX in a unit test
         # but we can mock the Presentation object to verify if font settings are applied.
-        with patch("slideia.domain.deck.exporter.Presentation") as mock_pres:
+        with (
+            patch("slideia.domain.deck.exporter.Presentation") as mock_pres,
+            patch("slideia.domain.deck.exporter.settings.PPTX_ENGINE", "python-pptx"),
+            patch(
+                "slideia.domain.deck.exporter.prepared_template",
+                return_value=PreparedTemplate(data=b"", blank_layout_index=0),
+            ),
+        ):
             mock_prs_instance = MagicMock()
             mock_pres.return_value = mock_prs_instance
 
@@ -0,0 +1,110 @@
+import time
+import redis
+from unittest.mock import MagicMock
+from slideia.infra.cache import DocumentCache, ImageCache
+
+
+def test_document_cache_digest_is_content_addressed():
+    assert DocumentCache.digest(b"same bytes") == DocumentCache.digest("same bytes")
+    assert DocumentCache.digest(b"same bytes") != DocumentCache.digest(b"other bytes")
+
+
+def test_document_cache_local_round_trip():
+    cache = DocumentCache(use_redis=False)
+    digest = cache.digest(b"pdf bytes")
+
+    assert cache.get_text(digest) is None
+    cache.set_text(digest, "extracted text")
+    cache.set_summary(digest, "summary")
+
+    assert cache.get_text(digest) == ("extracted text", False)
+    assert cache.get_summary(digest) == "summary"
+
+
+def test_document_cache_evicts_least_recently_used():
+    cache = DocumentCache(use_redis=False, max_local_entries=2)
+    cache.set_text("a", "A")
+    cache.set_text("b", "B")
+    cache.get_text("a")
+    cache.set_text("c", "C")
+
+    assert cache.get_text("a") == ("A", False)
+    assert cache.get_text("b") is None
+    assert cache.get_text("c") == ("C", False)
+
+
+def test_document_cache_keys_truncated_text_by_budget():
+    cache = DocumentCache(use_redis=False)
+    cache.set_text("abc", "partial", truncated=True, budget=100)
+
+    assert cache.get_text("abc", budget=100) == ("partial", True)
+    assert cache.get_text("abc") is None
+    assert cache.get_text("abc", budget=200) is None
+
+
+def test_document_cache_reads_through_redis():
+    cache = DocumentCache(use_redis=False)
+    cache._client = MagicMock()
+    cache._client.get.return_value = "from redis"
+
+    assert cache.get_summary("abc") == "from redis"
+    cache._client.get.assert_called_once_with("doc:summary:abc")
+
+    # Served locally afterwards
+    cache._client.get.reset_mock()
+    assert cache.get_summary("abc") == "from redis"
+    cache._client.get.assert_not_called()
+
+
+def test_document_cache_falls_back_to_local_when_redis_fails():
+    cache = DocumentCache(use_redis=False)
+    cache._client = MagicMock()
+    cache._client.get.side_effect = redis.exceptions.ConnectionError("down")
+    cache._client.setex.side_effect = redis.exceptions.ConnectionError("down")
+
+    cache.set_text("abc", "text")
+    assert cache.get_text("abc") == ("text", False)
+    assert cache.get_text("missing") is None
+
+
+def test_image_cache_round_trip_by_url_and_digest(tmp_path):
+    cache = ImageCache(root=tmp_path)
+
+    assert cache.get("http://img/a.jpg") is None
+    digest = cache.put("http://img/a.jpg", b"jpeg bytes")
+
+    assert cache.get("http://img/a.jpg") == b"jpeg bytes"
+    assert cache.get_blob(digest) == b"jpeg bytes"
+    assert not list(tmp_path.rglob(".tmp-*"))
+
+
+def test_image_cache_stores_identical_content_once(tmp_path):
+    cache = ImageCache(root=tmp_path)
+    cache.put("http://img/a.jpg", b"same picture")
+    cache.put("http://cdn/a.jpg?w=1080", b"same picture")
+
+    assert cache.get("http://cdn/a.jpg?w=1080") == b"same picture"
+    assert cache.size_bytes() == len(b"same picture")
+
+
+def test_image_cache_evicts_least_recently_used(tmp_path):
+    cache = ImageCache(root=tmp_path, max_bytes=25)
+    cache.put("http://img/a", b"a" * 10)
+    time.sleep(0.01)
+    cache.put("http://img/b", b"b" * 10)
+    time.sleep(0.01)
+    cache.get("http://img/a")
+    time.sleep(0.01)
+    cache.put("http://img/c", b"c" * 10)
+
+    assert cache.get("http://img/a") == b"a" * 10
+    assert cache.get("http://img/b") is None
+    assert cache.get("http://img/c") == b"c" * 10
+    assert cache.size_bytes() <= 25
+
+
+def test_image_cache_skips_images_larger_than_quota(tmp_path):
+    cache = ImageCache(root=tmp_path, max_bytes=4)
+    cache.put("http://img/big", b"too large")
+
+    assert cache.get("http://img/big") is None
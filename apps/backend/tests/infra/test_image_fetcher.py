@@ -0,0 +1,57 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from slideia.infra.cache import ImageCache, ImageSearchCache
+from slideia.infra.image_fetcher import ImageFetcher, normalize_query
+
+
+@pytest.mark.asyncio
+async def test_download_image_served_from_cache_on_repeat(tmp_path):
+    response = MagicMock(status_code=200, content=b"image bytes")
+    with (
+        patch("slideia.infra.image_fetcher.image_cache", ImageCache(root=tmp_path)),
+        patch("httpx.AsyncClient.get", new_callable=AsyncMock, return_value=response) as mock_get,
+    ):
+        fetcher = ImageFetcher()
+        assert await fetcher.download_image("http://img/a.jpg") == b"image bytes"
+        assert await fetcher.download_image("http://img/a.jpg") == b"image bytes"
+
+    mock_get.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_download_image_does_not_cache_failures(tmp_path):
+    response = MagicMock(status_code=404, content=b"not found")
+    cache = ImageCache(root=tmp_path)
+    with (
+        patch("slideia.infra.image_fetcher.image_cache", cache),
+        patch("httpx.AsyncClient.get", new_callable=AsyncMock, return_value=response),
+    ):
+        assert await ImageFetcher().download_image("http://img/missing.jpg") is None
+
+    assert cache.get("http://img/missing.jpg") is None
+
+
+def test_normalize_query_ignores_case_order_filler_and_plurals():
+    assert normalize_query("A photo of business charts.") == normalize_query("chart, business")
+    assert normalize_query("Team meeting") != normalize_query("Team celebration")
+
+
+@pytest.mark.asyncio
+async def test_fetch_image_urls_cached_per_normalized_query():
+    response = MagicMock(status_code=200)
+    response.json.return_value = {"results": [{"urls": {"regular": f"http://img/{i}"}} for i in range(3)]}
+    with (
+        patch("slideia.infra.image_fetcher.image_search_cache", ImageSearchCache(use_redis=False)),
+        patch("httpx.AsyncClient.get", new_callable=AsyncMock, return_value=response) as mock_get,
+    ):
+        fetcher = ImageFetcher()
+        assert await fetcher.fetch_image_urls("Business charts") == [
+            "http://img/0",
+            "http://img/1",
+            "http://img/2",
+        ]
+        assert await fetcher.fetch_image_url("a business chart") == "http://img/0"
+
+    mock_get.assert_awaited_once()
+    assert mock_get.call_args.kwargs["params"]["per_page"] > 1
@@ -1,6 +1,7 @@
 import pytest
 import httpx
 from unittest.mock import AsyncMock, MagicMock, patch
+from slideia.domain.llm.budget import ContextWindowExceededError, count_tokens, prompt_budget
 from slideia.infra.openrouter import OpenRouterLLM, _extract_json
 
 # --- Tests for _extract_json_from_markdown ---
@@ -193,10 +194,11 @@ async def test_llm_draft_slides_batch(llm):
         assert len(result["slides"]) == 2
         assert result["slides"][0]["title"] == "S1"
         assert mock_call.call_count == 1
-        # Check that it uses a higher max_tokens
+        # max_tokens is sized from the number of slides in the batch
         mock_call.assert_called_once()
         args, kwargs = mock_call.call_args
-        assert kwargs.get("max_tokens") == 4096
+        assert kwargs.get("max_tokens") == prompt_budget.output_tokens("batch", 2)
+        assert prompt_budget.output_tokens("batch", 3) > kwargs.get("max_tokens")
 
 
 @pytest.mark.asyncio
@@ -209,3 +211,25 @@ async def test_llm_summarize_document(llm):
         args, kwargs = mock_call.call_args
         assert kwargs.get("max_tokens") == 2048
         assert kwargs.get("json_mode") is False
+
+
+@pytest.mark.asyncio
+async def test_llm_draft_slides_batch_trims_reference_material(llm):
+    reference = "\n\n".join(f"Paragraph {i} " + "fact " * 200 for i in range(200))
+    with patch.object(llm, "_call", new_callable=AsyncMock) as mock_call:
+        mock_call.return_value = {"slides": []}
+        await llm.draft_slides_batch("Topic", "Audience", [{"title": "S1"}], reference_material=reference)
+
+        args, kwargs = mock_call.call_args
+        prompt = args[0]
+        assert "Reference Material:\nParagraph 0" in prompt
+        assert count_tokens(prompt) + kwargs["max_tokens"] <= prompt_budget.context_window
+
+
+@pytest.mark.asyncio
+async def test_llm_call_rejects_prompt_exceeding_context_window(llm):
+    huge_prompt = "word " * (prompt_budget.context_window + 10)
+    with patch.object(llm, "_execute_call", new_callable=AsyncMock) as mock_exec:
+        with pytest.raises(ContextWindowExceededError):
+            await llm._call(huge_prompt)
+        mock_exec.assert_not_called()
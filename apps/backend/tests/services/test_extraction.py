@@ -0,0 +1,167 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from slideia.infra.cache import document_cache
+from slideia.services import extraction
+from slideia.services.extraction import extract_text, get_extraction_pool, shutdown_extraction_pool
+
+
+def _slow_extract(raw: bytes, ext: str, max_chars: int | None = None) -> tuple[str, bool]:
+    time.sleep(2)
+    return "too late", False
+
+
+def _stuck_or_slow_extract(raw: bytes, ext: str, max_chars: int | None = None) -> tuple[str, bool]:
+    time.sleep(2 if raw == b"stuck" else 0.5)
+    return raw.decode(), False
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    document_cache.clear()
+    yield
+    shutdown_extraction_pool()
+
+
+@pytest.mark.asyncio
+async def test_extract_text_runs_concurrently_and_keeps_order():
+    contents = [f"document {i}".encode() for i in range(4)]
+    texts = await asyncio.gather(*(extract_text(raw, "txt") for raw in contents))
+    assert texts == [(f"document {i}", False) for i in range(4)]
+
+
+@pytest.mark.asyncio
+async def test_extract_text_uses_cache_for_identical_bytes():
+    await extract_text(b"cached body", "txt")
+
+    with patch.object(extraction, "get_extraction_pool") as mock_pool:
+        assert await extract_text(b"cached body", "txt") == ("cached body", False)
+        assert await extract_text(b"cached body", "txt", max_chars=6) == ("cached", True)
+        mock_pool.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_extract_text_propagates_parse_errors():
+    with pytest.raises(Exception):
+        await extract_text(b"not a pdf", "pdf")
+
+
+@pytest.mark.asyncio
+async def test_extract_text_timeout_recycles_pool():
+    pool = get_extraction_pool()
+    with patch.object(extraction, "extract_file_text_within", _slow_extract):
+        with pytest.raises(TimeoutError):
+            await extract_text(b"slow document", "txt", timeout=0.2)
+
+    assert get_extraction_pool() is not pool
+    assert document_cache.get_text(document_cache.digest(b"slow document")) is None
+
+
+@pytest.mark.asyncio
+async def test_extract_text_timeout_terminates_stuck_worker():
+    with patch.object(extraction, "extract_file_text_within", _slow_extract):
+        job = asyncio.create_task(extract_text(b"stuck document", "txt", timeout=0.5))
+        await asyncio.sleep(0.2)
+        workers = list(get_extraction_pool()._processes.values())
+        with pytest.raises(TimeoutError):
+            await job
+
+    # Well before the job's own sleep would end
+    for worker in workers:
+        worker.join(timeout=0.3)
+    assert workers and not any(worker.is_alive() for worker in workers)
+
+
+@pytest.mark.asyncio
+async def test_jobs_killed_by_another_callers_recycle_are_retried():
+    with patch.object(extraction, "extract_file_text_within", _stuck_or_slow_extract):
+        stuck = asyncio.create_task(extract_text(b"stuck", "txt", timeout=0.3))
+        healthy = asyncio.create_task(extract_text(b"healthy", "txt", timeout=5))
+        with pytest.raises(TimeoutError):
+            await stuck
+        assert await healthy == ("healthy", False)
+
+
+@pytest.mark.asyncio
+async def test_run_in_extraction_pool_runs_ingest_helpers():
+    from slideia.services.ingest import build_document_index
+
+    index = await extraction.run_in_extraction_pool(
+        build_document_index, "Solar costs fell.\n\nWind grew.", 50
+    )
+
+    assert index.passages == ["Solar costs fell.\n\nWind grew."]
+
+
+def _make_pdf(pages: int) -> bytes:
+    from io import BytesIO
+    from reportlab.pdfgen import canvas
+
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer)
+    for page in range(pages):
+        c.drawString(72, 720, f"Page number {page + 1} of the synthetic report")
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def test_page_shards_cover_all_pages_in_order():
+    shards = extraction._page_shards(100, workers=4)
+    assert len(shards) == 8
+    assert shards[0][0] == 0 and shards[-1][1] == 100
+    assert all(a[1] == b[0] for a, b in zip(shards, shards[1:]))
+
+    assert extraction._page_shards(10, workers=4) == [(0, 10)]
+
+
+@pytest.mark.asyncio
+async def test_parallel_pdf_extraction_matches_serial():
+    from slideia.services.ingest import extract_text_from_pdf
+
+    raw = _make_pdf(40)
+    with patch.object(extraction.settings, "PDF_PARALLEL_MIN_PAGES", 10):
+        text = await extraction.extract_pdf_text_parallel(raw)
+
+    assert text == (extract_text_from_pdf(raw), False)
+    assert text[0].index("Page number 9 ") < text[0].index("Page number 33 ")
+
+
+@pytest.mark.asyncio
+async def test_parallel_pdf_extraction_stops_at_budget():
+    raw = _make_pdf(200)
+    with patch.object(extraction.settings, "PDF_PARALLEL_MIN_PAGES", 10):
+        text, truncated = await extraction.extract_pdf_text_parallel(raw, max_chars=500)
+
+    assert truncated
+    assert len(text) <= 500
+    assert text.startswith("Page number 1 ")
+
+
+@pytest.mark.asyncio
+async def test_parallel_pdf_extraction_parses_pages_only_up_to_budget():
+    from slideia.services.ingest import extract_pdf_page_range
+
+    parsed = []
+
+    def recording_page_range(*args):
+        pages = extract_pdf_page_range(*args)
+        parsed.append(len(pages))
+        return pages
+
+    raw = _make_pdf(200)
+    with (
+        ThreadPoolExecutor(2) as pool,
+        patch.object(extraction, "get_extraction_pool", return_value=pool),
+        patch.object(extraction, "extract_pdf_page_range", recording_page_range),
+        patch.object(extraction.settings, "PDF_PARALLEL_MIN_PAGES", 10),
+    ):
+        text, truncated = await extraction.extract_pdf_text_parallel(raw, max_chars=500)
+
+    assert truncated and text.startswith("Page number 1 ")
+    # Two 50-page shards were scheduled, but each stopped a page past the budget (~13 pages)
+    assert len(parsed) == 2
+    assert max(parsed) < 15
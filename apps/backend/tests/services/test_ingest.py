@@ -1,3 +1,4 @@
+import re
 from unittest.mock import MagicMock, patch
 from slideia.services.ingest import (
     extract_text_from_plain,
@@ -5,7 +6,18 @@ from slideia.services.ingest import (
     extract_text_from_docx,
     extract_file_text,
     chunk_document_text,
+    split_text_by_tokens,
+    iter_plain_paragraphs,
+    iter_docx_paragraphs,
+    extract_file_text_within,
+    dedupe_paragraphs,
+    split_sentences,
+    score_sentences,
+    compress_document,
+    DocumentIndex,
+    build_document_index,
 )
+from slideia.domain.llm.budget import count_tokens
 
 
 def test_extract_text_plain():
@@ -22,7 +34,7 @@ def test_extract_text_plain_utf8_fallback():
     assert "\ufffd" in text
 
 
-@patch("slideia.services.ingest.PdfReader")
+@patch("slideia.services.pdf_backends.PdfReader")
 def test_extract_text_pdf(mock_pdf_reader):
     mock_page_1 = MagicMock()
     mock_page_1.extract_text.return_value = "Page 1 Content"
@@ -39,23 +51,40 @@ def test_extract_text_pdf(mock_pdf_reader):
     mock_pdf_reader.assert_called_once()
 
 
-@patch("slideia.services.ingest.Document")
-def test_extract_text_docx(mock_document):
-    mock_para_1 = MagicMock()
-    mock_para_1.text = "Paragraph 1"
-    mock_para_2 = MagicMock()
-    mock_para_2.text = "Paragraph 2"
-    mock_para_3 = MagicMock()
-    mock_para_3.text = ""  # empty paragraphs should be ignored
+def _make_docx() -> bytes:
+    from io import BytesIO
+    from docx import Document
 
-    mock_doc = MagicMock()
-    mock_doc.paragraphs = [mock_para_1, mock_para_2, mock_para_3]
-    mock_document.return_value = mock_doc
+    doc = Document()
+    doc.add_heading("Quarterly Report", level=1)
+    doc.add_paragraph("Paragraph 1")
+    doc.add_paragraph("")  # empty paragraphs should be ignored
+    run_para = doc.add_paragraph("Bold ")
+    run_para.add_run("and plain").bold = True
+    table = doc.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Region"
+    table.cell(0, 1).text = "Revenue"
+    table.cell(1, 0).text = "EMEA"
+    table.cell(1, 1).text = "$4.2M"
+    doc.add_paragraph("Closing\tremarks")
 
-    content = b"dummy docx data"
-    text = extract_text_from_docx(content)
-    assert text == "Paragraph 1\n\nParagraph 2"
-    mock_document.assert_called_once()
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def test_extract_text_docx():
+    text = extract_text_from_docx(_make_docx())
+    assert text == (
+        "Quarterly Report\n\nParagraph 1\n\nBold and plain\n\n"
+        "Region | Revenue\n\nEMEA | $4.2M\n\nClosing\tremarks"
+    )
+
+
+def test_iter_docx_paragraphs_is_lazy_and_budgetable():
+    text, truncated = chunk_document_text(iter_docx_paragraphs(_make_docx()), max_chars=30)
+    assert text == "Quarterly Report\n\nParagraph 1"
+    assert truncated
 
 
 @patch("slideia.services.ingest.extract_text_from_pdf")
@@ -105,3 +134,235 @@ def test_chunk_document_text_hard_slice_fallback():
     chunked, truncated = chunk_document_text(text, max_chars=10)
     assert chunked == "SingleVery"
     assert truncated
+
+
+def test_split_text_by_tokens_single_chunk():
+    text = "Paragraph 1.\n\nParagraph 2."
+    assert split_text_by_tokens(text, max_tokens=100) == [text]
+
+
+def test_split_text_by_tokens_respects_budget_and_order():
+    paragraphs = [f"Paragraph {i} talks about topic number {i} in some detail." for i in range(40)]
+    chunks = split_text_by_tokens("\n\n".join(paragraphs), max_tokens=50)
+
+    assert len(chunks) > 1
+    assert all(count_tokens(chunk) <= 50 for chunk in chunks)
+    assert "\n\n".join(chunks) == "\n\n".join(paragraphs)
+
+
+def test_split_text_by_tokens_splits_oversized_paragraph():
+    text = " ".join(f"word{i}" for i in range(500))
+    chunks = split_text_by_tokens(text, max_tokens=40)
+
+    assert len(chunks) > 1
+    assert all(count_tokens(chunk) <= 40 for chunk in chunks)
+    assert chunks[0].startswith("word0")
+    assert chunks[-1].endswith("word499")
+
+
+def test_dedupe_paragraphs_removes_near_duplicates():
+    paragraphs = [
+        "Quarterly revenue grew twelve percent driven by strong subscription renewals across regions.",
+        "Confidential - Acme Corp internal report page footer",
+        "Customer churn fell to four percent after the onboarding redesign shipped in March.",
+        "Confidential - Acme Corp internal report page footer",
+        "Quarterly revenue grew twelve percent driven by strong subscription renewals across all regions.",
+    ]
+    kept = dedupe_paragraphs(paragraphs)
+    assert kept == paragraphs[:3]
+
+
+def test_dedupe_paragraphs_keeps_file_delimiters():
+    paragraphs = [
+        "--- File: a.txt ---",
+        "Same body text here.",
+        "--- File: a.txt ---",
+        "Same body text here.",
+    ]
+    assert dedupe_paragraphs(paragraphs) == [
+        "--- File: a.txt ---",
+        "Same body text here.",
+        "--- File: a.txt ---",
+    ]
+
+
+def test_split_sentences():
+    paragraph = "Revenue grew. Costs fell! Will it last?\n- A bullet point"
+    assert split_sentences(paragraph) == ["Revenue grew.", "Costs fell!", "Will it last?", "- A bullet point"]
+
+
+def test_score_sentences_prefers_central_sentences():
+    sentences = [
+        "Solar power capacity expanded rapidly as solar panel costs declined.",
+        "Solar panel costs declined, making solar power capacity cheaper to expand.",
+        "Falling solar costs drive solar power capacity growth worldwide.",
+        "My cat enjoys sleeping on the warm windowsill.",
+    ]
+    scores = score_sentences(sentences)
+    assert scores.shape == (4,)
+    assert scores.argmin() == 3
+
+
+def test_score_sentences_ranks_only_most_central_sentences_on_long_input():
+    sentences = [f"Solar panel costs declined in region {i}." for i in range(6)] + [
+        "My cat enjoys sleeping on the warm windowsill.",
+        "The cat sleeps.",
+    ]
+    with patch("slideia.services.ingest.MAX_RANKED_SENTENCES", 3):
+        scores = score_sentences(sentences)
+
+    assert scores.shape == (8,)
+    assert set(scores.argsort()[:2]) == {6, 7}
+    assert score_sentences(["the of", "and the"]).tolist() == [1.0, 1.0]
+
+
+def test_compress_document_short_text_unchanged():
+    text = "A short document."
+    assert compress_document(text, max_tokens=100) == (text, False)
+
+
+def test_compress_document_fits_budget_and_keeps_order():
+    topic = [
+        f"Renewable energy investment reached record levels in year {2010 + i} as solar and wind costs fell."
+        for i in range(30)
+    ]
+    noise = [f"Unrelated aside number {i} about breakfast cereal." for i in range(10)]
+    text = (
+        "--- File: report.txt ---\n"
+        + " ".join(topic[:15] + noise + topic[15:])
+        + "\n--- End of report.txt ---"
+    )
+
+    compressed, is_compressed = compress_document(text, max_tokens=200)
+
+    assert is_compressed
+    assert count_tokens(compressed) <= 200
+    assert compressed.startswith("--- File: report.txt ---")
+    assert compressed.endswith("--- End of report.txt ---")
+    # Leftover budget may be filled by a short aside, but the topic sentences dominate
+    assert compressed.count("breakfast") <= 1
+    years = [int(y) for y in re.findall(r"year (\d{4})", compressed)]
+    assert years and years == sorted(years)
+
+
+def test_document_index_ranks_relevant_passages():
+    index = DocumentIndex(
+        [
+            "The cafeteria menu changes every Monday.",
+            "Kubernetes schedules containers across cluster nodes.",
+            "Container orchestration with Kubernetes simplifies scaling of containers.",
+        ]
+    )
+    assert sorted(index.search("kubernetes containers", top_k=2)) == [1, 2]
+    assert index.search("quantum chromodynamics", top_k=3) == []
+
+
+def test_document_index_retrieve_keeps_document_order_and_budget():
+    passages = [f"Passage {i} mentions revenue growth figures." for i in range(5)] + ["Unrelated text."]
+    index = DocumentIndex(passages)
+
+    text = index.retrieve("revenue growth", top_k=3)
+    assert text.split("\n\n") == sorted(text.split("\n\n"))
+    assert len(text.split("\n\n")) == 3
+
+    limited = index.retrieve("revenue growth", top_k=3, max_tokens=count_tokens(passages[0]))
+    assert len(limited.split("\n\n")) == 1
+
+
+def test_build_document_index_splits_passages():
+    text = "\n\n".join(f"Paragraph {i} " + "word " * 30 for i in range(10))
+    index = build_document_index(text, passage_tokens=50)
+    assert len(index) > 1
+    assert all(count_tokens(p) <= 50 for p in index.passages)
+
+
+def test_iter_plain_paragraphs_handles_chunk_boundaries():
+    text = ("Paragraph é" + "x" * 100 + "\n\n") * 3000 + "last"
+    with patch("slideia.services.ingest.PLAIN_TEXT_READ_CHUNK", 1001):
+        paragraphs = list(iter_plain_paragraphs(text.encode("utf-8")))
+    assert "\n\n".join(paragraphs) == text
+
+
+def test_chunk_document_text_stops_consuming_stream_at_budget():
+    consumed = []
+
+    def pages():
+        for i in range(100):
+            consumed.append(i)
+            yield f"Page {i} " + "text " * 20
+
+    text, truncated = chunk_document_text(pages(), max_chars=500)
+
+    assert truncated
+    assert len(text) <= 500
+    assert len(consumed) < 10
+
+
+def test_chunk_document_text_stream_within_budget_not_truncated():
+    text, truncated = chunk_document_text(iter(["Page one.", "Page two."]), max_chars=100)
+    assert text == "Page one.\n\nPage two."
+    assert not truncated
+
+
+def test_chunk_document_text_token_budget():
+    paragraphs = [f"Paragraph {i} " + "word " * 20 for i in range(20)]
+    text, truncated = chunk_document_text("\n\n".join(paragraphs), max_chars=None, max_tokens=60)
+    assert truncated
+    assert 0 < count_tokens(text) <= 60
+
+
+def test_extract_file_text_within_budget():
+    content = "\n\n".join(f"Paragraph {i}" for i in range(1000)).encode()
+    text, truncated = extract_file_text_within(content, "txt", max_chars=50)
+    assert truncated
+    assert text.startswith("Paragraph 0\n\nParagraph 1")
+    assert extract_file_text_within(content, "txt") == (content.decode(), False)
+
+
+def test_iter_docx_paragraphs_nested_tables_and_text_box_fallback():
+    import zipfile
+    from io import BytesIO
+
+    body = """<?xml version="1.0" encoding="UTF-8"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+            xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006">
+  <w:body>
+    <w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr><w:r><w:t>Intro</w:t></w:r>
+      <mc:AlternateContent>
+        <mc:Choice><w:r><w:t xml:space="preserve"> box</w:t></w:r></mc:Choice>
+        <mc:Fallback><w:r><w:t> duplicate</w:t></w:r></mc:Fallback>
+      </mc:AlternateContent>
+    </w:p>
+    <w:tbl><w:tr>
+      <w:tc><w:p><w:r><w:t>Outer</w:t></w:r></w:p></w:tc>
+      <w:tc><w:tbl><w:tr>
+        <w:tc><w:p><w:r><w:t>Inner A</w:t></w:r></w:p></w:tc>
+        <w:tc><w:p><w:r><w:t>Inner B</w:t></w:r></w:p></w:tc>
+      </w:tr></w:tbl></w:tc>
+    </w:tr></w:tbl>
+    <w:p><w:r><w:t>Line one</w:t><w:br/><w:t>Line two</w:t></w:r></w:p>
+  </w:body>
+</w:document>"""
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", body)
+
+    assert list(iter_docx_paragraphs(buffer.getvalue())) == [
+        "Intro box",
+        "Outer | Inner A | Inner B",
+        "Line one\nLine two",
+    ]
+
+
+def test_csv_upload_is_profiled_into_a_data_brief():
+    content = b"region,revenue\n" + b"\n".join(f"R{i % 3},{i * 10}".encode() for i in range(500))
+
+    text, truncated = extract_file_text_within(content, "csv", max_chars=10_000)
+
+    assert text.startswith("Data brief: 500 rows x 2 columns")
+    assert "- 1.2M: total revenue" in text
+    assert not truncated
+
+
+def test_malformed_json_upload_falls_back_to_raw_text():
+    assert extract_file_text(b'{"unterminated": ', "json") == '{"unterminated": '
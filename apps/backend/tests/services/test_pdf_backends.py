@@ -0,0 +1,87 @@
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+from reportlab.pdfgen import canvas
+from slideia.services import pdf_backends
+from slideia.services.pdf_backends import BACKENDS, PdfBackend, backend_chain, count_pages, iter_pages
+
+
+def _make_pdf(pages: int) -> bytes:
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer)
+    for page in range(pages):
+        c.drawString(72, 720, f"Page {page + 1} heading")
+        c.drawString(72, 700, "Body text line")
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+class FakeBackend(PdfBackend):
+    def __init__(self, name: str, fail_at: int | None = None):
+        self.name = name
+        self.fail_at = fail_at
+
+    def count_pages(self, source):
+        if self.fail_at is not None:
+            raise ValueError("cannot open")
+        return 5
+
+    def iter_pages(self, source, start=0, stop=None):
+        for i in range(start, 5 if stop is None else stop):
+            if i == self.fail_at:
+                raise ValueError(f"{self.name} broke")
+            yield f"{self.name}:{i}"
+
+
+@pytest.mark.parametrize("name", list(BACKENDS))
+def test_backends_extract_pages(name, tmp_path):
+    backend = BACKENDS[name]
+    if not backend.available():
+        pytest.skip(f"{name} is not installed")
+
+    raw = _make_pdf(3)
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(raw)
+
+    assert backend.count_pages(raw) == 3
+    assert backend.count_pages(str(path)) == 3
+
+    pages = list(backend.iter_pages(raw))
+    assert len(pages) == 3
+    assert "Page 2 heading" in pages[1]
+
+    tail = list(backend.iter_pages(str(path), start=1, stop=3))
+    assert len(tail) == 2
+    assert "Page 3 heading" in tail[1]
+
+
+def test_backend_chain_order():
+    with patch.object(pdf_backends, "BACKENDS", {n: FakeBackend(n) for n in pdf_backends.AUTO_ORDER}):
+        assert [b.name for b in backend_chain("auto")] == ["pypdfium2", "pypdf", "pdfminer"]
+        assert [b.name for b in backend_chain("pdfminer")] == ["pdfminer", "pypdfium2", "pypdf"]
+        assert [b.name for b in backend_chain("nonsense")] == ["pypdf", "pypdfium2", "pdfminer"]
+
+
+def test_iter_pages_falls_back_and_resumes_at_failed_page():
+    fakes = {
+        "pypdf": FakeBackend("pypdf", fail_at=2),
+        "pypdfium2": FakeBackend("pypdfium2"),
+        "pdfminer": FakeBackend("pdfminer"),
+    }
+    with patch.object(pdf_backends, "BACKENDS", fakes):
+        assert list(iter_pages(b"pdf", preferred="pypdf")) == [
+            "pypdf:0",
+            "pypdf:1",
+            "pypdfium2:2",
+            "pypdfium2:3",
+            "pypdfium2:4",
+        ]
+
+
+def test_count_pages_raises_when_every_backend_fails():
+    fakes = {name: FakeBackend(name, fail_at=0) for name in pdf_backends.AUTO_ORDER}
+    with patch.object(pdf_backends, "BACKENDS", fakes):
+        with pytest.raises(ValueError):
+            count_pages(b"pdf")
@@ -0,0 +1,115 @@
+import json
+
+from slideia.services.profiling import (
+    KEY_FIGURES_HEADING,
+    extract_key_figures,
+    format_number,
+    profile_csv,
+    profile_data,
+    profile_json,
+)
+
+
+def _sales_csv(months: int = 12) -> bytes:
+    lines = ["order_id,month,region,revenue,discount"]
+    for i in range(months * 4):
+        month = i // 4 + 1
+        region = ["North", "North", "South", "East"][i % 4]
+        revenue = 1000 * month + (i % 4) * 10
+        lines.append(f'{i + 1},2024-{month:02d}-01,{region},"${revenue:,}",{5 + i % 3}%')
+    return "\n".join(lines).encode()
+
+
+def test_format_number():
+    assert format_number(5_200_000, "$") == "$5.2M"
+    assert format_number(12_345) == "12.3K"
+    assert format_number(1204) == "1,204"
+    assert format_number(73.44, "%") == "73.4%"
+    assert format_number(0.25) == "0.25"
+
+
+def test_profile_csv_column_kinds_and_statistics():
+    profile = profile_csv(_sales_csv())
+    kinds = {c.name: c.kind for c in profile.columns}
+
+    assert kinds == {
+        "order_id": "numeric",
+        "month": "date",
+        "region": "categorical",
+        "revenue": "numeric",
+        "discount": "numeric",
+    }
+    by_name = {c.name: c for c in profile.columns}
+    assert by_name["order_id"].is_identifier
+    assert by_name["revenue"].unit == "$"
+    assert by_name["discount"].unit == "%"
+    assert by_name["region"].top[0] == ("North", 0.5)
+    assert [c.name for c in profile.measures] == ["revenue", "discount"]
+
+
+def test_profile_csv_reports_trend_and_key_figures():
+    profile = profile_csv(_sales_csv())
+
+    # Monthly revenue grows linearly from ~4K to ~48K
+    assert profile.trends["revenue"] > 5
+    figures = dict((context, value) for value, context in profile.key_figures)
+    assert figures["records in the dataset"] == "48"
+    assert figures["total revenue"] == "$312.7K"
+    assert figures["of total revenue from North (region)"] == "50%"
+
+
+def test_profile_csv_finds_strong_correlations():
+    rows = ["x,y,z"] + [f"{3 * i},{2 * i + 1},{(i * 7919) % 13}" for i in range(1, 40)]
+    profile = profile_csv("\n".join(rows).encode())
+
+    assert [(a, b) for a, b, _ in profile.correlations] == [("x", "y")]
+    assert profile.correlations[0][2] > 0.99
+
+
+def test_profile_csv_rejects_non_tabular_text():
+    assert profile_csv(b"just one line of prose") is None
+    assert profile_csv(b"a,b\n") is None
+
+
+def test_data_brief_is_compact():
+    big = (
+        _sales_csv(months=12)
+        + b"\n"
+        + b"\n".join(f"{i},2024-12-01,West,$100,1%".encode() for i in range(100, 20_000))
+    )
+    brief = profile_data(big, "csv")
+
+    assert brief.startswith("Data brief: 19,948 rows x 5 columns")
+    assert KEY_FIGURES_HEADING in brief
+    assert len(brief) < len(big) / 100
+
+
+def test_profile_json_records_under_key():
+    data = {
+        "total_users": 120_345,
+        "monthly": [{"month": f"2024-{m:02d}", "orders": 100 * m, "plan": "pro"} for m in range(1, 13)],
+    }
+    brief = profile_json(json.dumps(data).encode())
+
+    assert "12 rows x 3 columns (JSON records under 'monthly')" in brief
+    assert "- 120.3K: total users" in brief
+    assert "- 7,800: total orders" in brief
+
+
+def test_profile_json_describes_nested_structure():
+    brief = profile_json(b'{"name": "Acme", "scores": [1, 2, 3], "meta": {"version": 2}}')
+
+    assert "- scores: list of 3 numbers, range 1 to 3, mean 2" in brief
+    assert "- meta: object with 1 keys" in brief
+
+
+def test_profile_data_falls_back_on_invalid_input():
+    assert profile_data(b"{not json", "json") is None
+    assert profile_data(b"plain words", "csv") is None
+
+
+def test_extract_key_figures():
+    text = (
+        f"intro\n\n{KEY_FIGURES_HEADING}\n- $5M: total revenue\n- 12: records\n\nSample rows:\n- not a figure"
+    )
+    assert extract_key_figures(text) == ["- $5M: total revenue", "- 12: records"]
@@ -0,0 +1,118 @@
+import asyncio
+import time
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+from pptx import Presentation
+from slideia.services import rendering
+from slideia.services.rendering import (
+    RenderMetrics,
+    get_render_pool,
+    render_deck,
+    shutdown_render_pool,
+    start_render_pool,
+)
+
+DECK = {
+    "title": "Render Pool",
+    "slides": [
+        {"title": "Slide 1", "summary": "Summary", "bullets": ["One", "Two"], "notes": "Notes"},
+    ],
+}
+
+
+def _slow_render(kind: str, deck: dict, deadline=None) -> bytes:
+    time.sleep(2)
+    return b"too late"
+
+
+def _stuck_or_slow_render(kind: str, deck: dict, deadline=None) -> bytes:
+    time.sleep(2 if deck["title"] == "Stuck" else 0.5)
+    return deck["title"].encode()
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    with patch.object(rendering, "render_metrics", RenderMetrics()):
+        yield
+    shutdown_render_pool()
+
+
+@pytest.mark.asyncio
+async def test_render_deck_pptx_in_worker():
+    content = await render_deck("pptx", DECK)
+
+    prs = Presentation(BytesIO(content))
+    assert prs.slides[1].shapes[0].text_frame.text == "Slide 1"
+    metrics = rendering.render_metrics.to_dict()
+    assert metrics["submitted"] == metrics["completed"] == 1
+    assert metrics["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_render_deck_pdf_in_worker():
+    content = await render_deck("pdf", DECK)
+    assert content.startswith(b"%PDF")
+
+
+@pytest.mark.asyncio
+async def test_render_deck_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        await render_deck("odp", DECK)
+
+
+@pytest.mark.asyncio
+async def test_render_deck_timeout_recycles_pool():
+    pool = get_render_pool()
+    with patch.object(rendering, "_render_job", _slow_render):
+        with pytest.raises(TimeoutError):
+            await render_deck("pptx", DECK, timeout=0.5)
+
+    assert get_render_pool() is not pool
+    metrics = rendering.render_metrics.to_dict()
+    assert metrics["timed_out"] == 1
+    assert metrics["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_render_deck_timeout_kills_stuck_worker_and_rewarms_pool():
+    start_render_pool()
+    pool = get_render_pool()
+    with patch.object(rendering, "_render_job", _slow_render):
+        job = asyncio.create_task(render_deck("pptx", DECK, timeout=0.5))
+        await asyncio.sleep(0.2)
+        workers = list(pool._processes.values())
+        with pytest.raises(TimeoutError):
+            await job
+
+    # Well before the job's own sleep would end
+    for worker in workers:
+        worker.join(timeout=0.3)
+    assert workers and not any(worker.is_alive() for worker in workers)
+    # Replaced by a pool whose workers are already spawning
+    assert rendering.render_pool._pool not in (None, pool)
+    assert rendering.render_pool._pool._processes
+
+
+@pytest.mark.asyncio
+async def test_render_killed_by_another_exports_recycle_is_retried():
+    start_render_pool()
+    with patch.object(rendering, "_render_job", _stuck_or_slow_render):
+        stuck = asyncio.create_task(render_deck("pptx", {**DECK, "title": "Stuck"}, timeout=0.3))
+        healthy = asyncio.create_task(render_deck("pptx", DECK, timeout=5))
+        with pytest.raises(TimeoutError):
+            await stuck
+        assert await healthy == b"Render Pool"
+
+    metrics = rendering.render_metrics.to_dict()
+    assert metrics["timed_out"] == 1
+    assert metrics["completed"] == 1
+    assert metrics["failed"] == 0
+
+
+def test_queue_depth_counts_jobs_beyond_workers():
+    metrics = RenderMetrics()
+    metrics.in_flight = 5
+    with patch.object(rendering.settings, "RENDER_WORKERS", 2):
+        assert metrics.queue_depth == 3
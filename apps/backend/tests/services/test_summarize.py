@@ -0,0 +1,76 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from slideia.services.profiling import KEY_FIGURES_HEADING
+from slideia.services.summarize import summarize_long_document, summarize_reference
+
+
+@pytest.fixture
+def mock_llm():
+    llm = MagicMock()
+    llm.summarize_document = AsyncMock(return_value="single summary")
+    llm.summarize_chunk = AsyncMock(side_effect=lambda text, index, total: f"notes {index}/{total}")
+    llm.combine_summaries = AsyncMock(return_value="combined summary")
+    return llm
+
+
+def _long_document(paragraphs: int) -> str:
+    return "\n\n".join(f"Section {i}: " + "detail " * 40 for i in range(paragraphs))
+
+
+@pytest.mark.asyncio
+async def test_short_document_uses_single_call(mock_llm):
+    result = await summarize_long_document("A short document.", mock_llm, chunk_tokens=100)
+
+    assert result == "single summary"
+    mock_llm.summarize_chunk.assert_not_called()
+    mock_llm.combine_summaries.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_long_document_is_mapped_then_reduced(mock_llm):
+    progress = []
+
+    async def on_progress(done, total):
+        progress.append((done, total))
+
+    result = await summarize_long_document(
+        _long_document(20), mock_llm, on_progress=on_progress, chunk_tokens=100
+    )
+
+    assert result == "combined summary"
+    total = mock_llm.summarize_chunk.call_count
+    assert total > 1
+    assert progress[-1] == (total, total)
+    notes = mock_llm.combine_summaries.call_args.args[0]
+    assert notes == [f"notes {i}/{total}" for i in range(1, total + 1)]
+    mock_llm.summarize_document.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_failed_chunks_are_skipped(mock_llm):
+    async def flaky(text, index, total):
+        if index == 1:
+            raise ValueError("boom")
+        return f"notes {index}"
+
+    mock_llm.summarize_chunk.side_effect = flaky
+    await summarize_long_document(_long_document(20), mock_llm, chunk_tokens=100)
+
+    notes = mock_llm.combine_summaries.call_args.args[0]
+    assert "notes 1" not in notes
+    assert "notes 2" in notes
+
+
+@pytest.mark.asyncio
+async def test_chunk_count_is_capped(mock_llm):
+    await summarize_long_document(_long_document(50), mock_llm, chunk_tokens=100, max_chunks=3)
+    assert mock_llm.summarize_chunk.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_summarize_reference_keeps_data_brief_key_figures(mock_llm):
+    text = f"--- File: sales.csv ---\nData brief: 48 rows\n\n{KEY_FIGURES_HEADING}\n- $5.2M: total revenue\n--- End of sales.csv ---"
+
+    summary = await summarize_reference(text, mock_llm)
+
+    assert summary == f"single summary\n\n{KEY_FIGURES_HEADING}\n- $5.2M: total revenue"
@@ -0,0 +1,163 @@
+import asyncio
+import os
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from slideia.infra.cache import DocumentCache
+from slideia.services.uploads import RegistryFullError, SpooledUpload, UploadRegistry
+
+
+@pytest.fixture
+def registry():
+    return UploadRegistry(llm=MagicMock(), ttl_seconds=60, max_entries=2)
+
+
+@pytest.mark.asyncio
+@patch("slideia.services.uploads.summarize_reference", new_callable=AsyncMock, return_value="short summary")
+async def test_upload_is_extracted_indexed_and_summarized(mock_summarize, registry):
+    doc = registry.submit(SpooledUpload.from_bytes("notes.txt", "txt", b"Revenue grew in every region."))
+    assert doc.status == "processing"
+
+    await registry.wait(doc.file_id)
+
+    assert doc.status == "ready"
+    assert doc.text == "Revenue grew in every region."
+    assert doc.summary == "short summary"
+    assert len(doc.index) == 1
+    assert doc.framed_text.startswith("--- File: notes.txt ---")
+    mock_summarize.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_upload_extraction_failure_is_reported(registry):
+    doc = registry.submit(SpooledUpload.from_bytes("broken.pdf", "pdf", b"not a pdf"))
+    await registry.wait(doc.file_id)
+
+    assert doc.status == "failed"
+    assert "broken.pdf" in doc.error
+    assert doc.to_dict()["status"] == "failed"
+
+
+@pytest.mark.asyncio
+@patch(
+    "slideia.services.uploads.summarize_reference",
+    new_callable=AsyncMock,
+    side_effect=RuntimeError("llm down"),
+)
+async def test_upload_summary_failure_still_ready(mock_summarize, registry):
+    doc = registry.submit(SpooledUpload.from_bytes("notes.md", "md", b"# Notes"))
+    await registry.wait(doc.file_id)
+
+    assert doc.status == "ready"
+    assert doc.summary is None
+    assert doc.text == "# Notes"
+
+
+@pytest.mark.asyncio
+@patch("slideia.services.uploads.summarize_reference", new_callable=AsyncMock, return_value="summary")
+async def test_registry_evicts_oldest_finished_documents(mock_summarize, registry):
+    first = registry.submit(SpooledUpload.from_bytes("a.txt", "txt", b"a"))
+    await registry.wait(first.file_id)
+    second = registry.submit(SpooledUpload.from_bytes("b.txt", "txt", b"b"))
+    await registry.wait(second.file_id)
+
+    third = registry.submit(SpooledUpload.from_bytes("c.txt", "txt", b"c"))
+    await registry.wait(third.file_id)
+
+    assert registry.get(first.file_id) is None
+    assert registry.get(second.file_id) is second
+    assert registry.get(third.file_id) is third
+
+
+@pytest.mark.asyncio
+async def test_registry_rejects_uploads_while_in_flight_documents_fill_it(registry):
+    release = asyncio.Event()
+
+    async def blocked_summary(text, llm):
+        await release.wait()
+        return "summary"
+
+    with patch("slideia.services.uploads.summarize_reference", side_effect=blocked_summary):
+        first = registry.submit(SpooledUpload.from_bytes("a.txt", "txt", b"a"))
+        registry.submit(SpooledUpload.from_bytes("b.txt", "txt", b"b"))
+        assert registry.available() == 0
+
+        rejected = SpooledUpload("c.txt", "txt", threshold=1)
+        rejected.write(b"cc")
+        rejected.close()
+        path = rejected.path
+        with pytest.raises(RegistryFullError):
+            registry.submit(rejected)
+        assert not os.path.exists(path)
+
+        release.set()
+        await registry.wait(first.file_id)
+
+    assert registry.available() == 1
+    assert registry.submit(SpooledUpload.from_bytes("d.txt", "txt", b"d")).status == "processing"
+
+
+@pytest.mark.asyncio
+async def test_registry_bounds_concurrent_summaries():
+    registry = UploadRegistry(llm=MagicMock(), ttl_seconds=60, max_entries=8, summary_concurrency=2)
+    running = 0
+    peak = 0
+
+    async def slow_summary(text, llm):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return "summary"
+
+    with patch("slideia.services.uploads.summarize_reference", side_effect=slow_summary):
+        docs = [registry.submit(SpooledUpload.from_bytes(f"{i}.txt", "txt", b"text")) for i in range(5)]
+        for doc in docs:
+            await registry.wait(doc.file_id)
+
+    assert peak == 2
+    assert all(doc.summary == "summary" for doc in docs)
+
+
+def test_spooled_upload_stays_in_memory_below_threshold():
+    upload = SpooledUpload("a.txt", "txt", threshold=16)
+    upload.write(b"small")
+    upload.close()
+
+    assert upload.path is None
+    assert upload.source == b"small"
+    assert upload.digest == DocumentCache.digest(b"small")
+
+
+def test_spooled_upload_spools_to_disk_beyond_threshold():
+    upload = SpooledUpload("big.txt", "txt", threshold=16)
+    for chunk in (b"0123456789", b"abcdefghij", b"klm"):
+        upload.write(chunk)
+    upload.close()
+
+    assert upload.size == 23
+    assert upload.source == upload.path
+    with open(upload.path, "rb") as f:
+        assert f.read() == b"0123456789abcdefghijklm"
+    assert upload.digest == DocumentCache.digest(b"0123456789abcdefghijklm")
+
+    path = upload.path
+    upload.discard()
+    assert not os.path.exists(path)
+
+
+@pytest.mark.asyncio
+@patch("slideia.services.uploads.summarize_reference", new_callable=AsyncMock, return_value="summary")
+async def test_spooled_upload_is_extracted_from_disk_and_discarded(mock_summarize, registry):
+    upload = SpooledUpload("long.txt", "txt", threshold=8)
+    upload.write(b"Paragraph one.\n\nParagraph two.")
+    upload.close()
+    path = upload.path
+
+    doc = registry.submit(upload)
+    await registry.wait(doc.file_id)
+
+    assert doc.status == "ready"
+    assert doc.text == "Paragraph one.\n\nParagraph two."
+    assert not os.path.exists(path)